@@ -0,0 +1,84 @@
+"""Added PriceOhlc table
+
+Revision ID: b060fc451f50
+Revises: 4af1fa0d8413
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "b060fc451f50"
+down_revision: Union[str, Sequence[str], None] = "4af1fa0d8413"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OHLC_INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "1h": 60 * 60_000,
+    "1d": 24 * 60 * 60_000,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "price_ohlc",
+        sa.Column("ticker", sa.String(length=32), nullable=False),
+        sa.Column("interval", sa.String(length=8), nullable=False),
+        sa.Column("bucket_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column("open", sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.Column("high", sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.Column("low", sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.Column("close", sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.Column("open_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column("close_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "ticker",
+            "interval",
+            "bucket_ts_ms",
+            name="uq_price_ohlc_ticker_interval_bucket_ts_ms",
+        ),
+    )
+
+    # Roll up the history that already exists.
+    for interval, ms in OHLC_INTERVAL_MS.items():
+        op.execute(sa.text("""
+                INSERT INTO price_ohlc (
+                    ticker, interval, bucket_ts_ms, open, high, low, close,
+                    open_ts_ms, close_ts_ms, count
+                )
+                SELECT
+                    ticker,
+                    :interval,
+                    bucket_ts_ms,
+                    (array_agg(price ORDER BY captured_ts_ms))[1],
+                    max(price),
+                    min(price),
+                    (array_agg(price ORDER BY captured_ts_ms DESC))[1],
+                    min(captured_ts_ms),
+                    max(captured_ts_ms),
+                    count(*)
+                FROM (
+                    SELECT
+                        ticker,
+                        price,
+                        captured_ts_ms,
+                        captured_ts_ms - captured_ts_ms % :ms AS bucket_ts_ms
+                    FROM prices
+                ) AS p
+                GROUP BY ticker, bucket_ts_ms
+                """).bindparams(interval=interval, ms=ms))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("price_ohlc")
@@ -0,0 +1,146 @@
+"""Partitioned Prices table by captured_ts_ms
+
+Revision ID: cdd1d2b0b793
+Revises: b060fc451f50
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+import time
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "cdd1d2b0b793"
+down_revision: Union[str, Sequence[str], None] = "b060fc451f50"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+# Older rows land in the default partition instead of one partition per month.
+MAX_MONTHS_BACK = 120
+
+
+def _month_index(ts_ms: int) -> int:
+    dt = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
+    return dt.year * 12 + dt.month - 1
+
+
+def _month_start_ms(index: int) -> int:
+    year, month = divmod(index, 12)
+    return int(datetime(year, month + 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _create_monthly_partitions(first: int, last: int) -> None:
+    for index in range(first, last + 1):
+        year, month = divmod(index, 12)
+        op.execute(
+            f"CREATE TABLE prices_y{year:04d}m{month + 1:02d} PARTITION OF prices "
+            f"FOR VALUES FROM ({_month_start_ms(index)}) "
+            f"TO ({_month_start_ms(index + 1)})"
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE prices RENAME TO prices_legacy")
+    op.execute(
+        "ALTER TABLE prices_legacy RENAME CONSTRAINT prices_pkey "
+        "TO prices_legacy_pkey"
+    )
+    op.execute(
+        "ALTER TABLE prices_legacy RENAME CONSTRAINT uq_prices_ticker_captured_ts_ms "
+        "TO uq_prices_legacy_ticker_captured_ts_ms"
+    )
+    op.drop_index("ix_prices_ticker_captured_ts_ms", table_name="prices_legacy")
+    op.drop_index("ix_prices_captured_ts_ms", table_name="prices_legacy")
+
+    op.create_table(
+        "prices",
+        sa.Column("ticker", sa.String(length=32), nullable=False),
+        sa.Column("price", sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.Column("captured_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('prices_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", "captured_ts_ms", name="prices_pkey"),
+        sa.UniqueConstraint(
+            "ticker", "captured_ts_ms", name="uq_prices_ticker_captured_ts_ms"
+        ),
+        postgresql_partition_by="RANGE (captured_ts_ms)",
+    )
+    op.execute("ALTER SEQUENCE prices_id_seq OWNED BY prices.id")
+    op.create_index(
+        "ix_prices_captured_ts_ms", "prices", ["captured_ts_ms"], unique=False
+    )
+    op.execute("CREATE TABLE prices_default PARTITION OF prices DEFAULT")
+
+    now_index = _month_index(int(time.time() * 1000))
+    first_index = now_index
+    min_ts_ms = op.get_bind().scalar(
+        sa.text("SELECT min(captured_ts_ms) FROM prices_legacy")
+    )
+    if min_ts_ms is not None:
+        first_index = max(
+            min(_month_index(min_ts_ms), now_index), now_index - MAX_MONTHS_BACK
+        )
+    _create_monthly_partitions(first_index, now_index + MONTHS_AHEAD)
+
+    op.execute(
+        "INSERT INTO prices (id, ticker, price, captured_ts_ms) "
+        "SELECT id, ticker, price, captured_ts_ms FROM prices_legacy"
+    )
+    op.drop_table("prices_legacy")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE prices RENAME TO prices_partitioned")
+    op.execute(
+        "ALTER TABLE prices_partitioned RENAME CONSTRAINT prices_pkey "
+        "TO prices_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE prices_partitioned "
+        "RENAME CONSTRAINT uq_prices_ticker_captured_ts_ms "
+        "TO uq_prices_partitioned_ticker_captured_ts_ms"
+    )
+    op.drop_index("ix_prices_captured_ts_ms", table_name="prices_partitioned")
+
+    op.create_table(
+        "prices",
+        sa.Column("ticker", sa.String(length=32), nullable=False),
+        sa.Column("price", sa.Numeric(precision=20, scale=10), nullable=False),
+        sa.Column("captured_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('prices_id_seq'::regclass)"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "ticker", "captured_ts_ms", name="uq_prices_ticker_captured_ts_ms"
+        ),
+    )
+    op.execute("ALTER SEQUENCE prices_id_seq OWNED BY prices.id")
+    op.create_index(
+        "ix_prices_captured_ts_ms", "prices", ["captured_ts_ms"], unique=False
+    )
+    op.create_index(
+        "ix_prices_ticker_captured_ts_ms",
+        "prices",
+        ["ticker", "captured_ts_ms"],
+        unique=False,
+    )
+    op.execute(
+        "INSERT INTO prices (id, ticker, price, captured_ts_ms) "
+        "SELECT id, ticker, price, captured_ts_ms FROM prices_partitioned"
+    )
+    op.drop_table("prices_partitioned")
@@ -0,0 +1,38 @@
+"""Added tickers table
+
+Revision ID: 1a2d35faa855
+Revises: cdd1d2b0b793
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "1a2d35faa855"
+down_revision: Union[str, Sequence[str], None] = "cdd1d2b0b793"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INITIAL_TICKERS = ("btc_usd", "eth_usd")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tickers = op.create_table(
+        "tickers",
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("enabled", sa.Boolean(), server_default=sa.true(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.bulk_insert(tickers, [{"name": name} for name in INITIAL_TICKERS])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("tickers")
@@ -0,0 +1,53 @@
+"""Added source to prices
+
+Revision ID: 7c3e9b1f2d40
+Revises: 1a2d35faa855
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7c3e9b1f2d40"
+down_revision: Union[str, Sequence[str], None] = "1a2d35faa855"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows all came from Deribit; the constant default is stored in
+    # the catalog, so no partition is rewritten.
+    op.add_column(
+        "prices",
+        sa.Column(
+            "source",
+            sa.String(length=32),
+            server_default="deribit",
+            nullable=False,
+        ),
+    )
+    # Reads filter on (ticker, source) and order by captured_ts_ms, so the new
+    # key keeps serving them from the index.
+    op.create_unique_constraint(
+        "uq_prices_ticker_source_captured_ts_ms",
+        "prices",
+        ["ticker", "source", "captured_ts_ms"],
+    )
+    op.drop_constraint("uq_prices_ticker_captured_ts_ms", "prices", type_="unique")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM prices WHERE source <> 'deribit'")
+    op.create_unique_constraint(
+        "uq_prices_ticker_captured_ts_ms", "prices", ["ticker", "captured_ts_ms"]
+    )
+    op.drop_constraint(
+        "uq_prices_ticker_source_captured_ts_ms", "prices", type_="unique"
+    )
+    op.drop_column("prices", "source")
@@ -0,0 +1,43 @@
+"""Added price versions table
+
+Revision ID: 9d41c6e8a7b2
+Revises: 7c3e9b1f2d40
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9d41c6e8a7b2"
+down_revision: Union[str, Sequence[str], None] = "7c3e9b1f2d40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "price_versions",
+        sa.Column("ticker", sa.String(length=32), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("latest_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column("modified_ts_ms", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("ticker"),
+    )
+    op.execute("""
+        INSERT INTO price_versions (ticker, version, latest_ts_ms, modified_ts_ms)
+        SELECT ticker, 1, max(captured_ts_ms), max(captured_ts_ms)
+        FROM prices
+        GROUP BY ticker
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("price_versions")
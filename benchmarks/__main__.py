@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from src.models import db_helper
+from . import api, collector, compare, crud, reads
+from .common import assert_bench_db, report, write_report
+
+DB_BENCHMARKS = ("crud", "reads", "api")
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v.replace("_", "")) for v in value.split(",") if v]
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the collector, CRUD layer and API; prints JSON.",
+    )
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+
+    def add(name: str, help: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help)
+        p.add_argument("--out", type=Path, default=None, help="Write JSON here.")
+        return p
+
+    p = add("collector", "DeribitClient fan-out against a fake Deribit server.")
+    p.add_argument("--tickers", type=_int_list, default=[1, 10, 50, 200])
+    p.add_argument("--concurrency", type=_int_list, default=[1, 10, 50])
+    p.add_argument("--rounds", type=int, default=20)
+    p.add_argument("--server-latency-ms", type=float, default=5.0)
+
+    p = add("crud", "create_prices insert throughput per batch size.")
+    p.add_argument("--batch-sizes", type=_int_list, default=[1, 10, 100, 1000, 5000])
+    p.add_argument("--rounds", type=int, default=20)
+
+    p = add("reads", "Read latency against seeded tables.")
+    p.add_argument(
+        "--rows",
+        type=_int_list,
+        default=[1_000_000],
+        help="Table sizes, e.g. 1_000_000,10_000_000,100_000_000.",
+    )
+    p.add_argument("--rounds", type=int, default=200)
+    p.add_argument("--window-rows", type=int, default=3600)
+    p.add_argument("--step-ms", type=int, default=1000)
+    p.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep seeded rows so the next run does not seed them again.",
+    )
+
+    p = add("api", "ASGI load against src.main:app.")
+    p.add_argument("--requests", type=int, default=2000)
+    p.add_argument("--concurrency", type=_int_list, default=[1, 10, 50])
+
+    add("all", "Run every benchmark with default parameters.")
+
+    p = sub.add_parser("compare", help="Compare latency percentiles of two runs.")
+    p.add_argument("baseline", type=Path)
+    p.add_argument("current", type=Path)
+    return parser.parse_args(argv)
+
+
+async def _run(args: argparse.Namespace, name: str) -> dict:
+    if name == "collector":
+        cases = await collector.run(
+            args.tickers, args.concurrency, args.rounds, args.server_latency_ms
+        )
+    elif name == "crud":
+        cases = await crud.run(args.batch_sizes, args.rounds)
+    elif name == "reads":
+        cases = await reads.run(
+            args.rows, args.rounds, args.window_rows, args.step_ms, args.keep
+        )
+    else:
+        cases = await api.run(args.requests, args.concurrency)
+    return report(name, cases)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.benchmark == "all":
+        runs = [_parse_args([name]) for name in ("collector", *DB_BENCHMARKS)]
+    else:
+        runs = [args]
+    if any(run.benchmark in DB_BENCHMARKS for run in runs):
+        assert_bench_db()
+
+    try:
+        results = [await _run(run, run.benchmark) for run in runs]
+    finally:
+        await db_helper.dispose()
+
+    write_report(results if args.benchmark == "all" else results[0], args.out)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    if args.benchmark == "compare":
+        print(compare.format_table(compare.compare(args.baseline, args.current)))
+    else:
+        asyncio.run(_main(args))
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import Counter
+from typing import Callable
+
+from httpx import ASGITransport, AsyncClient
+
+from src.domain.schemas.price import PriceFull
+from src.main import app
+from src.models import db_helper
+from src.prices.crud import create_prices
+from src.tickers.crud import add_tickers
+from src.tickers.registry import ticker_registry
+from .common import BENCH_TICKER, Case, delete_bench_rows, summarize
+
+SEED_ROWS = 10_000
+SEED_STEP_MS = 1000
+
+
+def _endpoints(oldest_ts: int, newest_ts: int) -> dict[str, Callable[[], dict]]:
+    def last() -> dict:
+        return {"ticker": BENCH_TICKER}
+
+    def last_at_time() -> dict:
+        return {"ticker": BENCH_TICKER, "ts": random.randint(oldest_ts, newest_ts)}
+
+    def page() -> dict:
+        return {"ticker": BENCH_TICKER, "limit": 100}
+
+    return {
+        "/api/v1/prices/last": last,
+        "/api/v1/prices/lastAtTime": last_at_time,
+        "/api/v1/prices/page": page,
+    }
+
+
+async def _seed() -> tuple[int, int]:
+    newest_ts = int(time.time() * 1000)
+    oldest_ts = newest_ts - (SEED_ROWS - 1) * SEED_STEP_MS
+    prices = [
+        PriceFull(ticker=BENCH_TICKER, price=50000 + i % 100, captured_ts_ms=ts)
+        for i, ts in enumerate(range(oldest_ts, newest_ts + 1, SEED_STEP_MS))
+    ]
+    async with db_helper.session_factory() as session:
+        await add_tickers(session, [BENCH_TICKER])
+        for i in range(0, len(prices), 1000):
+            await create_prices(session, prices[i : i + 1000])
+    ticker_registry.invalidate()
+    return oldest_ts, newest_ts
+
+
+async def _load(
+    client: AsyncClient, path: str, params, requests: int, concurrency: int
+) -> tuple[list[float], Counter, float]:
+    samples: list[float] = []
+    statuses: Counter = Counter()
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            started = time.perf_counter()
+            resp = await client.get(path, params=params())
+            samples.append(time.perf_counter() - started)
+            statuses[resp.status_code] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, statuses, time.perf_counter() - started
+
+
+async def run(requests: int, concurrencies: list[int]) -> list[Case]:
+    """
+    In-process load against ``src.main:app`` over ASGI.
+
+    No network or server is involved, so this measures the app and the
+    database only. Lifespan is not run, so the price cache is filled by reads.
+    """
+    await delete_bench_rows()
+    cases = []
+    try:
+        oldest_ts, newest_ts = await _seed()
+        endpoints = _endpoints(oldest_ts, newest_ts)
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            for concurrency in concurrencies:
+                for path, params in endpoints.items():
+                    # Warm up the connection pool and caches before measuring.
+                    await _load(client, path, params, concurrency, concurrency)
+                    samples, statuses, elapsed = await _load(
+                        client, path, params, requests, concurrency
+                    )
+                    cases.append(
+                        Case(
+                            name=path,
+                            params={"concurrency": concurrency},
+                            latency_ms=summarize(samples),
+                            throughput={"requests_per_s": round(requests / elapsed, 1)},
+                            errors=sum(
+                                n for status, n in statuses.items() if status >= 400
+                            ),
+                        )
+                    )
+    finally:
+        await delete_bench_rows()
+    return cases
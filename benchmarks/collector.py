@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from src.deribit.client import DeribitClient, DeribitClientConfig
+from .common import Case, summarize, timed
+
+
+def _fake_deribit_app(latency_s: float) -> web.Application:
+    async def get_index_price(request: web.Request) -> web.Response:
+        if latency_s:
+            await asyncio.sleep(latency_s)
+        return web.json_response({"jsonrpc": "2.0", "result": {"index_price": 50000.0}})
+
+    app = web.Application()
+    app.router.add_get("/api/v2/public/get_index_price", get_index_price)
+    return app
+
+
+async def run(
+    ticker_counts: list[int],
+    concurrencies: list[int],
+    rounds: int,
+    latency_ms: float,
+) -> list[Case]:
+    """
+    Fan-out of ``get_index_prices`` against a local fake Deribit server.
+
+    Rate limiting is disabled so only the client and the event loop are measured.
+    """
+    server = TestServer(_fake_deribit_app(latency_ms / 1000))
+    await server.start_server()
+    cases = []
+    try:
+        for concurrency in concurrencies:
+            config = DeribitClientConfig(
+                base_url=str(server.make_url("/")),
+                concurrency=concurrency,
+                request_cost_credits=0,
+            )
+            async with DeribitClient(config) as client:
+                for count in ticker_counts:
+                    tickers = [f"idx_{i}_usd" for i in range(count)]
+                    # Warm up the connection pool before measuring.
+                    await client.get_index_prices(tickers)
+
+                    started = time.perf_counter()
+                    samples = [
+                        await timed(lambda: client.get_index_prices(tickers))
+                        for _ in range(rounds)
+                    ]
+                    elapsed = time.perf_counter() - started
+                    cases.append(
+                        Case(
+                            name="get_index_prices",
+                            params={
+                                "tickers": count,
+                                "concurrency": concurrency,
+                                "server_latency_ms": latency_ms,
+                            },
+                            latency_ms=summarize(samples),
+                            throughput={
+                                "requests_per_s": round(count * rounds / elapsed, 1)
+                            },
+                        )
+                    )
+    finally:
+        await server.close()
+    return cases
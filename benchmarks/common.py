@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import subprocess
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable
+
+from sqlalchemy import delete
+
+from src.models import Price, PriceOhlc, TrackedTicker, db_helper
+
+BENCH_TICKER = "bench_usd"
+
+
+@dataclass(slots=True)
+class Case:
+    """
+    One measured configuration of a benchmark.
+    """
+
+    name: str
+    params: dict[str, Any]
+    latency_ms: dict[str, float]
+    throughput: dict[str, float] = field(default_factory=dict)
+    errors: int = 0
+
+    @property
+    def key(self) -> str:
+        params = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[{params}]"
+
+
+def summarize(samples_s: Iterable[float]) -> dict[str, float]:
+    """
+    Latency percentiles in milliseconds.
+    """
+    samples = sorted(s * 1000 for s in samples_s)
+    if not samples:
+        raise ValueError("No samples to summarize")
+    if len(samples) == 1:
+        p50 = p95 = p99 = samples[0]
+    else:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    return {
+        "count": len(samples),
+        "min": round(samples[0], 3),
+        "mean": round(statistics.fmean(samples), 3),
+        "p50": round(p50, 3),
+        "p95": round(p95, 3),
+        "p99": round(p99, 3),
+        "max": round(samples[-1], 3),
+    }
+
+
+async def timed(fn: Callable[[], Awaitable[Any]]) -> float:
+    started = time.perf_counter()
+    await fn()
+    return time.perf_counter() - started
+
+
+def _git_rev() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except OSError, subprocess.CalledProcessError:
+        return None
+    return result.stdout.strip()
+
+
+def report(benchmark: str, cases: list[Case]) -> dict[str, Any]:
+    return {
+        "benchmark": benchmark,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "git_rev": _git_rev(),
+        "python": platform.python_version(),
+        "cases": [asdict(case) for case in cases],
+    }
+
+
+def write_report(result: dict[str, Any], out: Path | None) -> None:
+    payload = json.dumps(result, indent=2)
+    if out is None:
+        print(payload)
+        return
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(payload + "\n", encoding="utf-8")
+
+
+def assert_bench_db() -> None:
+    name = (db_helper.engine.url.database or "").lower()
+    if "bench" not in name and "test" not in name:
+        raise RuntimeError(
+            f"Refusing to benchmark on {name!r}: DB name must contain 'bench' or 'test'"
+        )
+
+
+async def delete_bench_rows(ticker: str = BENCH_TICKER) -> None:
+    async with db_helper.session_factory() as session:
+        await session.execute(delete(Price).where(Price.ticker == ticker))
+        await session.execute(delete(PriceOhlc).where(PriceOhlc.ticker == ticker))
+        await session.execute(delete(TrackedTicker).where(TrackedTicker.name == ticker))
+        await session.commit()
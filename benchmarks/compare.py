@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from .common import Case
+
+PERCENTILES = ("p50", "p95", "p99")
+
+
+def _load(path: Path) -> dict[str, dict[str, Any]]:
+    results = json.loads(path.read_text(encoding="utf-8"))
+    if isinstance(results, dict):
+        results = [results]
+    return {
+        f"{result['benchmark']}:{Case(**case).key}": case
+        for result in results
+        for case in result["cases"]
+    }
+
+
+def compare(baseline: Path, current: Path) -> list[dict[str, Any]]:
+    """
+    Relative change of latency percentiles for cases present in both runs.
+    """
+    before, after = _load(baseline), _load(current)
+    rows = []
+    for key in sorted(before.keys() & after.keys()):
+        row: dict[str, Any] = {"case": key}
+        for p in PERCENTILES:
+            old = before[key]["latency_ms"][p]
+            new = after[key]["latency_ms"][p]
+            row[p] = {
+                "before": old,
+                "after": new,
+                "change": round((new - old) / old, 4) if old else None,
+            }
+        rows.append(row)
+    return rows
+
+
+def format_table(rows: list[dict[str, Any]]) -> str:
+    lines = []
+    for row in rows:
+        cells = []
+        for p in PERCENTILES:
+            cell = row[p]
+            change = "n/a" if cell["change"] is None else f"{cell['change']:+.1%}"
+            cells.append(f"{p} {cell['before']:.3f} -> {cell['after']:.3f} ({change})")
+        lines.append(f"{row['case']}: " + ", ".join(cells))
+    return "\n".join(lines)
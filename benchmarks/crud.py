@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import itertools
+import random
+import time
+
+from src.domain.schemas.price import PriceFull
+from src.models import db_helper
+from src.prices.crud import create_prices
+from .common import BENCH_TICKER, Case, delete_bench_rows, summarize, timed
+
+
+async def run(batch_sizes: list[int], rounds: int) -> list[Case]:
+    """
+    ``create_prices`` throughput per batch size, with and without
+    ``returning``, including the OHLC upsert and NOTIFY it performs in the
+    same transaction.
+    """
+    next_ts = int(time.time() * 1000)
+    cases = []
+    await delete_bench_rows()
+    try:
+        for batch_size, returning in itertools.product(batch_sizes, (True, False)):
+            samples = []
+            for _ in range(rounds):
+                prices = [
+                    PriceFull(
+                        ticker=BENCH_TICKER,
+                        price=random.uniform(40_000, 60_000),
+                        captured_ts_ms=next_ts + i,
+                    )
+                    for i in range(batch_size)
+                ]
+                next_ts += batch_size
+                async with db_helper.session_factory() as session:
+                    samples.append(
+                        await timed(lambda: create_prices(session, prices, returning))
+                    )
+
+            cases.append(
+                Case(
+                    name="create_prices",
+                    params={"batch_size": batch_size, "returning": returning},
+                    latency_ms=summarize(samples),
+                    throughput={
+                        "rows_per_s": round(batch_size * rounds / sum(samples), 1)
+                    },
+                )
+            )
+    finally:
+        await delete_bench_rows()
+    return cases
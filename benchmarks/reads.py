@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import random
+
+from sqlalchemy import func, select, text
+
+from src.models import Price, db_helper
+from src.prices.crud import read_all_prices, read_last_price_at_time
+from .common import BENCH_TICKER, Case, delete_bench_rows, summarize, timed
+
+# Seeded prices end here and extend backwards by ``step_ms`` per row, so a
+# larger table is a superset of a smaller one and seeding can be resumed.
+SEED_END_TS_MS = 1_767_225_600_000  # 2026-01-01T00:00:00Z
+SEED_CHUNK_ROWS = 1_000_000
+
+_SEED_SQL = text("""
+    INSERT INTO prices (ticker, price, captured_ts_ms)
+    SELECT :ticker, 50000 + random() * 1000, CAST(:end_ts AS bigint) - g * :step_ms
+    FROM generate_series(CAST(:start AS bigint), CAST(:stop AS bigint) - 1) AS g
+    ON CONFLICT DO NOTHING
+    """)
+
+
+async def _count_rows() -> int:
+    async with db_helper.session_factory() as session:
+        stmt = select(func.count()).where(Price.ticker == BENCH_TICKER)
+        return await session.scalar(stmt)
+
+
+async def seed(rows: int, step_ms: int) -> int:
+    """
+    Grow the benchmark ticker's history to ``rows`` rows; returns rows added.
+    """
+    existing = await _count_rows()
+    for start in range(existing, rows, SEED_CHUNK_ROWS):
+        async with db_helper.session_factory() as session:
+            await session.execute(
+                _SEED_SQL,
+                {
+                    "ticker": BENCH_TICKER,
+                    "end_ts": SEED_END_TS_MS,
+                    "step_ms": step_ms,
+                    "start": start,
+                    "stop": min(start + SEED_CHUNK_ROWS, rows),
+                },
+            )
+            await session.commit()
+    if rows > existing:
+        async with db_helper.engine.connect() as conn:
+            await conn.execute(text("ANALYZE prices"))
+    return max(0, rows - existing)
+
+
+async def run(
+    table_sizes: list[int],
+    rounds: int,
+    window_rows: int,
+    step_ms: int,
+    keep: bool,
+) -> list[Case]:
+    """
+    Latency of ``read_all_prices`` over a fixed window and of
+    ``read_last_price_at_time`` at random points, per seeded table size.
+    """
+    cases = []
+    try:
+        for rows in sorted(table_sizes):
+            await seed(rows, step_ms)
+            oldest_ts = SEED_END_TS_MS - (rows - 1) * step_ms
+            window_ms = (min(window_rows, rows) - 1) * step_ms
+
+            def random_ts() -> int:
+                return random.randint(oldest_ts, SEED_END_TS_MS)
+
+            async with db_helper.session_factory() as session:
+                range_samples = []
+                for _ in range(rounds):
+                    from_ts = random.randint(oldest_ts, SEED_END_TS_MS - window_ms)
+                    range_samples.append(
+                        await timed(
+                            lambda: read_all_prices(
+                                session, BENCH_TICKER, from_ts, from_ts + window_ms
+                            )
+                        )
+                    )
+                point_samples = [
+                    await timed(
+                        lambda: read_last_price_at_time(
+                            session, BENCH_TICKER, random_ts()
+                        )
+                    )
+                    for _ in range(rounds)
+                ]
+
+            cases.append(
+                Case(
+                    name="read_all_prices",
+                    params={"rows": rows, "window_rows": window_rows},
+                    latency_ms=summarize(range_samples),
+                )
+            )
+            cases.append(
+                Case(
+                    name="read_last_price_at_time",
+                    params={"rows": rows},
+                    latency_ms=summarize(point_samples),
+                )
+            )
+    finally:
+        if not keep:
+            await delete_bench_rows()
+    return cases
@@ -33,9 +33,18 @@ case "${1:-api}" in
     ;;
   worker)
     wait_for_postgres
+    # Prefork children write metrics here; the exporter in the main process merges them.
+    export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}"
+    rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+    mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
     echo "[entrypoint] Starting Celery worker..."
     exec celery -A src.worker.celery_app:celery_app worker -l info
     ;;
+  stream)
+    wait_for_postgres
+    echo "[entrypoint] Starting Deribit stream collector..."
+    exec python -m src.worker.stream
+    ;;
   beat)
     wait_for_postgres
     echo "[entrypoint] Starting Celery beat..."
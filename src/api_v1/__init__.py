@@ -1,5 +1,7 @@
 from fastapi import APIRouter
+from .prices.live import router as live_router
 from .prices.views import router as prices_router
 
 router = APIRouter()
 router.include_router(prices_router, prefix="/prices")
+router.include_router(live_router, prefix="/prices")
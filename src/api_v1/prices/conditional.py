@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import HTTPException, Request, Response
+
+from src.config import settings
+
+
+@dataclass(frozen=True, slots=True)
+class Freshness:
+    """
+    Version of a ticker's data.
+
+    ``version`` is the ticker's write generation, bumped with every insert or
+    removal; without it the ``captured_ts_ms`` of the newest price stands in,
+    which is only enough for responses derived from that single price.
+    ``settled`` responses can no longer change through collection.
+    """
+
+    ticker: str
+    latest_ts_ms: int | None
+    version: int | None = None
+    modified_ts_ms: int | None = None
+    settled: bool = False
+
+    @property
+    def etag(self) -> str:
+        if self.version is not None:
+            return f'"{self.ticker}-v{self.version}"'
+        return f'"{self.ticker}-{self.latest_ts_ms or 0}"'
+
+    @property
+    def last_modified_ts_ms(self) -> int | None:
+        if self.modified_ts_ms is not None:
+            return self.modified_ts_ms
+        return self.latest_ts_ms
+
+    def max_age_s(self) -> int:
+        if self.settled:
+            return settings.settled_max_age_s
+        # Nothing newer can be stored before the next collection.
+        interval_ms = settings.collect_interval_s * 1000
+        if self.latest_ts_ms is None:
+            return math.ceil(settings.collect_interval_s)
+        remaining_ms = self.latest_ts_ms + interval_ms - time.time() * 1000
+        return max(
+            0, min(math.ceil(remaining_ms / 1000), math.ceil(interval_ms / 1000))
+        )
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "ETag": self.etag,
+            "Cache-Control": f"public, max-age={self.max_age_s()}",
+        }
+        modified_ts_ms = self.last_modified_ts_ms
+        if modified_ts_ms is not None:
+            modified = datetime.fromtimestamp(modified_ts_ms / 1000, timezone.utc)
+            headers["Last-Modified"] = format_datetime(modified, usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """
+        Whether the client's copy is current (``If-None-Match`` first, then
+        ``If-Modified-Since``).
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag in tags
+
+        if_modified_since = request.headers.get("if-modified-since")
+        modified_ts_ms = self.last_modified_ts_ms
+        if if_modified_since is None or modified_ts_ms is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except TypeError, ValueError:
+            return False
+        return modified_ts_ms // 1000 <= since.timestamp()
+
+
+def is_settled(ts_ms: int) -> bool:
+    """
+    Whether collection can still store prices at or before ``ts_ms``.
+
+    Collected prices are captured at the start of an interval and written
+    within its deadline, so older answers only change through a backfill.
+    """
+    margin_s = settings.collect_interval_s + settings.collect_deadline_s
+    return ts_ms + margin_s * 1000 < time.time() * 1000
+
+
+def apply_conditional(
+    request: Request,
+    response: Response,
+    freshness: Freshness,
+) -> dict[str, str]:
+    """
+    Set caching headers, or answer 304 if the client's copy is current.
+    """
+    headers = freshness.headers()
+    if freshness.matches(request):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
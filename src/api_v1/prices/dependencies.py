@@ -0,0 +1,45 @@
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import db_helper
+from src.prices import versions
+from src.tickers.registry import ticker_registry
+from .conditional import Freshness, apply_conditional
+
+
+async def valid_ticker(ticker: str) -> str:
+    if not await ticker_registry.contains(ticker):
+        raise HTTPException(status_code=422, detail=f"Unknown ticker: {ticker}")
+    return ticker
+
+
+async def valid_tickers(tickers: list[str]) -> list[str]:
+    for ticker in set(tickers):
+        await valid_ticker(ticker)
+    return tickers
+
+
+async def conditional_prices(
+    request: Request,
+    response: Response,
+    ticker: str = Depends(valid_ticker),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+) -> dict[str, str]:
+    """
+    Caching headers versioned by the ticker's write generation; 304 when the
+    client already has that version, before any data is read.
+
+    The version is read on the same session as the body, so a lagging
+    replica never pairs an old body with a new ETag.
+    """
+    version = await versions.read_version(session, ticker)
+    if version is None:
+        freshness = Freshness(ticker, None, version=0)
+    else:
+        freshness = Freshness(
+            ticker,
+            version.latest_ts_ms,
+            version=version.version,
+            modified_ts_ms=version.modified_ts_ms,
+        )
+    return apply_conditional(request, response, freshness)
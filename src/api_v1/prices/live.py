@@ -0,0 +1,99 @@
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from src.config import settings
+from src.prices.feed import FeedFull, Subscription, price_feed
+from .dependencies import valid_tickers
+
+router = APIRouter(tags=["Prices"])
+
+
+def _subscribe(tickers: list[str] | None) -> Subscription:
+    if not settings.price_feed_enabled:
+        raise HTTPException(status_code=503, detail="Live feed is disabled")
+    try:
+        return price_feed.subscribe(tickers)
+    except FeedFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+async def _encode_events(subscription: Subscription) -> AsyncIterator[str]:
+    with subscription:
+        while True:
+            messages = await subscription.get(timeout=settings.price_feed_heartbeat_s)
+            if not messages:
+                # Comment line; keeps proxies from closing an idle stream.
+                yield ": keepalive\n\n"
+                continue
+            yield "".join(f"event: price\ndata: {m}\n\n" for m in messages)
+
+
+class _LiveResponse(StreamingResponse):
+    """
+    Event stream that releases its subscription however the response ends,
+    including before the body generator ever started.
+    """
+
+    def __init__(self, subscription: Subscription) -> None:
+        super().__init__(
+            _encode_events(subscription),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self._subscription = subscription
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            price_feed.unsubscribe(self._subscription)
+
+
+@router.get("/live", status_code=200)
+async def stream_live_prices(ticker: list[str] | None = Query(None)):
+    tickers = await valid_tickers(ticker) if ticker else None
+    return _LiveResponse(_subscribe(tickers))
+
+
+@router.websocket("/ws")
+async def live_prices_websocket(
+    websocket: WebSocket, ticker: list[str] | None = Query(None)
+):
+    try:
+        tickers = await valid_tickers(ticker) if ticker else None
+        subscription = _subscribe(tickers)
+    except HTTPException as e:
+        await websocket.close(code=1008 if e.status_code == 422 else 1013)
+        return
+
+    await websocket.accept()
+    with subscription:
+        # Clients only listen; reading still notices a disconnect while no
+        # prices are arriving.
+        sender = asyncio.create_task(_send_messages(websocket, subscription))
+        receiver = asyncio.create_task(_wait_closed(websocket))
+        done, pending = await asyncio.wait(
+            (sender, receiver), return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
+
+
+async def _send_messages(websocket: WebSocket, subscription: Subscription) -> None:
+    while True:
+        for message in await subscription.get():
+            await websocket.send_text(message)
+
+
+async def _wait_closed(websocket: WebSocket) -> None:
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
@@ -1,40 +1,226 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.enums import Ticker
-from src.domain.schemas.price import PriceRead
+from src.domain.enums import ExportFormat, OhlcInterval, PriceLayout, StreamFormat
+from src.domain.schemas.price import (
+    PriceColumns,
+    PriceOhlcRead,
+    PricePage,
+    PriceRead,
+    PriceStats,
+    PricesAtTime,
+    PricesAtTimeQuery,
+)
 from src.models import db_helper
-from src.prices import crud
+from src.api_v1.routing import TimedRoute
+from src.prices import analytics, cache, crud, export, ohlc, serialization
+from .conditional import Freshness, apply_conditional, is_settled
+from .dependencies import conditional_prices, valid_ticker, valid_tickers
+
+router = APIRouter(tags=["Prices"], route_class=TimedRoute)
 
-router = APIRouter(tags=["Prices"])
 
+STREAM_MEDIA_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.CSV: "text/csv",
+}
 
-@router.get("/all", response_model=list[PriceRead], status_code=200)
+
+# Encoded with orjson directly; the schema is only documented for OpenAPI.
+@router.get(
+    "/all",
+    status_code=200,
+    response_class=Response,
+    responses={
+        200: {
+            "model": list[PriceRead] | PriceColumns,
+            "content": {"application/json": {}},
+        }
+    },
+)
 async def get_ticker_prices(
-    ticker: Ticker,
-    session: AsyncSession = Depends(db_helper.session_dependency),
+    ticker: str = Depends(valid_ticker),
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    layout: PriceLayout = PriceLayout.ROWS,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+    cache_headers: dict[str, str] = Depends(conditional_prices),
+):
+    points = await crud.read_price_points(session, ticker, from_ts, to_ts)
+    return Response(
+        serialization.encode_price_points(points, layout),
+        media_type="application/json",
+        headers=cache_headers,
+    )
+
+
+@router.get(
+    "/page",
+    response_model=PricePage,
+    status_code=200,
+    dependencies=[Depends(conditional_prices)],
+)
+async def get_ticker_prices_page(
+    ticker: str = Depends(valid_ticker),
+    limit: int = Query(1000, ge=1, le=10_000),
+    cursor: int | None = None,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    items = await cache.read_prices_page(
+        session, ticker, limit, cursor=cursor, from_ts=from_ts, to_ts=to_ts
+    )
+    next_cursor = items[-1].captured_ts_ms if len(items) == limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get("/stream", status_code=200)
+async def stream_ticker_prices(
+    ticker: str = Depends(valid_ticker),
+    format: StreamFormat = StreamFormat.NDJSON,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
 ):
-    return await crud.read_all_prices(session, ticker)
+    chunks = crud.stream_prices(session, ticker, from_ts, to_ts)
+    return StreamingResponse(
+        _encode_stream(chunks, format), media_type=STREAM_MEDIA_TYPES[format]
+    )
+
+
+@router.get("/export", status_code=200)
+async def export_ticker_prices(
+    ticker: str = Depends(valid_ticker),
+    format: ExportFormat = ExportFormat.ARROW,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    try:
+        export.price_schema()
+    except export.ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    filename = f"{ticker}_{from_ts or 0}_{to_ts or 'now'}.{format.value}"
+    return StreamingResponse(
+        export.export_prices(session, ticker, format, from_ts, to_ts),
+        media_type=export.EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/ohlc",
+    response_model=list[PriceOhlcRead],
+    status_code=200,
+    dependencies=[Depends(conditional_prices)],
+)
+async def get_ticker_ohlc(
+    interval: OhlcInterval,
+    ticker: str = Depends(valid_ticker),
+    from_ts: int | None = Query(None, alias="from"),
+    to_ts: int | None = Query(None, alias="to"),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    return await ohlc.read_ohlc(session, ticker, interval, from_ts, to_ts)
+
+
+@router.get(
+    "/stats",
+    response_model=PriceStats,
+    status_code=200,
+    dependencies=[Depends(conditional_prices)],
+)
+async def get_ticker_stats(
+    ticker: str = Depends(valid_ticker),
+    from_ts: int | None = Query(None, alias="from"),
+    to_ts: int | None = Query(None, alias="to"),
+    interval: OhlcInterval | None = None,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    try:
+        stats = await analytics.read_window_stats(
+            session, ticker, from_ts, to_ts, interval
+        )
+    except analytics.WindowTooLarge as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Price not found")
+    return stats
+
+
+async def _encode_stream(
+    chunks: AsyncIterator[list], format: StreamFormat
+) -> AsyncIterator[str]:
+    if format == StreamFormat.CSV:
+        yield "captured_ts_ms,price\n"
+        async for chunk in chunks:
+            yield "".join(f"{p.captured_ts_ms},{float(p.price)}\n" for p in chunk)
+        return
+
+    async for chunk in chunks:
+        yield "".join(
+            json.dumps({"price": float(p.price), "captured_ts_ms": p.captured_ts_ms})
+            + "\n"
+            for p in chunk
+        )
 
 
 @router.get("/last", response_model=PriceRead, status_code=200)
 async def get_ticker_last_price(
-    ticker: Ticker,
-    session: AsyncSession = Depends(db_helper.session_dependency),
+    request: Request,
+    response: Response,
+    ticker: str = Depends(valid_ticker),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
 ):
-    model = await crud.read_last_price(session, ticker)
+    model = await cache.read_last_price(session, ticker)
     if model is None:
         raise HTTPException(status_code=404, detail="Price not found")
+    apply_conditional(request, response, Freshness(ticker, model.captured_ts_ms))
     return model
 
 
 @router.get("/lastAtTime", response_model=PriceRead, status_code=200)
 async def get_last_price_at_ts(
-    ticker: Ticker,
+    request: Request,
+    response: Response,
     ts: int,
-    session: AsyncSession = Depends(db_helper.session_dependency),
+    ticker: str = Depends(valid_ticker),
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
 ):
-    model = await crud.read_last_price_at_time(session, ticker, ts)
+    model = await cache.read_last_price_at_time(session, ticker, ts)
     if model is None:
         raise HTTPException(status_code=404, detail="Price not found")
+    # Versioned by the price returned: a backfill that lands between it and
+    # ``ts`` changes the answer and with it the ETag.
+    freshness = Freshness(ticker, model.captured_ts_ms, settled=is_settled(ts))
+    apply_conditional(request, response, freshness)
     return model
+
+
+@router.post("/lastAtTime/batch", response_model=PricesAtTime, status_code=200)
+async def get_last_prices_at_times(
+    query: PricesAtTimeQuery,
+    session: AsyncSession = Depends(db_helper.read_session_dependency),
+):
+    tickers = await valid_tickers(query.tickers)
+    points = await crud.read_last_prices_at_times(session, tickers, query.ts)
+    return {
+        "items": [
+            (
+                None
+                if point is None
+                else {"ticker": ticker, "price": point[0], "captured_ts_ms": point[1]}
+            )
+            for ticker, point in zip(tickers, points)
+        ]
+    }
+
+
+@router.get("/cache", status_code=200)
+async def get_cache_stats() -> dict[str, int | float]:
+    return cache.price_cache.stats()
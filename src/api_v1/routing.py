@@ -0,0 +1,37 @@
+import inspect
+import time
+from functools import wraps
+from typing import Any, Callable
+
+from fastapi.routing import APIRoute
+
+from src.utils import timing
+
+
+def _timed(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # Sync endpoints run in a threadpool; they are left untimed.
+    if not inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timings = timing.current()
+        if timings is None:
+            return await endpoint(*args, **kwargs)
+        timings.endpoint_started = time.perf_counter()
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings.endpoint_finished = time.perf_counter()
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    Route that records when its endpoint starts and returns, so the
+    ``Server-Timing`` header can split dependencies from serialization.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs) -> None:
+        super().__init__(path, _timed(endpoint), **kwargs)
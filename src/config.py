@@ -1,5 +1,7 @@
 import os
+from typing import Literal, Self
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,16 +14,107 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str
     db_echo: bool = False
+    # Read replica for API reads; the primary when unset.
+    db_read_host: str | None = None
+    db_read_port: int | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_s: float = 30.0
+    db_pool_recycle_s: int = 1800
+    db_pool_pre_ping: bool = True
+    # Prepared statements cached per connection; 0 behind PgBouncer in
+    # transaction mode.
+    db_statement_cache_size: int = 100
 
     celery_broker_url: str
     celery_result_backend: str
 
+    log_level: str = "INFO"
+    log_format: Literal["text", "json"] = "text"
+    log_to_file: bool = True
+    log_queue: bool = True
+    # Successful requests beyond this many per second are sampled.
+    log_requests_per_s: int | None = 100
+    log_requests_sample_rate: float = 0.01
+    log_slow_request_ms: float = 1000.0
+    server_timing: bool = False
+
+    tickers: list[str] = ["btc_usd", "eth_usd"]
+    track_all_indices: bool = False
+    ticker_refresh_interval_s: float = 60.0
+    collector_shards: int = 1
+
+    prices_partitions_ahead: int = 3
+    prices_retention_days: int | None = None
+    prices_retention_drop: bool = False
+
+    price_cache_enabled: bool = True
+    price_cache_ttl_s: float = 60.0
+
+    # Shared cache tier for multi-replica deployments, e.g. redis://redis:6379/2.
+    redis_cache_url: str | None = None
+    redis_cache_lock_ttl_s: float = 5.0
+
+    price_feed_enabled: bool = True
+    price_feed_buffer_size: int = 100
+    price_feed_max_subscribers: int = 10_000
+    price_feed_heartbeat_s: float = 15.0
+
+    # Cache lifetime of /prices/lastAtTime answers that collection can no
+    # longer change; only a backfill of that range can.
+    settled_max_age_s: int = 3600
+
+    stats_cache_size: int = 256
+    stats_cache_ttl_s: float = 300.0
+    # Longest /prices/stats window, and the default one without ``from``.
+    stats_max_window_days: float = 31.0
+
+    collect_interval_s: float = 60.0
+    collect_deadline_s: float = 30.0
+    # Venues polled every collection, see src/sources/registry.py.
+    price_sources: list[str] = ["deribit"]
+    # Source the API serves, rolls up and publishes; "composite" for the
+    # median of all sources.
+    primary_price_source: str = "deribit"
+    # Per-source overrides of collect_deadline_s and of the request concurrency.
+    price_source_timeouts_s: dict[str, float] = {}
+    price_source_concurrency: dict[str, int] = {}
+
+    worker_http_limit: int = 100
+    worker_http_keepalive_s: float = 120.0
+    worker_dns_cache_ttl_s: int = 300
+    worker_metrics_port: int | None = 9100
+
+    backfill_checkpoint_dir: str = "checkpoints"
+
+    stream_queue_size: int = 10_000
+    stream_batch_size: int = 500
+    stream_flush_interval_s: float = 1.0
+    stream_metrics_port: int | None = 9101
+
     model_config = SettingsConfigDict(
         env_file=os.getenv("ENV_FILE", ".env"),
         env_file_encoding="utf-8",
         extra="ignore",
     )
 
+    @model_validator(mode="after")
+    def _check_primary_price_source(self) -> Self:
+        # "composite" is src.sources.COMPOSITE_SOURCE, stored only when the
+        # collector has more than one source to take the median of.
+        if self.primary_price_source == "composite":
+            if len(self.price_sources) < 2:
+                raise ValueError(
+                    "primary_price_source 'composite' needs at least two "
+                    f"price_sources, got {self.price_sources}"
+                )
+        elif self.primary_price_source not in self.price_sources:
+            raise ValueError(
+                f"primary_price_source {self.primary_price_source!r} is not one "
+                f"of price_sources {self.price_sources}"
+            )
+        return self
+
     @property
     def db_url(self) -> str:
         return (
@@ -30,5 +123,23 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}"
         )
 
+    @property
+    def db_read_url(self) -> str | None:
+        if self.db_read_host is None:
+            return None
+        return (
+            f"postgresql+asyncpg://"
+            f"{self.db_user}:{self.db_password}"
+            f"@{self.db_read_host}:{self.db_read_port or self.db_port}/{self.db_name}"
+        )
+
+    @property
+    def db_dsn(self) -> str:
+        return (
+            f"postgresql://"
+            f"{self.db_user}:{self.db_password}"
+            f"@{self.db_host}:{self.db_port}/{self.db_name}"
+        )
+
 
 settings = Settings()
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import asyncio
+import random
 import time
 from dataclasses import dataclass
-from typing import Iterable
+from email.utils import parsedate_to_datetime
+from typing import Any, Iterable
 from urllib.parse import urljoin
 
 import aiohttp
@@ -11,12 +13,20 @@ import aiohttp
 from .config import (
     DERIBIT_BASE_URL,
     ERROR_KEY,
+    INDEX_CHART_DATA_ENDPOINT,
+    INDEX_CHART_RANGE_ALL,
+    INDEX_CHART_RANGES,
     INDEX_PRICE_ENDPOINT,
+    INDEX_PRICE_NAMES_ENDPOINT,
     INDEX_PRICE_KEY,
     RESULT_KEY,
+    US_IN_KEY,
+    US_OUT_KEY,
 )
+from .ratelimit import Admission, CircuitBreaker, RetryBudget, TokenBucket
 from src.domain.schemas.price import PriceFull
-from ..domain.enums import Ticker
+from src.sources.base import DEFAULT_SOURCE, IndexPricesBatch
+from src.utils import metrics
 
 
 class DeribitError(Exception):
@@ -34,17 +44,71 @@ class DeribitUnavailable(DeribitError):
 class DeribitRateLimited(DeribitError):
     """Deribit rate limiting (429)."""
 
+    def __init__(self, message: str, retry_after_s: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+class DeribitCircuitOpen(DeribitUnavailable):
+    """Deribit marked as down; request rejected without being sent."""
+
 
 class DeribitBadResponse(DeribitError):
     """Unexpected response format / missing keys / invalid data."""
 
 
+def _parse_retry_after(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except TypeError, ValueError:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass(frozen=True, slots=True)
+class _Response:
+    result: Any
+    # When Deribit handled the request, or the local clock if not reported.
+    ts_ms: int
+
+
+def _exchange_ts_ms(data: dict) -> int | None:
+    """
+    Midpoint of Deribit's ``usIn``/``usOut`` (microseconds), in ms.
+    """
+    us_in, us_out = data.get(US_IN_KEY), data.get(US_OUT_KEY)
+    if not isinstance(us_in, int) or not isinstance(us_out, int):
+        return None
+    return (us_in + us_out) // 2000
+
+
 @dataclass(frozen=True, slots=True)
 class DeribitClientConfig:
+    source: str = DEFAULT_SOURCE
     base_url: str = DERIBIT_BASE_URL
     endpoint: str = INDEX_PRICE_ENDPOINT
     timeout_s: float = 10.0
     concurrency: int = 10
+    # Deribit public limits: every request costs credits that refill per second.
+    rate_limit_credits_per_s: float = 10_000
+    rate_limit_max_credits: float = 50_000
+    request_cost_credits: float = 500
+    max_retries: int = 3
+    retry_backoff_s: float = 0.2
+    retry_backoff_max_s: float = 5.0
+    retry_budget_ratio: float = 0.2
+    retry_budget_min: int = 10
+    breaker_failure_threshold: int = 5
+    breaker_reset_timeout_s: float = 30.0
+    # Round captured_ts_ms down to this grid, so every ticker of one
+    # collection (and every retry of it) shares a timestamp.
+    capture_bucket_ms: int | None = None
 
 
 class DeribitClient:
@@ -61,6 +125,26 @@ class DeribitClient:
         self._session: aiohttp.ClientSession | None = session
         self._owns_session = session is None
         self._semaphore = asyncio.Semaphore(self._config.concurrency)
+        self._rate_limiter = TokenBucket(
+            self._config.rate_limit_credits_per_s, self._config.rate_limit_max_credits
+        )
+        self._retry_budget = RetryBudget(
+            self._config.retry_budget_ratio, self._config.retry_budget_min
+        )
+        self._breaker = CircuitBreaker(
+            self._config.breaker_failure_threshold,
+            self._config.breaker_reset_timeout_s,
+        )
+        # Wall clock read once; later local timestamps advance monotonically.
+        self._clock_offset_ms = time.time() * 1000 - time.monotonic() * 1000
+
+    @property
+    def name(self) -> str:
+        return self._config.source
+
+    @property
+    def session(self) -> aiohttp.ClientSession | None:
+        return self._session
 
     async def __aenter__(self) -> "DeribitClient":
         if self._session is None:
@@ -83,29 +167,110 @@ class DeribitClient:
             await self._session.close()
         self._session = None
 
-    def _build_url(self) -> str:
-        return urljoin(
-            self._config.base_url.rstrip("/") + "/", self._config.endpoint.lstrip("/")
+    def _build_url(self, endpoint: str) -> str:
+        return urljoin(self._config.base_url.rstrip("/") + "/", endpoint.lstrip("/"))
+
+    def _backoff_s(self, attempt: int) -> float:
+        cap = min(
+            self._config.retry_backoff_max_s,
+            self._config.retry_backoff_s * 2**attempt,
         )
+        return random.uniform(0, cap)
+
+    def _local_ts_ms(self) -> float:
+        return self._clock_offset_ms + time.monotonic() * 1000
+
+    def _capture_ts_ms(self, ts_ms: int) -> int:
+        bucket_ms = self._config.capture_bucket_ms
+        return ts_ms - ts_ms % bucket_ms if bucket_ms else ts_ms
+
+    @staticmethod
+    def _record_error(endpoint: str, error: type[DeribitError]) -> None:
+        metrics.DERIBIT_ERRORS.labels(endpoint, error.__name__).inc()
 
-    async def get_index_price(self, ticker: Ticker) -> PriceFull:
+    async def _get(self, endpoint: str, params: dict[str, str]) -> Any:
         """
-        Fetch index price for a single ticker.
+        GET a public endpoint and return the JSON-RPC ``result``.
+        """
+        return (await self._request(endpoint, params)).result
+
+    async def _request(self, endpoint: str, params: dict[str, str]) -> _Response:
         """
+        GET a public endpoint.
+
+        Transient failures are retried with jittered backoff while the shared
+        retry budget allows; a 429 pauses the rate limiter for every request.
+        """
+        self._retry_budget.record_request()
+        attempt = 0
+        while True:
+            admission = self._breaker.allow_request()
+            if admission is Admission.DENIED:
+                self._record_error(endpoint, DeribitCircuitOpen)
+                raise DeribitCircuitOpen("Deribit circuit breaker is open")
+
+            delay_s = 0.0
+            try:
+                result = await self._get_once(endpoint, params)
+            except DeribitRateLimited as e:
+                self._record_error(endpoint, type(e))
+                self._breaker.record_success()
+                self._rate_limiter.pause(e.retry_after_s or self._backoff_s(attempt))
+                error: DeribitError = e
+            except DeribitUnavailable as e:
+                self._record_error(endpoint, type(e))
+                self._breaker.record_failure()
+                delay_s = self._backoff_s(attempt)
+                error = e
+            except DeribitBadResponse as e:
+                self._record_error(endpoint, type(e))
+                self._breaker.record_success()
+                raise
+            except BaseException:
+                # Cancelled, e.g. by a batch deadline: nothing to record, but
+                # a half-open probe must not stay taken forever. Other
+                # requests leave the flag alone: it belongs to the probe.
+                if admission is Admission.PROBE:
+                    self._breaker.release_probe()
+                raise
+            else:
+                self._breaker.record_success()
+                return result
+
+            if (
+                attempt >= self._config.max_retries
+                or not self._retry_budget.try_spend()
+            ):
+                raise error
+            attempt += 1
+            await asyncio.sleep(delay_s)
+
+    async def _get_once(self, endpoint: str, params: dict[str, str]) -> _Response:
         if self._session is None:
             self._session = self._create_session()
             self._owns_session = True
 
-        url = self._build_url()
+        url = self._build_url(endpoint)
+        waiting_since = time.perf_counter()
         async with self._semaphore:
+            metrics.DERIBIT_SEMAPHORE_WAIT.observe(time.perf_counter() - waiting_since)
+            metrics.DERIBIT_RATE_LIMIT_WAIT.observe(
+                await self._rate_limiter.acquire(self._config.request_cost_credits)
+            )
+            status: int | str = "error"
+            sent_ms = self._local_ts_ms()
+            started = time.perf_counter()
             try:
-                async with self._session.get(
-                    url, params={"index_name": ticker.value}
-                ) as resp:
+                async with self._session.get(url, params=params) as resp:
                     status = resp.status
 
                     if status == 429:
-                        raise DeribitRateLimited("Deribit rate limited (HTTP 429)")
+                        raise DeribitRateLimited(
+                            "Deribit rate limited (HTTP 429)",
+                            retry_after_s=_parse_retry_after(
+                                resp.headers.get("Retry-After")
+                            ),
+                        )
                     if 500 <= status <= 599:
                         raise DeribitUnavailable(
                             f"Deribit server error (HTTP {status})"
@@ -115,6 +280,7 @@ class DeribitClient:
                         raise DeribitBadResponse(f"Deribit HTTP {status}: {text[:200]}")
 
                     data = await resp.json()
+                    received_ms = self._local_ts_ms()
 
             except (
                 aiohttp.ClientConnectionError,
@@ -126,6 +292,10 @@ class DeribitClient:
                 raise DeribitBadResponse(
                     f"Expected JSON response, got invalid content-type: {e!r}"
                 ) from e
+            finally:
+                metrics.DERIBIT_REQUEST_DURATION.labels(endpoint, str(status)).observe(
+                    time.perf_counter() - started
+                )
 
         if isinstance(data, dict) and data.get(ERROR_KEY):
             raise DeribitBadResponse(
@@ -134,6 +304,26 @@ class DeribitClient:
 
         try:
             result = data[RESULT_KEY]
+        except Exception as e:
+            raise DeribitBadResponse(f"Missing expected keys in response: {e!r}") from e
+
+        ts_ms = _exchange_ts_ms(data)
+        if ts_ms is None:
+            ts_ms = int((sent_ms + received_ms) / 2)
+        return _Response(result=result, ts_ms=ts_ms)
+
+    async def get_index_price(self, ticker: str) -> PriceFull:
+        """
+        Fetch index price for a single ticker.
+
+        ``captured_ts_ms`` is when Deribit handled the request (``usIn`` and
+        ``usOut``), falling back to the local clock, rounded down to
+        ``capture_bucket_ms``.
+        """
+        response = await self._request(self._config.endpoint, {"index_name": ticker})
+        result = response.result
+
+        try:
             price_raw = result[INDEX_PRICE_KEY]
         except Exception as e:
             raise DeribitBadResponse(f"Missing expected keys in response: {e!r}") from e
@@ -143,18 +333,101 @@ class DeribitClient:
         except (TypeError, ValueError) as e:
             raise DeribitBadResponse(f"Invalid price value: {price_raw!r}") from e
 
-        captured_ts_ms = int(time.time() * 1000)
-
         return PriceFull(
             ticker=ticker,
             price=price,
-            captured_ts_ms=captured_ts_ms,
+            captured_ts_ms=self._capture_ts_ms(response.ts_ms),
+        )
+
+    async def get_index_history(
+        self, ticker: str, from_ts: int, to_ts: int
+    ) -> list[PriceFull]:
+        """
+        Fetch historical index prices for ``[from_ts, to_ts]``, oldest first.
+
+        Deribit only serves index history for ranges ending now, so the
+        smallest range covering ``from_ts`` is requested and filtered locally.
+        """
+        age_ms = int(time.time() * 1000) - from_ts
+        chart_range = next(
+            (name for name, span_ms in INDEX_CHART_RANGES if span_ms >= age_ms),
+            INDEX_CHART_RANGE_ALL,
+        )
+        result = await self._get(
+            INDEX_CHART_DATA_ENDPOINT,
+            {"index_name": ticker, "range": chart_range},
         )
 
-    async def get_index_prices(self, tickers: Iterable[Ticker]) -> list[PriceFull]:
+        if not isinstance(result, list):
+            raise DeribitBadResponse(f"Unexpected index chart payload: {result!r}")
+
+        prices = []
+        for point in result:
+            try:
+                ts_raw, price_raw = point
+                captured_ts_ms = int(ts_raw)
+                price = float(price_raw)
+            except (TypeError, ValueError) as e:
+                raise DeribitBadResponse(f"Invalid chart point: {point!r}") from e
+            if from_ts <= captured_ts_ms <= to_ts:
+                prices.append(
+                    PriceFull(ticker=ticker, price=price, captured_ts_ms=captured_ts_ms)
+                )
+
+        prices.sort(key=lambda p: p.captured_ts_ms)
+        return prices
+
+    async def get_index_price_names(self) -> list[str]:
+        """
+        Fetch names of all indices published by Deribit.
+        """
+        result = await self._get(INDEX_PRICE_NAMES_ENDPOINT, {})
+        if not isinstance(result, list) or not all(
+            isinstance(name, str) for name in result
+        ):
+            raise DeribitBadResponse(f"Invalid index names: {result!r}")
+        return result
+
+    async def get_index_prices(self, tickers: Iterable[str]) -> list[PriceFull]:
         """
         Fetch index price for multiple tickers.
         """
         ticker_list = list(tickers)
         tasks = [self.get_index_price(t) for t in ticker_list]
         return await asyncio.gather(*tasks)
+
+    async def get_index_prices_batch(
+        self, tickers: Iterable[str], deadline_s: float | None = None
+    ) -> IndexPricesBatch:
+        """
+        Fetch index price for multiple tickers, keeping partial results.
+
+        Failed tickers are reported in ``failures`` instead of discarding the
+        whole batch. Tickers still in flight at ``deadline_s`` are cancelled
+        and reported as ``DeribitUnavailable``.
+        """
+        tasks = {asyncio.ensure_future(self.get_index_price(t)): t for t in tickers}
+        batch = IndexPricesBatch()
+        if not tasks:
+            return batch
+
+        done, pending = await asyncio.wait(tasks, timeout=deadline_s)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task, ticker in tasks.items():
+            if task in pending:
+                batch.failures[ticker] = DeribitUnavailable(
+                    f"Deribit batch deadline of {deadline_s}s exceeded"
+                )
+                continue
+            exc = task.exception()
+            if exc is None:
+                batch.prices.append(task.result())
+            elif isinstance(exc, DeribitError):
+                batch.failures[ticker] = exc
+            else:
+                raise exc
+        return batch
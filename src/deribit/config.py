@@ -1,9 +1,41 @@
 from __future__ import annotations
 
 DERIBIT_BASE_URL = "https://www.deribit.com"
+DERIBIT_TESTNET_BASE_URL = "https://test.deribit.com"
 INDEX_PRICE_ENDPOINT = "/api/v2/public/get_index_price"
+INDEX_CHART_DATA_ENDPOINT = "/api/v2/public/get_index_chart_data"
+INDEX_PRICE_NAMES_ENDPOINT = "/api/v2/public/get_index_price_names"
+
+# (range, span in ms) accepted by get_index_chart_data, smallest first.
+INDEX_CHART_RANGES = (
+    ("1h", 60 * 60 * 1000),
+    ("1d", 24 * 60 * 60 * 1000),
+    ("2d", 2 * 24 * 60 * 60 * 1000),
+    ("1m", 30 * 24 * 60 * 60 * 1000),
+    ("1y", 365 * 24 * 60 * 60 * 1000),
+)
+INDEX_CHART_RANGE_ALL = "all"
+
+DERIBIT_WS_URL = "wss://www.deribit.com/ws/api/v2"
+INDEX_PRICE_CHANNEL = "deribit_price_index.{index_name}"
+
+SUBSCRIBE_METHOD = "public/subscribe"
+SET_HEARTBEAT_METHOD = "public/set_heartbeat"
+TEST_METHOD = "public/test"
+SUBSCRIPTION_NOTIFICATION = "subscription"
+HEARTBEAT_NOTIFICATION = "heartbeat"
+HEARTBEAT_TEST_REQUEST = "test_request"
 
 RESULT_KEY = "result"
+US_IN_KEY = "usIn"
+US_OUT_KEY = "usOut"
 ERROR_KEY = "error"
+METHOD_KEY = "method"
+PARAMS_KEY = "params"
+CHANNEL_KEY = "channel"
+DATA_KEY = "data"
 
 INDEX_PRICE_KEY = "index_price"
+INDEX_NAME_KEY = "index_name"
+PRICE_KEY = "price"
+TIMESTAMP_KEY = "timestamp"
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import enum
+import time
+
+
+class TokenBucket:
+    """
+    Credit-based token bucket mirroring Deribit's rate limits.
+
+    Every request spends ``cost`` credits; credits refill continuously at
+    ``rate_per_s`` up to ``capacity``. ``pause`` blocks all callers, e.g. for
+    a ``Retry-After`` received from the server.
+    """
+
+    def __init__(self, rate_per_s: float, capacity: float) -> None:
+        self._rate_per_s = rate_per_s
+        self._capacity = capacity
+        self._credits = capacity
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._credits = min(self._capacity, self._credits + elapsed * self._rate_per_s)
+        self._updated_at = now
+
+    def pause(self, delay_s: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + delay_s)
+        self._credits = 0.0
+
+    async def acquire(self, cost: float) -> float:
+        """
+        Wait until ``cost`` credits are available; returns the time waited.
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self._credits >= cost:
+                    self._credits -= cost
+                    return time.monotonic() - started
+                await asyncio.sleep((cost - self._credits) / self._rate_per_s)
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of requests so retries cannot amplify load.
+
+    Each request deposits ``ratio`` of a retry, each retry withdraws one.
+    The budget starts with ``min_retries`` so low traffic can still retry,
+    and keeps at most ``max_saved_requests`` worth of deposits on top.
+    """
+
+    def __init__(
+        self, ratio: float, min_retries: int, max_saved_requests: int = 100
+    ) -> None:
+        self._ratio = ratio
+        self._balance = float(min_retries)
+        self._max_balance = min_retries + ratio * max_saved_requests
+
+    def record_request(self) -> None:
+        self._balance = min(self._balance + self._ratio, self._max_balance)
+
+    def try_spend(self) -> bool:
+        if self._balance < 1:
+            return False
+        self._balance -= 1
+        return True
+
+
+class Admission(enum.Enum):
+    DENIED = enum.auto()
+    ALLOWED = enum.auto()
+    # The single half-open request whose outcome decides the circuit.
+    PROBE = enum.auto()
+
+
+class CircuitBreaker:
+    """
+    Fails fast after ``failure_threshold`` consecutive failures.
+
+    Once ``reset_timeout_s`` has passed a single probe request is let
+    through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_s: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> Admission:
+        if self._opened_at is None:
+            return Admission.ALLOWED
+        if self._probing:
+            return Admission.DENIED
+        if time.monotonic() - self._opened_at < self._reset_timeout_s:
+            return Admission.DENIED
+        self._probing = True
+        return Admission.PROBE
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """
+        Give up a probe that ended without an outcome (e.g. was cancelled),
+        so the next request can probe instead. Only the request admitted as
+        ``Admission.PROBE`` may call this.
+        """
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._probing or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+        self._probing = False
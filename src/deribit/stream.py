@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+from dataclasses import dataclass
+from typing import Any, Iterable
+
+import aiohttp
+
+from .client import DeribitBadResponse, DeribitError, DeribitUnavailable
+from .config import (
+    CHANNEL_KEY,
+    DATA_KEY,
+    DERIBIT_WS_URL,
+    ERROR_KEY,
+    HEARTBEAT_NOTIFICATION,
+    HEARTBEAT_TEST_REQUEST,
+    INDEX_NAME_KEY,
+    INDEX_PRICE_CHANNEL,
+    METHOD_KEY,
+    PARAMS_KEY,
+    PRICE_KEY,
+    RESULT_KEY,
+    SET_HEARTBEAT_METHOD,
+    SUBSCRIBE_METHOD,
+    SUBSCRIPTION_NOTIFICATION,
+    TEST_METHOD,
+    TIMESTAMP_KEY,
+)
+from src.domain.schemas.price import PriceFull
+from src.utils import logger
+
+
+@dataclass(frozen=True, slots=True)
+class DeribitStreamConfig:
+    ws_url: str = DERIBIT_WS_URL
+    heartbeat_interval_s: int = 30
+    request_timeout_s: float = 10.0
+    reconnect_delay_s: float = 1.0
+    reconnect_delay_max_s: float = 30.0
+
+
+class DeribitStreamCollector:
+    """
+    Deribit JSON-RPC/WebSocket collector for index prices.
+
+    Subscribes to ``deribit_price_index.*`` channels and puts every received
+    price into a bounded queue. When the queue is full the oldest price is
+    dropped, so a slow consumer never stalls the socket reader.
+    """
+
+    def __init__(
+        self,
+        tickers: Iterable[str],
+        queue: asyncio.Queue[PriceFull],
+        config: DeribitStreamConfig | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ) -> None:
+        self._tickers = tuple(dict.fromkeys(tickers))
+        self._ticker_names = frozenset(self._tickers)
+        self._queue = queue
+        self._config = config or DeribitStreamConfig()
+        self._session: aiohttp.ClientSession | None = session
+        self._owns_session = session is None
+        self._ids = itertools.count(1)
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self._stopped = asyncio.Event()
+        self.connected = asyncio.Event()
+        self.received = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    @property
+    def channels(self) -> list[str]:
+        return [INDEX_PRICE_CHANNEL.format(index_name=name) for name in self._tickers]
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._ws is not None and not self._ws.closed:
+            asyncio.ensure_future(self._ws.close())
+
+    async def aclose(self) -> None:
+        self.stop()
+        if (
+            self._owns_session
+            and self._session is not None
+            and not self._session.closed
+        ):
+            await self._session.close()
+        self._session = None
+
+    async def run(self) -> None:
+        """
+        Stream prices until ``stop()`` is called, reconnecting with backoff.
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+            self._owns_session = True
+
+        delay = self._config.reconnect_delay_s
+        while not self._stopped.is_set():
+            try:
+                await self._run_connection()
+                delay = self._config.reconnect_delay_s
+            except (DeribitError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if self._stopped.is_set():
+                    break
+                logger.warning("Deribit stream disconnected: %r", e)
+            finally:
+                self._ws = None
+                self.connected.clear()
+
+            if self._stopped.is_set():
+                break
+
+            self.reconnects += 1
+            sleep_s = delay * (0.5 + random.random() / 2)
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=sleep_s)
+            except asyncio.TimeoutError:
+                pass
+            delay = min(delay * 2, self._config.reconnect_delay_max_s)
+
+    async def _run_connection(self) -> None:
+        async with self._session.ws_connect(
+            self._config.ws_url,
+            timeout=aiohttp.ClientWSTimeout(ws_close=self._config.request_timeout_s),
+        ) as ws:
+            self._ws = ws
+            await self._request(
+                ws,
+                SET_HEARTBEAT_METHOD,
+                {"interval": self._config.heartbeat_interval_s},
+            )
+            await self._request(ws, SUBSCRIBE_METHOD, {"channels": self.channels})
+            self.connected.set()
+            logger.info("Deribit stream subscribed to %s", ", ".join(self.channels))
+
+            while not self._stopped.is_set():
+                msg = await ws.receive(timeout=self._config.heartbeat_interval_s * 2)
+                await self._handle_message(ws, self._parse(msg))
+
+    async def _request(
+        self, ws: aiohttp.ClientWebSocketResponse, method: str, params: dict[str, Any]
+    ) -> Any:
+        request_id = next(self._ids)
+        await ws.send_json(
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        )
+        async with asyncio.timeout(self._config.request_timeout_s):
+            while True:
+                data = self._parse(await ws.receive())
+                if data.get("id") != request_id:
+                    await self._handle_message(ws, data)
+                    continue
+                if data.get(ERROR_KEY):
+                    raise DeribitBadResponse(
+                        f"Deribit {method} failed: {data.get(ERROR_KEY)!r}"
+                    )
+                return data.get(RESULT_KEY)
+
+    @staticmethod
+    def _parse(msg: aiohttp.WSMessage) -> dict[str, Any]:
+        if msg.type in (
+            aiohttp.WSMsgType.CLOSE,
+            aiohttp.WSMsgType.CLOSING,
+            aiohttp.WSMsgType.CLOSED,
+        ):
+            raise DeribitUnavailable("Deribit stream closed by server")
+        if msg.type == aiohttp.WSMsgType.ERROR:
+            raise DeribitUnavailable(f"Deribit stream error: {msg.data!r}")
+        if msg.type != aiohttp.WSMsgType.TEXT:
+            raise DeribitBadResponse(f"Unexpected WebSocket message type: {msg.type!r}")
+        try:
+            data = json.loads(msg.data)
+        except ValueError as e:
+            raise DeribitBadResponse(f"Invalid JSON from Deribit stream: {e!r}") from e
+        if not isinstance(data, dict):
+            raise DeribitBadResponse(f"Unexpected stream payload: {data!r}")
+        return data
+
+    async def _handle_message(
+        self, ws: aiohttp.ClientWebSocketResponse, data: dict[str, Any]
+    ) -> None:
+        method = data.get(METHOD_KEY)
+        params = data.get(PARAMS_KEY) or {}
+
+        if method == HEARTBEAT_NOTIFICATION:
+            if params.get("type") == HEARTBEAT_TEST_REQUEST:
+                await ws.send_json(
+                    {
+                        "jsonrpc": "2.0",
+                        "id": next(self._ids),
+                        "method": TEST_METHOD,
+                        "params": {},
+                    }
+                )
+            return
+
+        if method != SUBSCRIPTION_NOTIFICATION:
+            return
+
+        try:
+            payload = params[DATA_KEY]
+            ticker = payload[INDEX_NAME_KEY]
+            if ticker not in self._ticker_names:
+                return
+            price = PriceFull(
+                ticker=ticker,
+                price=float(payload[PRICE_KEY]),
+                captured_ts_ms=int(payload[TIMESTAMP_KEY]),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(
+                "Skipping malformed Deribit notification on %s: %r",
+                params.get(CHANNEL_KEY),
+                e,
+            )
+            return
+
+        self._put(price)
+
+    def _put(self, price: PriceFull) -> None:
+        self.received += 1
+        while True:
+            try:
+                self._queue.put_nowait(price)
+                return
+            except asyncio.QueueFull:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except asyncio.QueueEmpty:
+                    pass
+                self.dropped += 1
@@ -1 +1,4 @@
-from .ticker import Ticker
+from .stream_format import StreamFormat
+from .ohlc_interval import OhlcInterval
+from .price_layout import PriceLayout
+from .export_format import ExportFormat
@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class OhlcInterval(str, Enum):
+    M1 = "1m"
+    M5 = "5m"
+    H1 = "1h"
+    D1 = "1d"
+
+    @property
+    def ms(self) -> int:
+        return OHLC_INTERVAL_MS[self]
+
+
+OHLC_INTERVAL_MS = {
+    OhlcInterval.M1: 60_000,
+    OhlcInterval.M5: 5 * 60_000,
+    OhlcInterval.H1: 60 * 60_000,
+    OhlcInterval.D1: 24 * 60 * 60_000,
+}
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class PriceLayout(str, Enum):
+    ROWS = "rows"
+    COLUMNAR = "columnar"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,6 +0,0 @@
-from enum import Enum
-
-
-class Ticker(str, Enum):
-    BTC_USD = "btc_usd"
-    ETH_USD = "eth_usd"
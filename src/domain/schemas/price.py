@@ -1,6 +1,4 @@
-from pydantic import BaseModel
-
-from src.domain.enums import Ticker
+from pydantic import BaseModel, Field, model_validator
 
 
 class PriceRead(BaseModel):
@@ -9,4 +7,64 @@ class PriceRead(BaseModel):
 
 
 class PriceFull(PriceRead):
-    ticker: Ticker
+    ticker: str
+
+
+class PriceColumns(BaseModel):
+    ts: list[int]
+    price: list[float]
+
+
+class PricePage(BaseModel):
+    items: list[PriceRead]
+    next_cursor: int | None
+
+
+class PricesAtTimeQuery(BaseModel):
+    ts: list[int] = Field(min_length=1, max_length=100_000)
+    # One ticker for every timestamp, or one per timestamp.
+    ticker: str | list[str]
+
+    @model_validator(mode="after")
+    def _check_tickers(self):
+        if isinstance(self.ticker, list) and len(self.ticker) != len(self.ts):
+            raise ValueError("ticker must be a string or match ts in length")
+        return self
+
+    @property
+    def tickers(self) -> list[str]:
+        if isinstance(self.ticker, str):
+            return [self.ticker] * len(self.ts)
+        return self.ticker
+
+
+class PricesAtTime(BaseModel):
+    items: list[PriceFull | None]
+
+
+class PriceStats(BaseModel):
+    count: int
+    from_ts: int
+    to_ts: int
+    first: float
+    last: float
+    min: float
+    max: float
+    mean: float
+    twap: float
+    # ``return`` is a keyword, hence the alias.
+    total_return: float = Field(alias="return")
+    max_drawdown: float
+    samples: int
+    mean_return: float | None
+    volatility: float | None
+    annualized_volatility: float | None
+
+
+class PriceOhlcRead(BaseModel):
+    bucket_ts_ms: int
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int
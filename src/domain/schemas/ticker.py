@@ -1,7 +1,5 @@
 from pydantic import BaseModel
 
-from src.domain.enums import Ticker
-
 
 class TickerBase(BaseModel):
-    ticker: Ticker
+    ticker: str
@@ -1,16 +1,58 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from starlette.middleware.cors import CORSMiddleware
 
 from src.api_v1 import router as router_v1
 from src.config import settings
 from src.middlewares import RequestLoggingMiddleware
+from src.prices import redis_cache
+from src.prices.cache import price_cache
+from src.prices.feed import price_feed
+from src.prices.notifications import PriceListener
+from src.utils import metrics
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+
+    if settings.price_cache_enabled or settings.price_feed_enabled:
+        # One LISTEN connection per process feeds both the cache and live clients.
+        listener = PriceListener(settings.db_dsn)
+        if settings.price_cache_enabled:
+            listener.add_handler(price_cache.update)
+            listener.add_reset_handler(price_cache.clear)
+        if settings.price_feed_enabled:
+            listener.add_handler(price_feed.publish)
+        app.state.price_listener = listener
+        tasks.append(asyncio.create_task(listener.run()))
+
+    if redis_cache.redis_price_cache is not None:
+        tasks.append(asyncio.create_task(redis_cache.redis_price_cache.listen()))
 
-app = FastAPI()
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(router_v1, prefix=settings.api_v1_prefix)
 
-app.add_middleware(RequestLoggingMiddleware)
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    body, content_type = metrics.render()
+    return Response(body, media_type=content_type)
+
+
+app.add_middleware(RequestLoggingMiddleware, server_timing=settings.server_timing)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,23 +1,104 @@
+import random
 import time
+from typing import Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from src.utils import logger
+from src.config import settings
+from src.utils import logger, metrics, timing
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
+class RequestLogSampler:
+    """
+    Decides which successful requests get a log line.
+
+    Up to ``per_s`` are logged each second, beyond that only ``sample_rate``
+    of them. Errors and requests slower than ``slow_ms`` are always logged.
+    """
+
+    def __init__(
+        self,
+        per_s: int | None,
+        sample_rate: float,
+        slow_ms: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._per_s = per_s
+        self._sample_rate = sample_rate
+        self._slow_ms = slow_ms
+        self._clock = clock
+        self._window = 0
+        self._count = 0
+        self.skipped = 0
+
+    def should_log(self, status: int, duration_ms: float) -> bool:
+        if self._per_s is None or status >= 400 or duration_ms >= self._slow_ms:
+            return True
+
+        window = int(self._clock())
+        if window != self._window:
+            self._window, self._count = window, 0
+        self._count += 1
+        if self._count <= self._per_s or random.random() < self._sample_rate:
+            return True
+        self.skipped += 1
+        return False
+
+
+class RequestLoggingMiddleware:
+    """
+    Logs and measures every HTTP request.
+
+    A plain ASGI middleware: it only wraps ``send``, so responses, including
+    streaming ones, pass through without an extra task per request. With
+    ``server_timing`` a ``Server-Timing`` header breaks the request down.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sampler: RequestLogSampler | None = None,
+        server_timing: bool = False,
+    ) -> None:
+        self.app = app
+        self.sampler = sampler or RequestLogSampler(
+            settings.log_requests_per_s,
+            settings.log_requests_sample_rate,
+            settings.log_slow_request_ms,
+        )
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         start = time.perf_counter()
 
-        method = request.method
-        path = request.url.path
-        client = request.client.host if request.client else "-"
+        method = scope["method"]
+        path = scope["path"]
+        client = scope["client"][0] if scope.get("client") else "-"
+        status_code = 500
+        token = timing.start() if self.server_timing else None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                timings = timing.current()
+                if token is not None and timings is not None:
+                    headers = MutableHeaders(scope=message)
+                    headers.append(
+                        "Server-Timing", timings.server_timing(time.perf_counter())
+                    )
+            await send(message)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception:
             duration_ms = (time.perf_counter() - start) * 1000
+            _observe(scope, 500, duration_ms)
             logger.exception(
                 "Unhandled error",
                 extra={
@@ -28,14 +109,53 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
                 },
             )
             raise
+        finally:
+            if token is not None:
+                timing.reset(token)
 
         duration_ms = (time.perf_counter() - start) * 1000
-        logger.info(
-            "%s %s -> %s (%.2f ms) client=%s",
-            method,
-            path,
-            response.status_code,
-            duration_ms,
-            client,
-        )
-        return response
+        _observe(scope, status_code, duration_ms)
+        if self.sampler.should_log(status_code, duration_ms):
+            logger.info(
+                "%s %s -> %s (%.2f ms) client=%s",
+                method,
+                path,
+                status_code,
+                duration_ms,
+                client,
+                extra={
+                    "method": method,
+                    "path": path,
+                    "status": status_code,
+                    "client": client,
+                    "duration_ms": round(duration_ms, 2),
+                },
+            )
+
+
+def _route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route, e.g. ``/api/v1/prices/last``.
+
+    Routes of included routers only know their own path, so the router
+    prefix is recovered from the concrete request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return metrics.UNMATCHED_ROUTE
+    try:
+        concrete = template.format(**scope.get("path_params", {}))
+    except KeyError, IndexError, ValueError:
+        return template
+    path = scope["path"]
+    if concrete and path.endswith(concrete):
+        return path[: len(path) - len(concrete)] + template
+    return template
+
+
+def _observe(scope: Scope, status: int, duration_ms: float) -> None:
+    # Label by route template, not the raw path, to keep cardinality bounded.
+    metrics.HTTP_REQUEST_DURATION.labels(
+        scope["method"], _route_template(scope), str(status)
+    ).observe(duration_ms / 1000)
@@ -1,3 +1,6 @@
 from .price import Price
+from .price_ohlc import PriceOhlc
+from .tracked_ticker import TrackedTicker
 from .base import Base
 from .db_helper import db_helper
+from .price_version import PriceVersion
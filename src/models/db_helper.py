@@ -1,26 +1,166 @@
+import time
+from dataclasses import dataclass
 from typing import Any, AsyncGenerator
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     create_async_engine,
     async_sessionmaker,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config import settings
+from src.utils import timing
+from src.utils.metrics import (
+    DB_POOL_CAPACITY,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each connection checkout takes and how
+    many connections are in use, labelled by the engine's ``pool_logging_name``.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._engine_label = self.logging_name or "default"
+        DB_POOL_CAPACITY.labels(self._engine_label).inc(
+            self.size() + max(0, self._max_overflow)
+        )
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - started
+            DB_POOL_CHECKOUT_WAIT.labels(self._engine_label).observe(elapsed)
+            DB_POOL_CHECKED_OUT.labels(self._engine_label).set(self.checkedout())
+            if (timings := timing.current()) is not None:
+                timings.pool_s += elapsed
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        DB_POOL_CHECKED_OUT.labels(self._engine_label).set(self.checkedout())
+
+    def recreate(self):
+        # dispose() replaces the pool with a fresh one of the same capacity.
+        DB_POOL_CAPACITY.labels(self._engine_label).dec(
+            self.size() + max(0, self._max_overflow)
+        )
+        return super().recreate()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    if timing.current() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    started = conn.info.pop("query_started", None)
+    timings = timing.current()
+    if started is not None and timings is not None:
+        timings.db_s += time.perf_counter() - started
+        timings.db_queries += 1
+
+
+@dataclass(frozen=True, slots=True)
+class PoolConfig:
+    size: int = 5
+    max_overflow: int = 10
+    timeout_s: float = 30.0
+    recycle_s: int = 1800
+    pre_ping: bool = True
+    statement_cache_size: int = 100
+
+
+def _create_engine(url: str, name: str, echo: bool, pool: PoolConfig) -> AsyncEngine:
+    engine = create_async_engine(
+        url=url,
+        echo=echo,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        pool_size=pool.size,
+        max_overflow=pool.max_overflow,
+        pool_timeout=pool.timeout_s,
+        pool_recycle=pool.recycle_s,
+        pool_pre_ping=pool.pre_ping,
+        connect_args={
+            # SQLAlchemy's own cache of prepared statements, and asyncpg's.
+            "prepared_statement_cache_size": pool.statement_cache_size,
+            "statement_cache_size": pool.statement_cache_size,
+        },
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
 
 
 class DatabaseHelper:
-    def __init__(self, url: str, echo: bool = False):
-        self.engine = create_async_engine(url=url, echo=echo)
+    """
+    Writer engine on the primary and, when ``read_url`` is set, a separate
+    reader engine (and pool) on a replica, so API reads never wait behind
+    ingestion for a connection.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        echo: bool = False,
+        read_url: str | None = None,
+        pool: PoolConfig | None = None,
+    ):
+        pool = pool or PoolConfig()
+        self.engine = _create_engine(url, "writer", echo, pool)
+        self.read_engine = (
+            _create_engine(read_url, "reader", echo, pool) if read_url else self.engine
+        )
         self.session_factory = async_sessionmaker(
             bind=self.engine,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
         )
+        self.read_session_factory = async_sessionmaker(
+            bind=self.read_engine,
+            autoflush=False,
+            autocommit=False,
+            expire_on_commit=False,
+        )
+
+    @property
+    def engines(self) -> tuple[AsyncEngine, ...]:
+        if self.read_engine is self.engine:
+            return (self.engine,)
+        return self.engine, self.read_engine
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
 
     async def session_dependency(self) -> AsyncGenerator[Any, Any]:
         async with self.session_factory() as session:
             yield session
 
+    async def read_session_dependency(self) -> AsyncGenerator[Any, Any]:
+        async with self.read_session_factory() as session:
+            yield session
+
 
-db_helper = DatabaseHelper(url=settings.db_url, echo=settings.db_echo)
+db_helper = DatabaseHelper(
+    url=settings.db_url,
+    echo=settings.db_echo,
+    read_url=settings.db_read_url,
+    pool=PoolConfig(
+        size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        timeout_s=settings.db_pool_timeout_s,
+        recycle_s=settings.db_pool_recycle_s,
+        pre_ping=settings.db_pool_pre_ping,
+        statement_cache_size=settings.db_statement_cache_size,
+    ),
+)
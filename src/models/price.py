@@ -10,17 +10,31 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.models.base import Base
+from src.sources.base import DEFAULT_SOURCE
 
 
 class Price(Base):
+    # Partitioned by range on captured_ts_ms, so the partition key has to be
+    # part of every unique constraint, including the primary key.
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     ticker: Mapped[str] = mapped_column(String(32), nullable=False)
+    # Venue the price came from, or "composite" for the cross-source median.
+    source: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        default=DEFAULT_SOURCE,
+        server_default=DEFAULT_SOURCE,
+    )
     price: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
-    captured_ts_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    captured_ts_ms: Mapped[int] = mapped_column(BigInteger, primary_key=True)
 
     __table_args__ = (
         UniqueConstraint(
-            "ticker", "captured_ts_ms", name="uq_prices_ticker_captured_ts_ms"
+            "ticker",
+            "source",
+            "captured_ts_ms",
+            name="uq_prices_ticker_source_captured_ts_ms",
         ),
-        Index("ix_prices_ticker_captured_ts_ms", "ticker", "captured_ts_ms"),
         Index("ix_prices_captured_ts_ms", "captured_ts_ms"),
+        {"postgresql_partition_by": "RANGE (captured_ts_ms)"},
     )
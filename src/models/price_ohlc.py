@@ -0,0 +1,36 @@
+from decimal import Decimal
+
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    Numeric,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class PriceOhlc(Base):
+    __tablename__ = "price_ohlc"
+
+    ticker: Mapped[str] = mapped_column(String(32), nullable=False)
+    interval: Mapped[str] = mapped_column(String(8), nullable=False)
+    bucket_ts_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    open: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    high: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    low: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    close: Mapped[Decimal] = mapped_column(Numeric(20, 10), nullable=False)
+    open_ts_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    close_ts_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "ticker",
+            "interval",
+            "bucket_ts_ms",
+            name="uq_price_ohlc_ticker_interval_bucket_ts_ms",
+        ),
+    )
@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class PriceVersion(Base):
+    """
+    Per-ticker write counter, bumped in the same transaction as every change
+    to the ticker's served prices.
+    """
+
+    __tablename__ = "price_versions"
+
+    ticker: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    latest_ts_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    modified_ts_ms: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,13 @@
+from sqlalchemy import Boolean, String, true
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class TrackedTicker(Base):
+    __tablename__ = "tickers"
+
+    name: Mapped[str] = mapped_column(String(32), nullable=False, unique=True)
+    enabled: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default=true()
+    )
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.domain.enums import OhlcInterval
+from src.prices import crud
+
+DAY_MS = 24 * 60 * 60_000
+YEAR_MS = 365 * DAY_MS
+
+StatsKey = tuple[str, int | None, int | None, OhlcInterval | None]
+
+
+class WindowTooLarge(ValueError):
+    pass
+
+
+def resolve_window(
+    from_ts: int | None, to_ts: int | None, now_ms: int | None = None
+) -> tuple[int, int | None]:
+    """
+    Bounded ``(from_ts, to_ts)``: without ``from_ts`` the window is the last
+    ``stats_max_window_days``, and a longer explicit window is rejected.
+    """
+    max_window_ms = int(settings.stats_max_window_days * DAY_MS)
+    end_ms = to_ts if to_ts is not None else now_ms or int(time.time() * 1000)
+    if from_ts is None:
+        return end_ms - max_window_ms, to_ts
+    if end_ms - from_ts > max_window_ms:
+        raise WindowTooLarge(f"Window exceeds {settings.stats_max_window_days} days")
+    return from_ts, to_ts
+
+
+async def load_window(
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    ``(ts, price)`` arrays (int64, float64), oldest first.
+    """
+    ts_chunks: list[np.ndarray] = []
+    price_chunks: list[np.ndarray] = []
+    async for chunk in crud.stream_price_points(session, ticker, from_ts, to_ts):
+        ts_chunks.append(np.fromiter((p[0] for p in chunk), np.int64, len(chunk)))
+        price_chunks.append(np.fromiter((p[1] for p in chunk), np.float64, len(chunk)))
+    if not ts_chunks:
+        return np.empty(0, np.int64), np.empty(0, np.float64)
+    return np.concatenate(ts_chunks), np.concatenate(price_chunks)
+
+
+def resample_last(
+    ts: np.ndarray, price: np.ndarray, interval: OhlcInterval
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Last price of each ``interval`` bucket, keyed by the bucket start.
+    """
+    buckets = ts - ts % interval.ms
+    last = np.empty(len(buckets), dtype=bool)
+    last[:-1] = buckets[1:] != buckets[:-1]
+    last[-1:] = True
+    return buckets[last], price[last]
+
+
+def compute_stats(
+    ts: np.ndarray, price: np.ndarray, interval: OhlcInterval | None = None
+) -> dict | None:
+    """
+    Window statistics over ascending ``ts``; ``None`` for an empty window.
+
+    Returns are log returns between consecutive samples: raw ticks, or the
+    last price per ``interval`` bucket when given.
+    """
+    if len(ts) == 0:
+        return None
+
+    peak = np.maximum.accumulate(price)
+    dt = np.diff(ts)
+    duration = ts[-1] - ts[0]
+    stats = {
+        "count": len(ts),
+        "from_ts": int(ts[0]),
+        "to_ts": int(ts[-1]),
+        "first": float(price[0]),
+        "last": float(price[-1]),
+        "min": float(price.min()),
+        "max": float(price.max()),
+        "mean": float(price.mean()),
+        # Time-weighted: each price holds until the next one.
+        "twap": (
+            float(np.dot(price[:-1], dt) / duration) if duration else float(price[0])
+        ),
+        "return": float(price[-1] / price[0] - 1),
+        "max_drawdown": float((price / peak - 1).min()),
+        "samples": None,
+        "mean_return": None,
+        "volatility": None,
+        "annualized_volatility": None,
+    }
+
+    if interval is not None:
+        ts, price = resample_last(ts, price, interval)
+    stats["samples"] = len(ts)
+    if len(ts) < 3:
+        return stats
+
+    returns = np.diff(np.log(price))
+    volatility = float(returns.std(ddof=1))
+    period_ms = (
+        interval.ms if interval is not None else (ts[-1] - ts[0]) / (len(ts) - 1)
+    )
+    stats["mean_return"] = float(returns.mean())
+    stats["volatility"] = volatility
+    stats["annualized_volatility"] = volatility * float(np.sqrt(YEAR_MS / period_ms))
+    return stats
+
+
+class StatsCache:
+    """
+    LRU of computed window stats keyed on ``(ticker, from, to, interval)``.
+
+    Entries expire after ``ttl_s`` (or the ``ttl_s`` given to ``put``) so
+    windows that are still being written to (or backfilled) are eventually
+    recomputed.
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._entries: OrderedDict[StatsKey, tuple[dict | None, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: StatsKey) -> tuple[bool, dict | None]:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(
+        self, key: StatsKey, stats: dict | None, ttl_s: float | None = None
+    ) -> None:
+        ttl_s = self._ttl_s if ttl_s is None else min(ttl_s, self._ttl_s)
+        self._entries[key] = (stats, time.monotonic() + ttl_s)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+stats_cache = StatsCache(
+    maxsize=settings.stats_cache_size, ttl_s=settings.stats_cache_ttl_s
+)
+
+
+async def read_window_stats(
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    interval: OhlcInterval | None = None,
+) -> dict | None:
+    """
+    Stats of a window (see ``resolve_window``), ``None`` when it is empty.
+
+    Empty windows are not cached, and windows still open to new prices are
+    only cached until the next collection.
+    """
+    key = (ticker, from_ts, to_ts, interval)
+    found, stats = stats_cache.get(key)
+    if found:
+        return stats
+
+    now_ms = int(time.time() * 1000)
+    window_from, window_to = resolve_window(from_ts, to_ts, now_ms)
+    ts, price = await load_window(session, ticker, window_from, window_to)
+    stats = compute_stats(ts, price, interval)
+    if stats is not None:
+        open_ended = to_ts is None or to_ts > now_ms
+        stats_cache.put(key, stats, settings.collect_interval_s if open_ended else None)
+    return stats
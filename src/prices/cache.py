@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import time
+from typing import Awaitable, Callable, Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.domain.schemas.price import PriceFull, PriceRead
+from src.models import Price
+from src.prices import crud, redis_cache
+from src.prices.redis_cache import decode_points, encode_points
+
+
+class LastPriceCache:
+    """
+    Latest known price per ticker.
+
+    Entries are updated from committed inserts (see ``PriceListener``) and
+    expire after ``ttl_s`` as a safety net against missed notifications.
+    """
+
+    def __init__(self, ttl_s: float) -> None:
+        self._ttl_s = ttl_s
+        self._entries: dict[str, tuple[PriceFull, float]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, ticker: str) -> PriceFull | None:
+        entry = self._entries.get(ticker)
+        if entry is None:
+            return None
+        price, expires_at = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(ticker, None)
+            return None
+        return price
+
+    def get(self, ticker: str) -> PriceFull | None:
+        price = self._lookup(ticker)
+        if price is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return price
+
+    def get_at(self, ticker: str, ts: int) -> PriceFull | None:
+        """
+        Latest price at ``ts``, if it is known to be the cached one.
+        """
+        price = self._lookup(ticker)
+        if price is None or ts < price.captured_ts_ms:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return price
+
+    def update(self, prices: Iterable[PriceFull]) -> None:
+        expires_at = time.monotonic() + self._ttl_s
+        for price in prices:
+            current = self._entries.get(price.ticker)
+            if current is None or price.captured_ts_ms >= current[0].captured_ts_ms:
+                self._entries[price.ticker] = (price, expires_at)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+price_cache = LastPriceCache(ttl_s=settings.price_cache_ttl_s)
+
+
+async def _read_shared(
+    session: AsyncSession,
+    ticker: str,
+    name: str,
+    loader: Callable[[AsyncSession], Awaitable[list | None]],
+) -> list | None:
+    """
+    ``loader(session)`` through the Redis tier, when one is configured.
+
+    A shared load may serve other requests after this one has gone, so it
+    gets a session of its own instead of ``session``.
+    """
+    shared = redis_cache.redis_price_cache
+    if shared is None:
+        return await loader(session)
+    return await shared.get_or_load(
+        ticker, name, loader, encode_points, decode_points, session=session
+    )
+
+
+async def read_last_price(session: AsyncSession, ticker: str) -> PriceFull | None:
+    if settings.price_cache_enabled:
+        cached = price_cache.get(ticker)
+        if cached is not None:
+            return cached
+
+    async def _load(session: AsyncSession) -> list[Price] | None:
+        model = await crud.read_last_price(session, ticker)
+        return None if model is None else [model]
+
+    found = await _read_shared(session, ticker, "last", _load)
+    if found is None:
+        return None
+
+    price = PriceFull(
+        ticker=ticker, price=found[0].price, captured_ts_ms=found[0].captured_ts_ms
+    )
+    if settings.price_cache_enabled:
+        price_cache.update([price])
+    return price
+
+
+async def read_last_price_at_time(
+    session: AsyncSession,
+    ticker: str,
+    ts: int,
+) -> PriceRead | Price | None:
+    if settings.price_cache_enabled:
+        cached = price_cache.get_at(ticker, ts)
+        if cached is not None:
+            return cached
+
+    async def _load(session: AsyncSession) -> list[Price] | None:
+        model = await crud.read_last_price_at_time(session, ticker, ts)
+        return None if model is None else [model]
+
+    found = await _read_shared(session, ticker, f"at:{ts}", _load)
+    return None if found is None else found[0]
+
+
+async def read_prices_page(
+    session: AsyncSession,
+    ticker: str,
+    limit: int,
+    cursor: int | None = None,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+) -> list[PriceRead] | list[Price]:
+    async def _load(session: AsyncSession) -> list[Price]:
+        return await crud.read_prices_page(
+            session, ticker, limit, cursor=cursor, from_ts=from_ts, to_ts=to_ts
+        )
+
+    name = f"page:{limit}:{cursor}:{from_ts}:{to_ts}"
+    return await _read_shared(session, ticker, name, _load)
@@ -1,49 +1,226 @@
-from sqlalchemy import select
+from typing import AsyncIterator
+
+from sqlalchemy import (
+    BigInteger,
+    Float,
+    Select,
+    String,
+    bindparam,
+    cast,
+    column,
+    func,
+    select,
+    true,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.domain.enums import Ticker
+from src.config import settings
 from src.domain.schemas.price import PriceFull
 from src.models import Price
+from src.prices.ohlc import upsert_ohlc
+from src.prices.notifications import PRICES_CHANNEL, encode_prices, latest_per_ticker
+from src.prices import redis_cache, versions
+from src.sources import DEFAULT_SOURCE
+from src.utils import metrics
 
 
 async def create_price(session: AsyncSession, price_in: PriceFull) -> Price:
     price = Price(**price_in.model_dump())
     session.add(price)
+    await session.flush()
+    if price.source == settings.primary_price_source:
+        await versions.bump_versions(session, [price])
     await session.commit()
     await session.refresh(price)
     return price
 
 
+# What the OHLC rollup, NOTIFY and metrics need to know about inserted rows.
+_INSERTED_COLUMNS = (
+    Price.__table__.c.ticker,
+    Price.__table__.c.price,
+    Price.__table__.c.captured_ts_ms,
+)
+
+
+_CONFLICT_COLUMNS = ["ticker", "source", "captured_ts_ms"]
+
+
 async def create_prices(
-    session: AsyncSession, prices_in: list[PriceFull]
-) -> list[Price]:
-    values = [p.model_dump() for p in prices_in]
-    stmt = (
-        insert(Price)
-        .values(values)
-        .on_conflict_do_nothing(index_elements=["ticker", "captured_ts_ms"])
-        .returning(Price)
-    )
-    result = await session.scalars(stmt)
-    models = list(result)
+    session: AsyncSession,
+    prices_in: list[PriceFull],
+    returning: bool = True,
+    source: str = DEFAULT_SOURCE,
+) -> list[Price] | int:
+    """
+    Insert prices from ``source``, skipping already stored ones, and commit.
+
+    Returns the inserted models, or with ``returning=False`` just their
+    count: rows then come back as plain tuples instead of ORM objects, and
+    the insert is one cached executemany statement rather than a multi-row
+    VALUES compiled for every batch size.
+
+    Only prices of ``settings.primary_price_source`` are rolled up, announced,
+    versioned and invalidated in the caches, since no other source is ever
+    read back.
+    """
+    values = [{**p.model_dump(), "source": source} for p in prices_in]
+    if not values:
+        return [] if returning else 0
+
+    if returning:
+        stmt = (
+            insert(Price)
+            .values(values)
+            .on_conflict_do_nothing(index_elements=_CONFLICT_COLUMNS)
+            .returning(Price)
+        )
+        models = list(await session.scalars(stmt))
+    else:
+        stmt = (
+            insert(Price.__table__)
+            .on_conflict_do_nothing(index_elements=_CONFLICT_COLUMNS)
+            .returning(*_INSERTED_COLUMNS)
+        )
+        models = list((await session.execute(stmt, values)).all())
+
+    served = bool(models) and source == settings.primary_price_source
+    if served:
+        await upsert_ohlc(session, models)
+        await versions.bump_versions(session, models)
+        await _notify_prices(session, models)
     await session.commit()
-    return models
+    if served and redis_cache.redis_price_cache is not None:
+        await redis_cache.redis_price_cache.invalidate(m.ticker for m in models)
+    metrics.observe_stored_prices(len(values), models)
+    return models if returning else len(models)
 
 
-async def read_all_prices(session: AsyncSession, ticker: Ticker) -> list[Price]:
-    stmt = (
-        select(Price)
-        .where(Price.ticker == ticker.value)
-        .order_by(Price.captured_ts_ms.desc())
+async def _notify_prices(session: AsyncSession, models: list[Price]) -> None:
+    """
+    Announce the newest inserted price per ticker; delivered on commit.
+    """
+    latest = latest_per_ticker(
+        PriceFull(ticker=m.ticker, price=m.price, captured_ts_ms=m.captured_ts_ms)
+        for m in models
     )
+    # One round trip, however many payloads the batch needs.
+    notifications = [
+        func.pg_notify(PRICES_CHANNEL, payload) for payload in encode_prices(latest)
+    ]
+    await session.execute(select(*notifications))
+
+
+# Price is cast in SQL so rows arrive as floats instead of Decimals.
+PRICE_POINT_COLUMNS = (Price.captured_ts_ms, cast(Price.price, Float).label("price"))
+
+
+def _served():
+    return Price.source == settings.primary_price_source
+
+
+def _select_prices(
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    columns: tuple = (Price,),
+    newest_first: bool = True,
+) -> Select:
+    stmt = select(*columns).where(Price.ticker == ticker, _served())
+    if from_ts is not None:
+        stmt = stmt.where(Price.captured_ts_ms >= from_ts)
+    if to_ts is not None:
+        stmt = stmt.where(Price.captured_ts_ms <= to_ts)
+    if newest_first:
+        return stmt.order_by(Price.captured_ts_ms.desc())
+    return stmt.order_by(Price.captured_ts_ms)
+
+
+async def read_all_prices(
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+) -> list[Price]:
+    stmt = _select_prices(ticker, from_ts, to_ts)
     return list(await session.scalars(stmt))
 
 
-async def read_last_price(session: AsyncSession, ticker: Ticker) -> Price | None:
+async def read_price_points(
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+) -> list[tuple[int, float]]:
+    """
+    ``(captured_ts_ms, price)`` tuples, newest first, without ORM objects.
+    """
+    stmt = _select_prices(ticker, from_ts, to_ts, columns=PRICE_POINT_COLUMNS)
+    result = await session.execute(stmt)
+    return list(result.all())
+
+
+async def read_prices_page(
+    session: AsyncSession,
+    ticker: str,
+    limit: int,
+    cursor: int | None = None,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+) -> list[Price]:
+    """
+    Keyset page over (ticker, captured_ts_ms), newest first.
+
+    ``cursor`` is the ``captured_ts_ms`` of the last row of the previous page.
+    """
+    stmt = _select_prices(ticker, from_ts, to_ts)
+    if cursor is not None:
+        stmt = stmt.where(Price.captured_ts_ms < cursor)
+    return list(await session.scalars(stmt.limit(limit)))
+
+
+async def stream_prices(
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    chunk_size: int = 1000,
+) -> AsyncIterator[list[Price]]:
+    """
+    Yield prices in chunks from a server-side cursor, newest first.
+    """
+    stmt = _select_prices(ticker, from_ts, to_ts).execution_options(
+        yield_per=chunk_size
+    )
+    result = await session.stream_scalars(stmt)
+    async for chunk in result.partitions():
+        yield chunk
+
+
+async def stream_price_points(
+    session: AsyncSession,
+    ticker: str,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    chunk_size: int = 50_000,
+) -> AsyncIterator[list[tuple[int, float]]]:
+    """
+    ``(captured_ts_ms, price)`` chunks from a server-side cursor, oldest first.
+    """
+    stmt = _select_prices(
+        ticker, from_ts, to_ts, columns=PRICE_POINT_COLUMNS, newest_first=False
+    ).execution_options(yield_per=chunk_size)
+    result = await session.stream(stmt)
+    async for chunk in result.partitions():
+        yield chunk
+
+
+async def read_last_price(session: AsyncSession, ticker: str) -> Price | None:
     stmt = (
         select(Price)
-        .where(Price.ticker == ticker.value)
+        .where(Price.ticker == ticker, _served())
         .order_by(Price.captured_ts_ms.desc())
         .limit(1)
     )
@@ -52,14 +229,58 @@ async def read_last_price(session: AsyncSession, ticker: Ticker) -> Price | None
 
 async def read_last_price_at_time(
     session: AsyncSession,
-    ticker: Ticker,
+    ticker: str,
     ts: int,
 ) -> Price | None:
     stmt = (
         select(Price)
-        .where(Price.ticker == ticker.value)
+        .where(Price.ticker == ticker, _served())
         .where(Price.captured_ts_ms <= ts)
         .order_by(Price.captured_ts_ms.desc())
         .limit(1)
     )
     return await session.scalar(stmt)
+
+
+async def read_last_prices_at_times(
+    session: AsyncSession,
+    tickers: list[str],
+    timestamps: list[int],
+) -> list[tuple[float, int] | None]:
+    """
+    ``read_last_price_at_time`` for each ``(tickers[i], timestamps[i])`` in
+    one query; results are in input order, ``None`` where nothing matched.
+    """
+    pairs = list(dict.fromkeys(zip(tickers, timestamps)))
+    queries = (
+        func.unnest(
+            bindparam("tickers", [p[0] for p in pairs], type_=ARRAY(String)),
+            bindparam("timestamps", [p[1] for p in pairs], type_=ARRAY(BigInteger)),
+        )
+        .table_valued(
+            column("ticker", String),
+            column("ts", BigInteger),
+            with_ordinality="ord",
+        )
+        .render_derived()
+    )
+    # One backward index probe per distinct pair.
+    match = (
+        select(*PRICE_POINT_COLUMNS)
+        .where(Price.ticker == queries.c.ticker, _served())
+        .where(Price.captured_ts_ms <= queries.c.ts)
+        .order_by(Price.captured_ts_ms.desc())
+        .limit(1)
+        .lateral()
+    )
+    stmt = (
+        select(match.c.price, match.c.captured_ts_ms)
+        .select_from(queries.outerjoin(match, true()))
+        .order_by(queries.c.ord)
+    )
+    result = await session.execute(stmt)
+    found = {
+        pair: None if captured_ts_ms is None else (price, captured_ts_ms)
+        for pair, (price, captured_ts_ms) in zip(pairs, result.all())
+    }
+    return [found[pair] for pair in zip(tickers, timestamps)]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+from pathlib import Path
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.enums import ExportFormat
+from src.models import db_helper
+from src.prices import crud
+from src.utils import logger
+from src.utils.timestamps import parse_ts
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: poetry install --extras export
+    pa = pq = None
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ARROW: "application/vnd.apache.arrow.file",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+class ExportUnavailable(RuntimeError):
+    pass
+
+
+def price_schema() -> "pa.Schema":
+    if pa is None:
+        raise ExportUnavailable("pyarrow is not installed")
+    return pa.schema(
+        [
+            pa.field("captured_ts_ms", pa.int64(), nullable=False),
+            pa.field("price", pa.float64(), nullable=False),
+        ]
+    )
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    Write-only file that buffers what the writer produced since the last drain.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _open_writer(sink, format: ExportFormat, schema: "pa.Schema"):
+    if format == ExportFormat.PARQUET:
+        return pq.ParquetWriter(sink, schema, compression="zstd")
+    # The IPC file format (not the stream one) so the result can be
+    # memory-mapped and read with random access.
+    return pa.ipc.new_file(sink, schema)
+
+
+def _to_batch(points: list[tuple[int, float]], schema: "pa.Schema"):
+    return pa.record_batch(
+        [
+            pa.array([p[0] for p in points], type=pa.int64()),
+            pa.array([p[1] for p in points], type=pa.float64()),
+        ],
+        schema=schema,
+    )
+
+
+async def export_prices(
+    session: AsyncSession,
+    ticker: str,
+    format: ExportFormat,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """
+    Encoded export, oldest first, one record batch (Parquet row group) per
+    cursor chunk, so memory is bounded by ``chunk_size``.
+    """
+    schema = price_schema()
+    sink = _ChunkSink()
+    writer = _open_writer(sink, format, schema)
+    chunks = crud.stream_price_points(session, ticker, from_ts, to_ts, chunk_size)
+    async for points in chunks:
+        writer.write_batch(_to_batch(points, schema))
+        data = sink.drain()
+        if data:
+            yield data
+    writer.close()
+    yield sink.drain()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export price history as Arrow IPC or Parquet."
+    )
+    parser.add_argument("--ticker", type=str, required=True)
+    parser.add_argument(
+        "--from",
+        dest="from_ts",
+        type=parse_ts,
+        default=None,
+        help="Range start, unix ms or ISO 8601 (UTC if no offset).",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_ts",
+        type=parse_ts,
+        default=None,
+        help="Range end, unix ms or ISO 8601.",
+    )
+    parser.add_argument(
+        "--format",
+        type=ExportFormat,
+        choices=list(ExportFormat),
+        default=ExportFormat.PARQUET,
+    )
+    parser.add_argument("--out", type=Path, required=True)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        async with db_helper.read_session_factory() as session:
+            with args.out.open("wb") as out:
+                async for data in export_prices(
+                    session,
+                    args.ticker,
+                    args.format,
+                    args.from_ts,
+                    args.to_ts,
+                    chunk_size=args.chunk_size,
+                ):
+                    out.write(data)
+    finally:
+        await db_helper.dispose()
+    logger.info("Exported %s to %s", args.ticker, args.out)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(_parse_args()))
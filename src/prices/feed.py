@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Iterable
+
+from src.config import settings
+from src.domain.schemas.price import PriceFull
+from src.utils import metrics
+
+
+class FeedFull(Exception):
+    """Subscriber limit reached."""
+
+
+class Subscription:
+    """
+    One client's view of the feed: a bounded buffer of encoded prices.
+
+    When the client falls behind, the oldest buffered messages are dropped,
+    so a slow consumer never holds up the others or grows without bound.
+    """
+
+    def __init__(
+        self, feed: PriceFeed, tickers: Iterable[str] | None, buffer_size: int
+    ) -> None:
+        self._feed = feed
+        self._tickers = frozenset(tickers) if tickers else None
+        self._messages: deque[str] = deque(maxlen=buffer_size)
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._feed.unsubscribe(self)
+
+    def push(self, ticker: str, message: str) -> None:
+        if self._tickers is not None and ticker not in self._tickers:
+            return
+        if len(self._messages) == self._messages.maxlen:
+            self.dropped += 1
+            metrics.PRICE_FEED_DROPPED.inc()
+        self._messages.append(message)
+        self._ready.set()
+
+    async def get(self, timeout: float | None = None) -> list[str]:
+        """
+        Every buffered message, waiting up to ``timeout`` for one to arrive.
+        """
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        messages = list(self._messages)
+        self._messages.clear()
+        return messages
+
+
+class PriceFeed:
+    """
+    Fans newly stored prices out to live subscribers.
+
+    Fed by ``PriceListener``, so all subscribers share one Postgres
+    notification per insert, and each price is encoded once for all of them.
+    """
+
+    def __init__(self, buffer_size: int, max_subscribers: int) -> None:
+        self._buffer_size = buffer_size
+        self._max_subscribers = max_subscribers
+        self._subscriptions: set[Subscription] = set()
+
+    def subscribe(self, tickers: Iterable[str] | None = None) -> Subscription:
+        if len(self._subscriptions) >= self._max_subscribers:
+            raise FeedFull(f"{self._max_subscribers} subscribers already connected")
+        subscription = Subscription(self, tickers, self._buffer_size)
+        self._subscriptions.add(subscription)
+        metrics.PRICE_FEED_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            metrics.PRICE_FEED_SUBSCRIBERS.dec()
+
+    def publish(self, prices: list[PriceFull]) -> None:
+        for price in prices:
+            message = price.model_dump_json()
+            for subscription in self._subscriptions:
+                subscription.push(price.ticker, message)
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+
+price_feed = PriceFeed(
+    buffer_size=settings.price_feed_buffer_size,
+    max_subscribers=settings.price_feed_max_subscribers,
+)
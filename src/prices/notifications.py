@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Callable, Iterable
+
+import asyncpg
+
+from src.domain.schemas.price import PriceFull
+from src.utils import logger
+
+PRICES_CHANNEL = "prices_inserted"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7999
+
+PricesHandler = Callable[[list[PriceFull]], None]
+ResetHandler = Callable[[], None]
+
+
+def latest_per_ticker(prices: Iterable[PriceFull]) -> list[PriceFull]:
+    latest: dict[str, PriceFull] = {}
+    for price in prices:
+        current = latest.get(price.ticker)
+        if current is None or price.captured_ts_ms > current.captured_ts_ms:
+            latest[price.ticker] = price
+    return list(latest.values())
+
+
+def encode_prices(
+    prices: Iterable[PriceFull], max_bytes: int = MAX_PAYLOAD_BYTES
+) -> list[str]:
+    """
+    JSON payloads of at most ``max_bytes`` each, together holding ``prices``.
+    """
+    payloads = []
+    items: list[str] = []
+    size = 2
+    for p in prices:
+        item = json.dumps([p.ticker, p.price, p.captured_ts_ms], separators=(",", ":"))
+        item_size = len(item.encode())
+        if items and size + 1 + item_size > max_bytes:
+            payloads.append(f"[{','.join(items)}]")
+            items, size = [], 2
+        size += item_size + (1 if items else 0)
+        items.append(item)
+    if items:
+        payloads.append(f"[{','.join(items)}]")
+    return payloads
+
+
+def decode_prices(payload: str) -> list[PriceFull]:
+    return [
+        PriceFull(ticker=ticker, price=price, captured_ts_ms=captured_ts_ms)
+        for ticker, price, captured_ts_ms in json.loads(payload)
+    ]
+
+
+class PriceListener:
+    """
+    Postgres LISTEN on ``prices_inserted``, fanned out to in-process handlers.
+
+    ``create_prices`` sends one NOTIFY per committed batch, split into several
+    when it would not fit in one payload. When the connection drops,
+    notifications may have been missed, so reset handlers are called before
+    reconnecting.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = PRICES_CHANNEL,
+        reconnect_delay_s: float = 1.0,
+    ) -> None:
+        self._dsn = dsn
+        self._channel = channel
+        self._reconnect_delay_s = reconnect_delay_s
+        self._handlers: list[PricesHandler] = []
+        self._reset_handlers: list[ResetHandler] = []
+        self.listening = asyncio.Event()
+
+    def add_handler(self, handler: PricesHandler) -> None:
+        self._handlers.append(handler)
+
+    def add_reset_handler(self, handler: ResetHandler) -> None:
+        self._reset_handlers.append(handler)
+
+    def _on_notification(self, connection, pid, channel, payload: str) -> None:
+        try:
+            prices = decode_prices(payload)
+        except (ValueError, TypeError) as e:
+            logger.warning("Skipping malformed %s notification: %r", channel, e)
+            return
+        for handler in self._handlers:
+            handler(prices)
+
+    def _reset(self) -> None:
+        for handler in self._reset_handlers:
+            handler()
+
+    async def run(self) -> None:
+        """
+        Listen until cancelled, reconnecting on connection loss.
+        """
+        while True:
+            terminated = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(self._dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Price listener failed to connect: %r", e)
+                await asyncio.sleep(self._reconnect_delay_s)
+                continue
+
+            try:
+                connection.add_termination_listener(lambda _: terminated.set())
+                await connection.add_listener(self._channel, self._on_notification)
+                # Anything committed before LISTEN took effect was not seen.
+                self._reset()
+                self.listening.set()
+                await terminated.wait()
+                logger.warning("Price listener connection lost, reconnecting")
+            finally:
+                self.listening.clear()
+                self._reset()
+                if not connection.is_closed():
+                    await connection.close()
+
+            await asyncio.sleep(self._reconnect_delay_s)
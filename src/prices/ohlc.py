@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Iterable
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.enums import OhlcInterval
+from src.models import Price, PriceOhlc
+
+
+def aggregate_ohlc(
+    prices: Iterable[Price], intervals: Iterable[OhlcInterval] = tuple(OhlcInterval)
+) -> list[dict]:
+    """
+    Fold prices into one OHLC row per (ticker, interval, bucket).
+    """
+    buckets: dict[tuple[str, str, int], dict] = {}
+    intervals = tuple(intervals)
+    for p in prices:
+        price = Decimal(p.price)
+        for interval in intervals:
+            bucket_ts_ms = p.captured_ts_ms - p.captured_ts_ms % interval.ms
+            key = (p.ticker, interval.value, bucket_ts_ms)
+            row = buckets.get(key)
+            if row is None:
+                buckets[key] = {
+                    "ticker": p.ticker,
+                    "interval": interval.value,
+                    "bucket_ts_ms": bucket_ts_ms,
+                    "open": price,
+                    "high": price,
+                    "low": price,
+                    "close": price,
+                    "open_ts_ms": p.captured_ts_ms,
+                    "close_ts_ms": p.captured_ts_ms,
+                    "count": 1,
+                }
+                continue
+            row["high"] = max(row["high"], price)
+            row["low"] = min(row["low"], price)
+            if p.captured_ts_ms < row["open_ts_ms"]:
+                row["open"], row["open_ts_ms"] = price, p.captured_ts_ms
+            if p.captured_ts_ms > row["close_ts_ms"]:
+                row["close"], row["close_ts_ms"] = price, p.captured_ts_ms
+            row["count"] += 1
+    # Stable lock order keeps concurrent writers from deadlocking.
+    return [buckets[key] for key in sorted(buckets)]
+
+
+async def upsert_ohlc(session: AsyncSession, prices: list[Price]) -> None:
+    """
+    Merge newly inserted prices into the rollups; caller commits.
+    """
+    rows = aggregate_ohlc(prices)
+    if not rows:
+        return
+
+    stmt = insert(PriceOhlc).values(rows)
+    current = PriceOhlc.__table__.c
+    excluded = stmt.excluded
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ticker", "interval", "bucket_ts_ms"],
+        set_={
+            "high": func.greatest(current.high, excluded.high),
+            "low": func.least(current.low, excluded.low),
+            "open": case(
+                (excluded.open_ts_ms < current.open_ts_ms, excluded.open),
+                else_=current.open,
+            ),
+            "open_ts_ms": func.least(current.open_ts_ms, excluded.open_ts_ms),
+            "close": case(
+                (excluded.close_ts_ms > current.close_ts_ms, excluded.close),
+                else_=current.close,
+            ),
+            "close_ts_ms": func.greatest(current.close_ts_ms, excluded.close_ts_ms),
+            "count": current.count + excluded.count,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def read_ohlc(
+    session: AsyncSession,
+    ticker: str,
+    interval: OhlcInterval,
+    from_ts: int | None = None,
+    to_ts: int | None = None,
+) -> list[PriceOhlc]:
+    stmt = (
+        select(PriceOhlc)
+        .where(PriceOhlc.ticker == ticker)
+        .where(PriceOhlc.interval == interval.value)
+    )
+    if from_ts is not None:
+        stmt = stmt.where(PriceOhlc.bucket_ts_ms >= from_ts - from_ts % interval.ms)
+    if to_ts is not None:
+        stmt = stmt.where(PriceOhlc.bucket_ts_ms <= to_ts)
+    stmt = stmt.order_by(PriceOhlc.bucket_ts_ms)
+    return list(await session.scalars(stmt))
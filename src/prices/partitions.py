@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import re
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.prices import versions
+from src.utils import logger
+
+PARENT_TABLE = "prices"
+DEFAULT_PARTITION = "prices_default"
+PARTITION_NAME_RE = re.compile(r"^prices_y(\d{4})m(\d{2})$")
+
+
+def _month_start_ms(year: int, month: int) -> int:
+    return int(datetime(year, month, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _add_months(year: int, month: int, months: int) -> tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def partition_name(year: int, month: int) -> str:
+    return f"{PARENT_TABLE}_y{year:04d}m{month:02d}"
+
+
+def partition_bounds(year: int, month: int) -> tuple[int, int]:
+    """
+    ``[from, to)`` bounds of a monthly partition in unix ms.
+    """
+    next_year, next_month = _add_months(year, month, 1)
+    return _month_start_ms(year, month), _month_start_ms(next_year, next_month)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+async def list_partitions(session: AsyncSession) -> list[str]:
+    result = await session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent ORDER BY child.relname"
+        ),
+        {"parent": PARENT_TABLE},
+    )
+    return list(result.scalars())
+
+
+async def _default_months(session: AsyncSession) -> set[tuple[int, int]]:
+    """
+    ``(year, month)`` of every row that landed in the default partition.
+    """
+    result = await session.execute(
+        text(
+            "SELECT DISTINCT "
+            "extract(year FROM m)::int, extract(month FROM m)::int FROM ("
+            "SELECT date_trunc('month', "
+            "to_timestamp(captured_ts_ms / 1000.0) AT TIME ZONE 'UTC') AS m "
+            f"FROM {DEFAULT_PARTITION}) AS months"
+        )
+    )
+    return {(year, month) for year, month in result.all()}
+
+
+async def _create_partition(
+    session: AsyncSession, year: int, month: int, move_rows: bool
+) -> str:
+    name = partition_name(year, month)
+    lower, upper = partition_bounds(year, month)
+    if not move_rows:
+        await session.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF {PARENT_TABLE} "
+                f"FOR VALUES FROM ({lower}) TO ({upper})"
+            )
+        )
+        return name
+
+    # A partition cannot be created over rows the default partition already
+    # holds in its range: build it as a plain table, move the rows over and
+    # attach it. Writes to the default partition wait until commit.
+    await session.execute(
+        text(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE")
+    )
+    await session.execute(
+        text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS)")
+    )
+    await session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE captured_ts_ms >= :lower AND captured_ts_ms < :upper "
+            f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": lower, "upper": upper},
+    )
+    await session.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ({lower}) TO ({upper})"
+        )
+    )
+    return name
+
+
+async def ensure_partitions(
+    session: AsyncSession,
+    months_ahead: int,
+    now_ms: int | None = None,
+) -> list[str]:
+    """
+    Create monthly partitions from the current month ``months_ahead`` forward,
+    and for every month with rows in the default partition, moving those rows
+    into it, so the default partition stays empty.
+    """
+    now = datetime.fromtimestamp((now_ms or _now_ms()) / 1000, tz=timezone.utc)
+    existing = set(await list_partitions(session))
+    stray = await _default_months(session)
+    months = stray | {
+        _add_months(now.year, now.month, offset) for offset in range(months_ahead + 1)
+    }
+    created = []
+
+    for year, month in sorted(months):
+        if partition_name(year, month) in existing:
+            continue
+        created.append(
+            await _create_partition(session, year, month, (year, month) in stray)
+        )
+
+    await session.commit()
+    if created:
+        logger.info("Created price partitions: %s", ", ".join(created))
+    return created
+
+
+async def apply_retention(
+    session: AsyncSession,
+    retention_days: int,
+    drop: bool = False,
+    now_ms: int | None = None,
+) -> list[str]:
+    """
+    Detach (or drop) monthly partitions that end before the retention cutoff.
+
+    The default partition is left alone: ``ensure_partitions`` keeps it empty,
+    so old rows are only ever removed a whole partition at a time. Removing
+    any bumps every ticker's version, so cached responses are revalidated.
+    """
+    cutoff_ms = (now_ms or _now_ms()) - retention_days * 24 * 60 * 60 * 1000
+    removed = []
+
+    for name in await list_partitions(session):
+        match = PARTITION_NAME_RE.match(name)
+        if match is None:
+            continue
+        _, upper = partition_bounds(int(match.group(1)), int(match.group(2)))
+        if upper > cutoff_ms:
+            continue
+        await session.execute(
+            text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+        )
+        if drop:
+            await session.execute(text(f"DROP TABLE {name}"))
+        removed.append(name)
+
+    if removed:
+        await versions.bump_all_versions(session)
+    await session.commit()
+    if removed:
+        logger.info(
+            "%s price partitions: %s",
+            "Dropped" if drop else "Detached",
+            ", ".join(removed),
+        )
+    return removed
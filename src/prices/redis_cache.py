@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+import time
+from typing import Awaitable, Callable, Iterable, Sequence, TypeVar
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.domain.schemas.price import PriceRead
+from src.models import db_helper
+from src.utils import logger
+
+T = TypeVar("T")
+
+INVALIDATION_CHANNEL = "prices:invalidate"
+
+# (captured_ts_ms, price): 16 bytes per point instead of a JSON object.
+_POINT = struct.Struct("<qd")
+
+
+def encode_points(points: Sequence[PriceRead] | None) -> bytes:
+    """
+    Packed points; ``None`` (nothing found) is stored as a single zero byte.
+    """
+    if points is None:
+        return b"\0"
+    return b"".join(_POINT.pack(p.captured_ts_ms, float(p.price)) for p in points)
+
+
+def decode_points(raw: bytes) -> list[PriceRead] | None:
+    if raw == b"\0":
+        return None
+    return [
+        PriceRead(captured_ts_ms=ts, price=price)
+        for ts, price in _POINT.iter_unpack(raw)
+    ]
+
+
+class RedisPriceCache:
+    """
+    Read-through cache shared by all API replicas.
+
+    Keys embed a per-ticker generation that ``invalidate`` bumps after every
+    committed insert, so stale entries simply stop being read and expire after
+    ``ttl_s``. A miss is loaded once: concurrent callers in this process share
+    one load, and other replicas wait on a short Redis lock for its result.
+
+    Loads outlive the request that started them, so they run on a session of
+    their own from ``session_factory``. That is the primary by default: the
+    generation is bumped after the primary commits, and a lagging replica
+    could otherwise store old rows under the new generation.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl_s: float,
+        lock_ttl_s: float = 5.0,
+        poll_interval_s: float = 0.02,
+        prefix: str = "prices",
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ) -> None:
+        self._redis = redis
+        self._session_factory = session_factory or db_helper.session_factory
+        self._ttl_ms = max(1, int(ttl_s * 1000))
+        self._lock_ttl_s = lock_ttl_s
+        self._poll_interval_s = poll_interval_s
+        self._prefix = prefix
+        self._inflight: dict[str, asyncio.Task[bytes]] = {}
+        # Generations pushed by ``listen``; trusted only while subscribed.
+        self._generations: dict[str, int] = {}
+        self._subscriptions = 0
+        self.listening = asyncio.Event()
+        self.hits = 0
+        self.misses = 0
+
+    def _generation_key(self, ticker: str) -> str:
+        return f"{self._prefix}:gen:{ticker}"
+
+    def _remember(self, generations: dict[str, int]) -> None:
+        # Messages from several writers may arrive out of order.
+        for ticker, generation in generations.items():
+            if generation > self._generations.get(ticker, -1):
+                self._generations[ticker] = generation
+
+    async def _generation(self, ticker: str) -> int:
+        listening = self.listening.is_set()
+        if listening and ticker in self._generations:
+            return self._generations[ticker]
+        subscription = self._subscriptions
+        generation = int(await self._redis.get(self._generation_key(ticker)) or 0)
+        # Later bumps arrive as messages, unless the subscription was renewed
+        # (and possibly missed some) in the meantime.
+        if listening and subscription == self._subscriptions:
+            self._remember({ticker: generation})
+        return generation
+
+    async def get_or_load(
+        self,
+        ticker: str,
+        name: str,
+        loader: Callable[[AsyncSession], Awaitable[T]],
+        encode: Callable[[T], bytes],
+        decode: Callable[[bytes], T],
+        session: AsyncSession | None = None,
+    ) -> T:
+        """
+        Cached ``loader(session)`` result for ``name`` (unique per ticker).
+
+        When Redis is unavailable nothing is shared, so the loader runs on the
+        caller's ``session`` if given.
+        """
+        try:
+            generation = await self._generation(ticker)
+            key = f"{self._prefix}:{ticker}:{generation}:{name}"
+            raw = await self._redis.get(key)
+        except RedisError as e:
+            logger.warning("Redis cache unavailable: %r", e)
+            if session is not None:
+                return await loader(session)
+            return await self._run(loader)
+
+        if raw is not None:
+            self.hits += 1
+            return decode(raw)
+
+        self.misses += 1
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, loader, encode))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return decode(await asyncio.shield(task))
+
+    async def _run(self, loader: Callable[[AsyncSession], Awaitable[T]]) -> T:
+        async with self._session_factory() as session:
+            return await loader(session)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[AsyncSession], Awaitable[T]],
+        encode: Callable[[T], bytes],
+    ) -> bytes:
+        lock_key = f"{key}:lock"
+        token = os.urandom(8).hex().encode()
+        try:
+            locked = await self._redis.set(
+                lock_key, token, nx=True, px=int(self._lock_ttl_s * 1000)
+            )
+            if not locked:
+                # Another replica is loading this key; use its result.
+                raw = await self._wait_for(key)
+                if raw is not None:
+                    return raw
+        except RedisError as e:
+            logger.warning("Redis cache unavailable: %r", e)
+            locked = False
+
+        try:
+            raw = encode(await self._run(loader))
+            if locked:
+                await self._redis.set(key, raw, px=self._ttl_ms)
+            return raw
+        except RedisError as e:
+            logger.warning("Redis cache unavailable: %r", e)
+            return raw
+        finally:
+            if locked:
+                await self._release(lock_key, token)
+
+    async def _wait_for(self, key: str) -> bytes | None:
+        deadline = time.monotonic() + self._lock_ttl_s
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self._poll_interval_s)
+            raw = await self._redis.get(key)
+            if raw is not None:
+                return raw
+        return None
+
+    async def _release(self, lock_key: str, token: bytes) -> None:
+        try:
+            if await self._redis.get(lock_key) == token:
+                await self._redis.delete(lock_key)
+        except RedisError as e:
+            logger.warning("Failed to release Redis cache lock: %r", e)
+
+    async def invalidate(self, tickers: Iterable[str]) -> None:
+        """
+        Retire every cached entry of ``tickers`` and tell the other replicas.
+        """
+        tickers = sorted(set(tickers))
+        if not tickers:
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for ticker in tickers:
+                    pipe.incr(self._generation_key(ticker))
+                generations = await pipe.execute()
+            await self._redis.publish(
+                INVALIDATION_CHANNEL, json.dumps(dict(zip(tickers, generations)))
+            )
+        except RedisError as e:
+            # Entries still expire after ttl_s.
+            logger.warning("Failed to invalidate Redis cache: %r", e)
+
+    async def listen(self, reconnect_delay_s: float = 1.0) -> None:
+        """
+        Track generations from invalidation messages until cancelled, so
+        reads skip the generation lookup.
+        """
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Anything published before the subscription was missed.
+                    self._subscriptions += 1
+                    self._generations.clear()
+                    self.listening.set()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._remember(json.loads(message["data"]))
+            except RedisError as e:
+                logger.warning("Redis invalidation listener failed: %r", e)
+            finally:
+                self._subscriptions += 1
+                self.listening.clear()
+                self._generations.clear()
+            await asyncio.sleep(reconnect_delay_s)
+
+    def stats(self) -> dict[str, int | float]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+redis_price_cache = (
+    RedisPriceCache(
+        Redis.from_url(settings.redis_cache_url),
+        ttl_s=settings.collect_interval_s,
+        lock_ttl_s=settings.redis_cache_lock_ttl_s,
+    )
+    if settings.redis_cache_url
+    else None
+)
@@ -0,0 +1,21 @@
+from typing import Sequence
+
+import orjson
+
+from src.domain.enums import PriceLayout
+
+
+def encode_price_points(
+    points: Sequence[tuple[int, float]], layout: PriceLayout = PriceLayout.ROWS
+) -> bytes:
+    """
+    JSON for ``(captured_ts_ms, price)`` tuples, skipping pydantic validation.
+
+    ``rows`` matches ``list[PriceRead]``; ``columnar`` is ``{"ts": [...],
+    "price": [...]}``, which is smaller and cheaper to build and parse.
+    """
+    if layout == PriceLayout.COLUMNAR:
+        return orjson.dumps(
+            {"ts": [p[0] for p in points], "price": [p[1] for p in points]}
+        )
+    return orjson.dumps([{"price": p, "captured_ts_ms": ts} for ts, p in points])
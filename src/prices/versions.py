@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import time
+from typing import Iterable
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Price, PriceVersion
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+async def bump_versions(session: AsyncSession, prices: Iterable[Price]) -> None:
+    """
+    Bump the version of every ticker in ``prices``; caller commits.
+    """
+    latest: dict[str, int] = {}
+    for p in prices:
+        latest[p.ticker] = max(p.captured_ts_ms, latest.get(p.ticker, p.captured_ts_ms))
+    if not latest:
+        return
+
+    now_ms = _now_ms()
+    # Stable lock order keeps concurrent writers from deadlocking.
+    rows = [
+        {"ticker": ticker, "version": 1, "latest_ts_ms": ts, "modified_ts_ms": now_ms}
+        for ticker, ts in sorted(latest.items())
+    ]
+    stmt = insert(PriceVersion).values(rows)
+    current = PriceVersion.__table__.c
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["ticker"],
+        set_={
+            "version": current.version + 1,
+            "latest_ts_ms": func.greatest(
+                current.latest_ts_ms, stmt.excluded.latest_ts_ms
+            ),
+            "modified_ts_ms": stmt.excluded.modified_ts_ms,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def bump_all_versions(session: AsyncSession) -> None:
+    """
+    Bump every ticker, e.g. after whole partitions were removed; caller commits.
+    """
+    await session.execute(
+        update(PriceVersion).values(
+            version=PriceVersion.version + 1, modified_ts_ms=_now_ms()
+        )
+    )
+
+
+async def read_version(session: AsyncSession, ticker: str) -> PriceVersion | None:
+    return await session.scalar(
+        select(PriceVersion).where(PriceVersion.ticker == ticker)
+    )
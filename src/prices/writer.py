@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.schemas.price import PriceFull
+from src.prices.crud import create_prices
+from src.sources import DEFAULT_SOURCE, mirrored_sources
+from src.utils import logger
+
+
+class PriceBatchWriter:
+    """
+    Drains a queue of prices into the database in batches.
+
+    A batch is flushed once it reaches ``batch_size`` items or once
+    ``flush_interval_s`` has passed since its first item, whichever comes first.
+    Prices are stored as ``source``, and as ``composite`` too when the API
+    serves that (see ``mirrored_sources``).
+    """
+
+    def __init__(
+        self,
+        queue: asyncio.Queue[PriceFull],
+        session_factory: async_sessionmaker[AsyncSession],
+        batch_size: int = 500,
+        flush_interval_s: float = 1.0,
+        source: str = DEFAULT_SOURCE,
+    ) -> None:
+        self._queue = queue
+        self._source = source
+        self._session_factory = session_factory
+        self._batch_size = batch_size
+        self._flush_interval_s = flush_interval_s
+        self.written = 0
+        self.duplicates = 0
+        self.failed = 0
+
+    async def run(self) -> None:
+        """
+        Flush batches until cancelled; the pending batch is flushed on cancel.
+        """
+        batch: list[PriceFull] = []
+        flushing: asyncio.Future[None] | None = None
+        try:
+            while True:
+                batch.append(await self._queue.get())
+                deadline = asyncio.get_running_loop().time() + self._flush_interval_s
+                while len(batch) < self._batch_size:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                # A flush hands its items back to the queue as done whether or
+                # not it finishes, so it must neither be cut short nor repeated.
+                flushing = asyncio.ensure_future(self.flush(batch))
+                batch = []
+                await asyncio.shield(flushing)
+        finally:
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            flushes = [] if flushing is None else [flushing]
+            if batch:
+                flushes.append(asyncio.ensure_future(self.flush(batch)))
+            if flushes:
+                await asyncio.shield(asyncio.gather(*flushes))
+
+    async def flush(self, batch: list[PriceFull]) -> None:
+        try:
+            async with self._session_factory() as session:
+                inserted = await create_prices(
+                    session=session,
+                    prices_in=batch,
+                    returning=False,
+                    source=self._source,
+                )
+                for source in mirrored_sources():
+                    await create_prices(
+                        session=session, prices_in=batch, returning=False, source=source
+                    )
+        except Exception:
+            self.failed += len(batch)
+            logger.exception("Failed to write batch of %d prices", len(batch))
+        else:
+            self.written += inserted
+            self.duplicates += len(batch) - inserted
+        finally:
+            for _ in batch:
+                self._queue.task_done()
@@ -0,0 +1,9 @@
+from .base import (
+    COMPOSITE_SOURCE,
+    DEFAULT_SOURCE,
+    IndexPricesBatch,
+    PriceSource,
+    SourceTimeout,
+    mirrored_sources,
+)
+from .collector import PriceCollector, composite_prices
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterable, Protocol, runtime_checkable
+
+from src.config import settings
+from src.domain.schemas.price import PriceFull
+
+# Value of prices.source for rows collected from Deribit, the only venue
+# the stream collector and backfill read from.
+DEFAULT_SOURCE = "deribit"
+# Median of every source that answered, stored under its own source name.
+COMPOSITE_SOURCE = "composite"
+
+
+@dataclass(slots=True)
+class IndexPricesBatch:
+    prices: list[PriceFull] = field(default_factory=list)
+    failures: dict[str, Exception] = field(default_factory=dict)
+
+
+class SourceTimeout(Exception):
+    """Source did not answer within its collection timeout."""
+
+
+@runtime_checkable
+class PriceSource(Protocol):
+    """
+    A venue the collector can poll for index prices.
+
+    ``get_index_prices_batch`` keeps partial results: tickers that failed, or
+    were still in flight at ``deadline_s``, are reported in ``failures``.
+    """
+
+    @property
+    def name(self) -> str: ...
+
+    async def get_index_prices_batch(
+        self, tickers: Iterable[str], deadline_s: float | None = None
+    ) -> IndexPricesBatch: ...
+
+
+def mirrored_sources() -> list[str]:
+    """
+    Sources that single-venue writers (stream, backfill) also store their
+    prices under, besides their own.
+
+    When the API serves ``composite``, their venue is the only one that
+    answered, so its prices are that median too.
+    """
+    if settings.primary_price_source == COMPOSITE_SOURCE:
+        return [COMPOSITE_SOURCE]
+    return []
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from typing import AsyncIterator, Iterable, Mapping, Sequence
+
+from src.domain.schemas.price import PriceFull
+from src.utils import logger, metrics
+from .base import IndexPricesBatch, PriceSource, SourceTimeout
+
+
+class PriceCollector:
+    """
+    Polls every source concurrently, each under its own timeout.
+
+    Results are yielded as each source finishes, so a slow or failing source
+    never holds back the others. Per-source concurrency is the source's own
+    (``DeribitClientConfig.concurrency``), so sources never share a limit.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[PriceSource],
+        default_timeout_s: float,
+        timeouts_s: Mapping[str, float] | None = None,
+        grace_s: float = 1.0,
+    ) -> None:
+        self._sources = list(sources)
+        self._default_timeout_s = default_timeout_s
+        self._timeouts_s = dict(timeouts_s or {})
+        # Time a source gets past its deadline to return partial results
+        # before it is cancelled outright.
+        self._grace_s = grace_s
+
+    def timeout_s(self, source: str) -> float:
+        return self._timeouts_s.get(source, self._default_timeout_s)
+
+    async def collect(
+        self, tickers: Sequence[str]
+    ) -> AsyncIterator[tuple[str, IndexPricesBatch]]:
+        """
+        ``(source name, batch)`` for every source, fastest first.
+        """
+        tasks = [
+            asyncio.ensure_future(self._fetch(source, tickers))
+            for source in self._sources
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _fetch(
+        self, source: PriceSource, tickers: Sequence[str]
+    ) -> tuple[str, IndexPricesBatch]:
+        timeout_s = self.timeout_s(source.name)
+        started = time.perf_counter()
+        try:
+            async with asyncio.timeout(timeout_s + self._grace_s):
+                batch = await source.get_index_prices_batch(
+                    tickers, deadline_s=timeout_s
+                )
+        except TimeoutError:
+            error = SourceTimeout(f"{source.name} timed out after {timeout_s}s")
+            batch = IndexPricesBatch(failures={t: error for t in tickers})
+        except Exception as e:
+            # One broken source must not cost the others their prices.
+            logger.exception("Price source %s failed", source.name)
+            batch = IndexPricesBatch(failures={t: e for t in tickers})
+        finally:
+            metrics.SOURCE_COLLECT_DURATION.labels(source.name).observe(
+                time.perf_counter() - started
+            )
+        for error in batch.failures.values():
+            metrics.SOURCE_FAILURES.labels(source.name, type(error).__name__).inc()
+        return source.name, batch
+
+
+def composite_prices(batches: Iterable[IndexPricesBatch]) -> list[PriceFull]:
+    """
+    Median price per ``(ticker, captured_ts_ms)`` across sources.
+    """
+    grouped: dict[tuple[str, int], list[float]] = {}
+    for batch in batches:
+        for p in batch.prices:
+            grouped.setdefault((p.ticker, p.captured_ts_ms), []).append(p.price)
+    return [
+        PriceFull(ticker=ticker, price=statistics.median(prices), captured_ts_ms=ts)
+        for (ticker, ts), prices in sorted(grouped.items())
+    ]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import aiohttp
+
+from src.config import settings
+from src.deribit.client import DeribitClient, DeribitClientConfig
+from src.deribit.config import DERIBIT_BASE_URL, DERIBIT_TESTNET_BASE_URL
+from .base import DEFAULT_SOURCE, PriceSource
+
+SourceFactory = Callable[[str, aiohttp.ClientSession], PriceSource]
+
+
+def _deribit(base_url: str) -> Callable[[str, aiohttp.ClientSession], DeribitClient]:
+    def create(name: str, session: aiohttp.ClientSession) -> DeribitClient:
+        config = DeribitClientConfig(
+            source=name,
+            base_url=base_url,
+            concurrency=settings.price_source_concurrency.get(
+                name, DeribitClientConfig().concurrency
+            ),
+            capture_bucket_ms=int(settings.collect_interval_s * 1000),
+        )
+        return DeribitClient(config, session=session)
+
+    return create
+
+
+# Names accepted in PRICE_SOURCES; a new venue only needs an entry here.
+SOURCE_FACTORIES: dict[str, SourceFactory] = {
+    DEFAULT_SOURCE: _deribit(DERIBIT_BASE_URL),
+    "deribit_testnet": _deribit(DERIBIT_TESTNET_BASE_URL),
+}
+
+
+def create_source(name: str, session: aiohttp.ClientSession) -> PriceSource:
+    try:
+        factory = SOURCE_FACTORIES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown price source {name!r}, expected one of {sorted(SOURCE_FACTORIES)}"
+        ) from None
+    return factory(name, session)
+
+
+def create_deribit_client(session: aiohttp.ClientSession) -> DeribitClient:
+    return _deribit(DERIBIT_BASE_URL)(DEFAULT_SOURCE, session)
@@ -0,0 +1,36 @@
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import TrackedTicker
+
+
+async def read_enabled_tickers(session: AsyncSession) -> list[str]:
+    stmt = (
+        select(TrackedTicker.name)
+        .where(TrackedTicker.enabled.is_(True))
+        .order_by(TrackedTicker.name)
+    )
+    return list(await session.scalars(stmt))
+
+
+async def add_tickers(session: AsyncSession, names: Iterable[str]) -> int:
+    """
+    Insert missing tickers as enabled; existing rows, including disabled
+    ones, are left untouched. Returns the number of tickers added.
+    """
+    values = [{"name": name} for name in sorted(set(names))]
+    if not values:
+        return 0
+
+    stmt = (
+        insert(TrackedTicker)
+        .values(values)
+        .on_conflict_do_nothing(index_elements=["name"])
+        .returning(TrackedTicker.name)
+    )
+    added = list(await session.scalars(stmt))
+    await session.commit()
+    return len(added)
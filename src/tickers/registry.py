@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import zlib
+from typing import Iterable
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.models import db_helper
+from src.tickers import crud
+from src.utils import logger
+
+
+def shard_of(ticker: str, shards: int) -> int:
+    """
+    Stable shard for ``ticker``; identical in every process, unlike ``hash``.
+    """
+    return zlib.crc32(ticker.encode()) % shards
+
+
+def select_shard(tickers: Iterable[str], shard: int, shards: int) -> list[str]:
+    return [t for t in tickers if shard_of(t, shards) == shard]
+
+
+class TickerRegistry:
+    """
+    Tracked tickers, read from the ``tickers`` table and kept in memory.
+
+    The table is re-read at most every ``refresh_interval_s``. Until it has
+    been read successfully, or while it is empty, ``defaults`` are used.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        defaults: Iterable[str],
+        refresh_interval_s: float,
+    ) -> None:
+        self._session_factory = session_factory
+        self._defaults = tuple(defaults)
+        self._refresh_interval_s = refresh_interval_s
+        self._tickers: tuple[str, ...] = self._defaults
+        self._names: frozenset[str] = frozenset(self._defaults)
+        self._expires_at = 0.0
+        self._refreshing: asyncio.Task[tuple[str, ...]] | None = None
+
+    async def refresh(self) -> tuple[str, ...]:
+        try:
+            async with self._session_factory() as session:
+                tickers = await crud.read_enabled_tickers(session)
+        except (OSError, SQLAlchemyError) as e:
+            # Keep serving the last known list rather than failing requests.
+            logger.warning("Failed to load tickers, keeping %d: %r", len(self), e)
+        else:
+            self._set(tickers or self._defaults)
+        self._expires_at = time.monotonic() + self._refresh_interval_s
+        return self._tickers
+
+    def _set(self, tickers: Iterable[str]) -> None:
+        self._tickers = tuple(tickers)
+        self._names = frozenset(self._tickers)
+
+    def invalidate(self) -> None:
+        self._expires_at = 0.0
+
+    async def get(self) -> tuple[str, ...]:
+        if time.monotonic() < self._expires_at:
+            return self._tickers
+        # Callers arriving while the list is being re-read share that read
+        # instead of each querying the table.
+        task = self._refreshing
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self.refresh())
+            task.add_done_callback(self._refresh_done)
+            self._refreshing = task
+        return await asyncio.shield(task)
+
+    def _refresh_done(self, task: asyncio.Task) -> None:
+        if self._refreshing is task:
+            self._refreshing = None
+
+    async def contains(self, ticker: str) -> bool:
+        await self.get()
+        return ticker in self._names
+
+    def __len__(self) -> int:
+        return len(self._tickers)
+
+
+ticker_registry = TickerRegistry(
+    db_helper.session_factory,
+    defaults=settings.tickers,
+    refresh_interval_s=settings.ticker_refresh_interval_s,
+)
@@ -1,10 +1,89 @@
 from __future__ import annotations
 
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from src.config import settings
+
+# Attributes every LogRecord has; anything else was passed via ``extra``.
+_RECORD_ATTRS = frozenset(
+    [*vars(logging.makeLogRecord({})), "message", "asctime", "taskName"]
+)
+
+_listeners: list[QueueListener] = []
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line, with ``extra`` fields as top-level keys.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        if record.stack_info:
+            payload["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class _QueueHandler(QueueHandler):
+    """
+    Hands records to the listener thread without formatting them.
+
+    Unlike the stdlib handler it keeps ``extra`` fields and the traceback
+    separate from the message, so the JSON formatter still sees them.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _stop_listeners() -> None:
+    for listener in _listeners:
+        listener.stop()
+
+
+def _restart_listeners_after_fork() -> None:
+    # The listener thread does not survive fork (e.g. Celery prefork
+    # children); start a fresh one over the same queue and handlers.
+    for i, listener in enumerate(_listeners):
+        _listeners[i] = QueueListener(
+            listener.queue, *listener.handlers, respect_handler_level=True
+        )
+        _listeners[i].start()
+
+
+atexit.register(_stop_listeners)
+os.register_at_fork(after_in_child=_restart_listeners_after_fork)
+
 
 def setup_logger(
     name: str = "app",
@@ -13,7 +92,15 @@ def setup_logger(
     log_file: str = "logs/app.log",
     max_file_size: int = 10 * 1024 * 1024,  # 10 MB
     backup_count: int = 5,
+    log_format: str = "text",
+    use_queue: bool = False,
 ) -> logging.Logger:
+    """
+    Configure ``name`` to log to stdout and, optionally, a rotating file.
+
+    With ``use_queue`` the handlers run on a background thread, so callers
+    only enqueue records and never block on terminal or disk I/O.
+    """
 
     logger = logging.getLogger(name)
 
@@ -27,17 +114,24 @@ def setup_logger(
     logger.setLevel(level)
     logger.propagate = False
 
-    formatter = logging.Formatter(
-        fmt=(
-            "%(asctime)s | %(levelname)s | %(name)s | "
-            "%(filename)s:%(lineno)d | %(message)s"
-        ),
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    if log_format == "json":
+        formatter: logging.Formatter = JsonFormatter()
+    elif log_format == "text":
+        formatter = logging.Formatter(
+            fmt=(
+                "%(asctime)s | %(levelname)s | %(name)s | "
+                "%(filename)s:%(lineno)d | %(message)s"
+            ),
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    else:
+        raise ValueError(f"Invalid log format: {log_format}")
+
+    handlers: list[logging.Handler] = []
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     if log_to_file:
         log_path = Path(log_file)
@@ -50,9 +144,26 @@ def setup_logger(
             encoding="utf-8",
         )
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    if not use_queue:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return logger
+
+    # Unbounded, so enqueueing never blocks or drops records.
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    _listeners.append(listener)
+    logger.addHandler(_QueueHandler(records))
 
     return logger
 
 
-logger = setup_logger()
+logger = setup_logger(
+    log_level=settings.log_level,
+    log_to_file=settings.log_to_file,
+    log_format=settings.log_format,
+    use_queue=settings.log_queue,
+)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import TYPE_CHECKING, Sequence
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+
+if TYPE_CHECKING:
+    from src.models import Price
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow upstreams.
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+LAG_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "API request latency by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+DERIBIT_REQUEST_DURATION = Histogram(
+    "deribit_request_duration_seconds",
+    "Deribit HTTP request latency, excluding semaphore and rate limiter waits.",
+    ["endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+DERIBIT_ERRORS = Counter(
+    "deribit_errors_total",
+    "Deribit request failures by error class, counted per attempt.",
+    ["endpoint", "error"],
+)
+DERIBIT_SEMAPHORE_WAIT = Histogram(
+    "deribit_semaphore_wait_seconds",
+    "Time spent waiting for a DeribitClient concurrency slot.",
+    buckets=LATENCY_BUCKETS,
+)
+DERIBIT_RATE_LIMIT_WAIT = Histogram(
+    "deribit_rate_limit_wait_seconds",
+    "Time spent waiting for DeribitClient rate limit credits.",
+    buckets=LATENCY_BUCKETS,
+)
+
+SOURCE_COLLECT_DURATION = Histogram(
+    "source_collect_duration_seconds",
+    "Time for one price source to answer a collection, including timeouts.",
+    ["source"],
+    buckets=LATENCY_BUCKETS,
+)
+SOURCE_FAILURES = Counter(
+    "source_failures_total",
+    "Tickers a price source failed to deliver, by error class.",
+    ["source", "error"],
+)
+
+PRICES_INSERTED = Counter("prices_inserted_total", "Price rows inserted.")
+PRICES_CONFLICTED = Counter(
+    "prices_conflicted_total", "Price rows skipped as already stored."
+)
+PRICES_INGEST_LAG = Histogram(
+    "prices_ingest_lag_seconds",
+    "Now minus captured_ts_ms of the newest price in each stored batch.",
+    buckets=LAG_BUCKETS,
+)
+PRICES_LAST_CAPTURED = Gauge(
+    "prices_last_captured_timestamp_seconds",
+    "captured_ts_ms of the newest stored price, per ticker.",
+    ["ticker"],
+    multiprocess_mode="max",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time to check a connection out of the SQLAlchemy pool.",
+    ["engine"],
+    buckets=LATENCY_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CAPACITY = Gauge(
+    "db_pool_capacity",
+    "Most connections the pool will open (pool size plus overflow).",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+PRICE_FEED_SUBSCRIBERS = Gauge(
+    "price_feed_subscribers",
+    "Clients subscribed to the live price feed.",
+    multiprocess_mode="livesum",
+)
+PRICE_FEED_DROPPED = Counter(
+    "price_feed_dropped_total",
+    "Live feed messages dropped because a subscriber fell behind.",
+)
+
+
+def observe_stored_prices(attempted: int, stored: Sequence[Price]) -> None:
+    """
+    Record the outcome of one ``create_prices`` batch.
+    """
+    PRICES_INSERTED.inc(len(stored))
+    PRICES_CONFLICTED.inc(attempted - len(stored))
+    if not stored:
+        return
+
+    latest: dict[str, int] = {}
+    for price in stored:
+        if price.captured_ts_ms > latest.get(price.ticker, -1):
+            latest[price.ticker] = price.captured_ts_ms
+    for ticker, captured_ts_ms in latest.items():
+        PRICES_LAST_CAPTURED.labels(ticker).set(captured_ts_ms / 1000)
+    PRICES_INGEST_LAG.observe(max(0.0, time.time() - max(latest.values()) / 1000))
+
+
+def _registry() -> CollectorRegistry:
+    # Prefork workers and multi-worker servers each write their samples to
+    # PROMETHEUS_MULTIPROC_DIR; the exporter merges them on scrape.
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render() -> tuple[bytes, str]:
+    """
+    Current metrics in the Prometheus text format, with its content type.
+    """
+    return generate_latest(_registry()), CONTENT_TYPE_LATEST
+
+
+def start_exporter(port: int) -> None:
+    """
+    Serve ``/metrics`` from a background thread, for processes without an API.
+    """
+    start_http_server(port, registry=_registry())
+
+
+def mark_process_dead(pid: int) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
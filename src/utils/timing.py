@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+
+
+@dataclass(slots=True)
+class RequestTimings:
+    """
+    Where the time of one request went, as ``perf_counter`` readings and sums.
+    """
+
+    started: float = field(default_factory=time.perf_counter)
+    endpoint_started: float | None = None
+    endpoint_finished: float | None = None
+    db_s: float = 0.0
+    db_queries: int = 0
+    pool_s: float = 0.0
+
+    def server_timing(self, now: float) -> str:
+        """
+        ``Server-Timing`` header value up to ``now``; durations in milliseconds.
+
+        ``deps`` runs until the endpoint is called and ``serialize`` from its
+        return until the response starts; ``db`` and ``pool`` overlap both.
+        """
+        metrics = []
+        if self.endpoint_started is not None:
+            metrics.append(_metric("deps", self.endpoint_started - self.started))
+        if self.endpoint_started is not None and self.endpoint_finished is not None:
+            metrics.append(
+                _metric("endpoint", self.endpoint_finished - self.endpoint_started)
+            )
+            metrics.append(_metric("serialize", now - self.endpoint_finished))
+        if self.db_queries:
+            metrics.append(_metric("db", self.db_s, f"{self.db_queries} queries"))
+        if self.pool_s:
+            metrics.append(_metric("pool", self.pool_s))
+        metrics.append(_metric("total", now - self.started))
+        return ", ".join(metrics)
+
+
+def _metric(name: str, seconds: float, desc: str | None = None) -> str:
+    metric = f"{name};dur={seconds * 1000:.2f}"
+    return f'{metric};desc="{desc}"' if desc else metric
+
+
+# Only set while a request is being timed, so recording elsewhere is a no-op.
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start() -> Token:
+    return _current.set(RequestTimings())
+
+
+def reset(token: Token) -> None:
+    _current.reset(token)
+
+
+def current() -> RequestTimings | None:
+    return _current.get()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.deribit.client import DeribitClient
+from src.models import db_helper
+from src.prices.crud import create_prices
+from src.sources import mirrored_sources
+from src.tickers.registry import ticker_registry
+from src.utils import logger
+from src.utils.timestamps import parse_ts
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class BackfillCheckpoint:
+    """
+    Last written ``captured_ts_ms`` per ticker and the range end of the run,
+    persisted as JSON.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._positions: dict[str, int] = {}
+        self.to_ts: int | None = None
+        if self._path.exists():
+            data = json.loads(self._path.read_text(encoding="utf-8"))
+            self._positions = data["positions"]
+            self.to_ts = data["to_ts"]
+
+    def get(self, ticker: str) -> int | None:
+        return self._positions.get(ticker)
+
+    def set(self, ticker: str, captured_ts_ms: int) -> None:
+        self._positions[ticker] = captured_ts_ms
+        self._save()
+
+    def set_to_ts(self, to_ts: int) -> None:
+        self.to_ts = to_ts
+        self._save()
+
+    def _save(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        data = {"to_ts": self.to_ts, "positions": self._positions}
+        tmp_path.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp_path, self._path)
+
+
+@dataclass(slots=True)
+class BackfillStats:
+    rows_fetched: int = 0
+    rows_written: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+    elapsed_s: float = 0.0
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows_written / self.elapsed_s if self.elapsed_s else 0.0
+
+
+async def backfill_prices(
+    client: DeribitClient,
+    session_factory: async_sessionmaker[AsyncSession],
+    tickers: Iterable[str],
+    from_ts: int,
+    to_ts: int,
+    checkpoint: BackfillCheckpoint | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> BackfillStats:
+    """
+    Fetch index history for every ticker and write it in chunks.
+
+    Tickers are fetched concurrently, bounded by the client's semaphore.
+    Each written chunk advances the checkpoint, so a rerun resumes after
+    the last chunk that made it to the database.
+    """
+    stats = BackfillStats()
+
+    async def _backfill_ticker(ticker: str) -> None:
+        start_ts = from_ts
+        if checkpoint is not None and checkpoint.get(ticker) is not None:
+            start_ts = max(from_ts, checkpoint.get(ticker) + 1)
+        if start_ts > to_ts:
+            return
+
+        prices = await client.get_index_history(ticker, start_ts, to_ts)
+        stats.rows_fetched += len(prices)
+
+        for i in range(0, len(prices), chunk_size):
+            chunk = prices[i : i + chunk_size]
+            async with session_factory() as session:
+                inserted = await create_prices(
+                    session=session,
+                    prices_in=chunk,
+                    returning=False,
+                    source=client.name,
+                )
+                for source in mirrored_sources():
+                    await create_prices(
+                        session=session, prices_in=chunk, returning=False, source=source
+                    )
+            stats.rows_written += inserted
+            if checkpoint is not None:
+                checkpoint.set(ticker, chunk[-1].captured_ts_ms)
+
+    await asyncio.gather(*(_backfill_ticker(t) for t in tickers))
+
+    stats.elapsed_s = time.perf_counter() - stats.started_at
+    logger.info(
+        "Backfill finished: fetched=%d written=%d in %.2f s (%.0f rows/s)",
+        stats.rows_fetched,
+        stats.rows_written,
+        stats.elapsed_s,
+        stats.rows_per_s,
+    )
+    return stats
+
+
+def checkpoint_path(
+    directory: str | Path, from_ts: int, tickers: Iterable[str] | None = None
+) -> Path:
+    """
+    Checkpoint of a run, keyed by where it starts and what it covers.
+
+    The range end is stored inside instead, so a rerun without ``--to``
+    resumes the interrupted run rather than starting a new one.
+    """
+    if tickers is None:
+        scope = "all"
+    else:
+        joined = ",".join(sorted(set(tickers)))
+        scope = hashlib.sha1(joined.encode()).hexdigest()[:12]
+    return Path(directory) / f"backfill_{from_ts}_{scope}.json"
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill Deribit index prices.")
+    parser.add_argument(
+        "--from",
+        dest="from_ts",
+        type=parse_ts,
+        required=True,
+        help="Range start, unix ms or ISO 8601 (UTC if no offset).",
+    )
+    parser.add_argument(
+        "--to",
+        dest="to_ts",
+        type=parse_ts,
+        default=None,
+        help=(
+            "Range end, unix ms or ISO 8601. Defaults to the end stored in the "
+            "checkpoint when resuming, otherwise to now."
+        ),
+    )
+    parser.add_argument(
+        "--ticker",
+        dest="tickers",
+        type=str,
+        action="append",
+        help="Ticker to backfill; repeat for several. Defaults to all tracked.",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=None,
+        help="Checkpoint file used to resume an interrupted run.",
+    )
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    path = args.checkpoint or checkpoint_path(
+        settings.backfill_checkpoint_dir, args.from_ts, args.tickers
+    )
+    checkpoint = BackfillCheckpoint(path)
+    to_ts = args.to_ts or checkpoint.to_ts or int(time.time() * 1000)
+    checkpoint.set_to_ts(to_ts)
+    try:
+        tickers = args.tickers or await ticker_registry.get()
+        async with DeribitClient() as client:
+            await backfill_prices(
+                client,
+                db_helper.session_factory,
+                tickers,
+                args.from_ts,
+                to_ts,
+                checkpoint=checkpoint,
+                chunk_size=args.chunk_size,
+            )
+    finally:
+        await db_helper.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(_parse_args()))
@@ -20,8 +20,20 @@ celery_app.conf.update(
 
 
 celery_app.conf.beat_schedule = {
-    "collect-deribit-prices-every-minute": {
+    "refresh-tickers-hourly": {
+        "task": "src.worker.tasks.refresh_tickers",
+        "schedule": 60 * 60.0,
+    },
+    "maintain-price-partitions-daily": {
+        "task": "src.worker.tasks.maintain_price_partitions",
+        "schedule": 24 * 60 * 60.0,
+    },
+}
+
+# One collection task per shard, so tickers are spread across worker processes.
+for shard in range(settings.collector_shards):
+    celery_app.conf.beat_schedule[f"collect-deribit-prices-shard-{shard}"] = {
         "task": "src.worker.tasks.collect_and_save_prices",
-        "schedule": 60.0,
+        "schedule": settings.collect_interval_s,
+        "kwargs": {"shard": shard},
     }
-}
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Awaitable, TypeVar
+
+import aiohttp
+from celery.signals import (
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
+from celery.utils.log import get_task_logger
+
+from src.config import settings
+from src.deribit.client import DeribitClient, DeribitClientConfig
+from src.models import db_helper
+from src.sources import DEFAULT_SOURCE, PriceSource
+from src.sources.registry import create_deribit_client, create_source
+from src.utils import metrics
+
+logger = get_task_logger(__name__)
+
+T = TypeVar("T")
+
+_event_loop: asyncio.AbstractEventLoop | None = None
+_http_session: aiohttp.ClientSession | None = None
+_deribit_client: DeribitClient | None = None
+_price_sources: dict[str, PriceSource] = {}
+_price_sources_session: aiohttp.ClientSession | None = None
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Event loop owned by the current worker process.
+    """
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Keep-alive HTTP session shared by all tasks of the current worker process.
+
+    Must be called from a coroutine running on ``get_event_loop()``.
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=settings.worker_http_limit,
+            ttl_dns_cache=settings.worker_dns_cache_ttl_s,
+            keepalive_timeout=settings.worker_http_keepalive_s,
+        )
+        _http_session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=DeribitClientConfig().timeout_s),
+        )
+    return _http_session
+
+
+def get_deribit_client() -> DeribitClient:
+    """
+    Deribit client shared by all tasks of the current worker process, so its
+    rate limiter, retry budget and circuit breaker see every request.
+    """
+    global _deribit_client
+    session = get_http_session()
+    if _deribit_client is None or _deribit_client.session is not session:
+        _deribit_client = create_deribit_client(session)
+    return _deribit_client
+
+
+def get_price_sources(names: list[str] | None = None) -> list[PriceSource]:
+    """
+    Sources in ``names`` (default ``settings.price_sources``), shared by all
+    tasks of the current worker process; ``deribit`` is ``get_deribit_client()``.
+    """
+    global _price_sources_session
+    session = get_http_session()
+    if _price_sources_session is not session:
+        _price_sources.clear()
+        _price_sources_session = session
+
+    sources = []
+    for name in names or settings.price_sources:
+        if name == DEFAULT_SOURCE:
+            sources.append(get_deribit_client())
+            continue
+        if name not in _price_sources:
+            _price_sources[name] = create_source(name, session)
+        sources.append(_price_sources[name])
+    return sources
+
+
+def run(coro: Awaitable[T]) -> T:
+    return get_event_loop().run_until_complete(coro)
+
+
+async def _aclose() -> None:
+    global _http_session, _deribit_client, _price_sources_session
+    _deribit_client = None
+    _price_sources.clear()
+    _price_sources_session = None
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+    await db_helper.dispose()
+
+
+@worker_init.connect
+def start_metrics_exporter(**kwargs) -> None:
+    # Started once in the main process; prefork children report through
+    # PROMETHEUS_MULTIPROC_DIR when it is set.
+    if settings.worker_metrics_port is not None:
+        metrics.start_exporter(settings.worker_metrics_port)
+        logger.info("Worker metrics exporter on :%d", settings.worker_metrics_port)
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs) -> None:
+    # Connections inherited from the parent process must not be reused after
+    # fork: give this process its own pool without closing the parent's sockets.
+    for engine in db_helper.engines:
+        engine.sync_engine.dispose(close=False)
+    get_event_loop()
+    logger.info("Worker process resources initialized")
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def shutdown_worker_process(**kwargs) -> None:
+    global _event_loop
+    metrics.mark_process_dead(os.getpid())
+    if _event_loop is None or _event_loop.is_closed():
+        return
+
+    try:
+        _event_loop.run_until_complete(_aclose())
+    finally:
+        _event_loop.close()
+        _event_loop = None
+    logger.info("Worker process resources released")
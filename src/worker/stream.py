@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import asyncio
+import signal
+
+from src.config import settings
+from src.deribit.stream import DeribitStreamCollector
+from src.domain.schemas import PriceFull
+from src.models import db_helper
+from src.prices.writer import PriceBatchWriter
+from src.tickers.registry import ticker_registry
+from src.utils import logger, metrics
+
+
+async def run_stream() -> None:
+    if settings.stream_metrics_port is not None:
+        metrics.start_exporter(settings.stream_metrics_port)
+    queue: asyncio.Queue[PriceFull] = asyncio.Queue(maxsize=settings.stream_queue_size)
+    # Subscriptions are fixed per connection; restart to pick up new tickers.
+    tickers = await ticker_registry.get()
+    collector = DeribitStreamCollector(tickers, queue)
+    writer = PriceBatchWriter(
+        queue,
+        db_helper.session_factory,
+        batch_size=settings.stream_batch_size,
+        flush_interval_s=settings.stream_flush_interval_s,
+    )
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, collector.stop)
+
+    writer_task = asyncio.create_task(writer.run())
+    try:
+        await collector.run()
+    finally:
+        await collector.aclose()
+        writer_task.cancel()
+        await asyncio.gather(writer_task, return_exceptions=True)
+        await db_helper.dispose()
+        logger.info(
+            "Deribit stream stopped: received=%d dropped=%d written=%d failed=%d",
+            collector.received,
+            collector.dropped,
+            writer.written,
+            writer.failed,
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(run_stream())
@@ -1,44 +1,117 @@
 from __future__ import annotations
 
-import asyncio
+import random
 from datetime import datetime, timezone
 
 from celery.utils.log import get_task_logger
 
-from src.deribit.client import (
-    DeribitClient,
-    DeribitRateLimited,
-    DeribitUnavailable,
-)
-
-event_loop = asyncio.new_event_loop()
-asyncio.set_event_loop(event_loop)
-
+from src.deribit.client import DeribitRateLimited, DeribitUnavailable
 from src.models import db_helper
 from src.domain.schemas import PriceFull
+from src.config import settings
 from src.prices.crud import create_prices
-from src.domain.enums import Ticker
+from src.prices.partitions import apply_retention, ensure_partitions
+from src.sources import (
+    COMPOSITE_SOURCE,
+    IndexPricesBatch,
+    PriceCollector,
+    SourceTimeout,
+    composite_prices,
+)
+from src.tickers import crud as tickers_crud
+from src.tickers.registry import select_shard, ticker_registry
+from . import lifecycle
+from .backfill import BackfillCheckpoint, backfill_prices, checkpoint_path
 
 logger = get_task_logger(__name__)
 
-TICKERS = (Ticker.BTC_USD, Ticker.ETH_USD)
 
+async def _resolve_tickers(
+    tickers: list[str] | None, shard: int | None = None
+) -> list[str]:
+    if tickers:
+        return list(tickers)
+    tracked = await ticker_registry.get()
+    if shard is None:
+        return list(tracked)
+    return select_shard(tracked, shard, settings.collector_shards)
 
-async def _collect_prices_async() -> list[PriceFull]:
-    async with DeribitClient() as client:
-        prices = await client.get_index_prices(TICKERS)
 
-    return prices
-
-
-async def _save_prices(prices: list[PriceFull]) -> None:
+async def _save_prices(prices: list[PriceFull], source: str) -> None:
     async with db_helper.session_factory() as session:
-        await create_prices(session=session, prices_in=prices)
+        await create_prices(
+            session=session, prices_in=prices, returning=False, source=source
+        )
 
 
-async def _collect_and_save_prices_async():
-    prices = await _collect_prices_async()
-    await _save_prices(prices)
+async def _collect_and_save_prices_async(
+    tickers: list[str] | None, shard: int, sources: list[str] | None = None
+) -> dict[str, IndexPricesBatch]:
+    """
+    Collect from every source at once, saving each as soon as it answers.
+
+    With several sources their median is stored too, from the sources that
+    answered this attempt; a retry of single sources leaves it as it is.
+    """
+    tickers = await _resolve_tickers(tickers, shard)
+    if not tickers:
+        return {}
+    price_sources = lifecycle.get_price_sources(sources)
+    collector = PriceCollector(
+        price_sources,
+        default_timeout_s=settings.collect_deadline_s,
+        timeouts_s=settings.price_source_timeouts_s,
+    )
+    batches = {}
+    async for source, batch in collector.collect(tickers):
+        batches[source] = batch
+        if batch.prices:
+            await _save_prices(batch.prices, source)
+
+    if len(price_sources) > 1:
+        composite = composite_prices(batches.values())
+        if composite:
+            await _save_prices(composite, COMPOSITE_SOURCE)
+    return batches
+
+
+async def _maintain_price_partitions_async() -> None:
+    async with db_helper.session_factory() as session:
+        await ensure_partitions(session, settings.prices_partitions_ahead)
+        if settings.prices_retention_days is not None:
+            await apply_retention(
+                session,
+                settings.prices_retention_days,
+                drop=settings.prices_retention_drop,
+            )
+
+
+async def _refresh_tickers_async() -> int:
+    names = list(settings.tickers)
+    if settings.track_all_indices:
+        names += await lifecycle.get_deribit_client().get_index_price_names()
+    async with db_helper.session_factory() as session:
+        added = await tickers_crud.add_tickers(session, names)
+    ticker_registry.invalidate()
+    return added
+
+
+async def _backfill_prices_async(
+    from_ts: int, to_ts: int, tickers: list[str] | None
+) -> None:
+    checkpoint = BackfillCheckpoint(
+        checkpoint_path(settings.backfill_checkpoint_dir, from_ts, tickers)
+    )
+    checkpoint.set_to_ts(to_ts)
+    tickers = await _resolve_tickers(tickers)
+    await backfill_prices(
+        lifecycle.get_deribit_client(),
+        db_helper.session_factory,
+        tickers,
+        from_ts,
+        to_ts,
+        checkpoint=checkpoint,
+    )
 
 
 def _utc_now_iso() -> str:
@@ -46,7 +119,7 @@ def _utc_now_iso() -> str:
 
 
 def _is_transient_exc(exc: Exception) -> bool:
-    return isinstance(exc, (DeribitUnavailable, DeribitRateLimited))
+    return isinstance(exc, (DeribitUnavailable, DeribitRateLimited, SourceTimeout))
 
 
 from .celery_app import celery_app
@@ -61,11 +134,21 @@ from .celery_app import celery_app
     retry_jitter=True,
     retry_kwargs={"max_retries": 5},
 )
-def collect_and_save_prices(self):
-    logger.info("Collecting and saving prices at %s", _utc_now_iso())
+def collect_and_save_prices(
+    self,
+    tickers: list[str] | None = None,
+    shard: int = 0,
+    sources: list[str] | None = None,
+):
+    logger.info(
+        "Collecting and saving prices for shard %d/%d at %s",
+        shard,
+        settings.collector_shards,
+        _utc_now_iso(),
+    )
 
     try:
-        event_loop.run_until_complete(_collect_and_save_prices_async())
+        batches = lifecycle.run(_collect_and_save_prices_async(tickers, shard, sources))
     except Exception as exc:
         if _is_transient_exc(exc):
             raise
@@ -73,3 +156,61 @@ def collect_and_save_prices(self):
             "Non-retryable error while collecting and saving prices: %r", exc
         )
         raise
+
+    retry_failures: dict[tuple[str, str], Exception] = {}
+    for source, batch in batches.items():
+        for ticker, exc in batch.failures.items():
+            logger.warning("Failed to collect %s from %s: %r", ticker, source, exc)
+            if _is_transient_exc(exc):
+                retry_failures[source, ticker] = exc
+
+    # Only failed tickers of failed sources are re-queued; saved prices are
+    # not fetched again.
+    if retry_failures:
+        countdown = random.uniform(0, min(60, 2**self.request.retries))
+        raise self.retry(
+            kwargs={
+                "tickers": sorted({ticker for _, ticker in retry_failures}),
+                "sources": sorted({source for source, _ in retry_failures}),
+            },
+            exc=next(iter(retry_failures.values())),
+            countdown=countdown,
+            max_retries=5,
+        )
+
+
+@celery_app.task(
+    name="src.worker.tasks.refresh_tickers",
+    autoretry_for=(DeribitUnavailable, DeribitRateLimited),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 5},
+)
+def refresh_tickers():
+    logger.info("Refreshing tracked tickers at %s", _utc_now_iso())
+    added = lifecycle.run(_refresh_tickers_async())
+    if added:
+        logger.info("Started tracking %d new tickers", added)
+
+
+@celery_app.task(name="src.worker.tasks.maintain_price_partitions")
+def maintain_price_partitions():
+    logger.info("Maintaining price partitions at %s", _utc_now_iso())
+    lifecycle.run(_maintain_price_partitions_async())
+
+
+@celery_app.task(
+    name="src.worker.tasks.backfill_prices",
+    bind=True,
+    autoretry_for=(DeribitUnavailable, DeribitRateLimited),
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_jitter=True,
+    retry_kwargs={"max_retries": 5},
+)
+def backfill_prices_task(
+    self, from_ts: int, to_ts: int, tickers: list[str] | None = None
+):
+    logger.info("Backfilling prices for [%d, %d] at %s", from_ts, to_ts, _utc_now_iso())
+    lifecycle.run(_backfill_prices_async(from_ts, to_ts, tickers))
@@ -10,6 +10,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.main import app
 from src.models import db_helper
+from src.prices.analytics import stats_cache
+from src.prices.cache import price_cache
 
 
 @pytest.fixture(scope="session")
@@ -54,7 +56,7 @@ async def prepare_database():
 
     yield
 
-    await db_helper.engine.dispose()
+    await db_helper.dispose()
 
 
 @pytest.fixture
@@ -71,6 +73,9 @@ async def client(db_session: AsyncSession):
     app.dependency_overrides[db_helper.session_dependency] = (
         _override_session_dependency
     )
+    app.dependency_overrides[db_helper.read_session_dependency] = (
+        _override_session_dependency
+    )
 
     transport = ASGITransport(app=app)
 
@@ -85,5 +90,9 @@ async def client(db_session: AsyncSession):
 
 @pytest.fixture(autouse=True)
 async def truncate_tables(db_session):
-    await db_session.execute(text("TRUNCATE prices RESTART IDENTITY CASCADE;"))
+    await db_session.execute(
+        text("TRUNCATE prices, price_ohlc, price_versions RESTART IDENTITY CASCADE;")
+    )
     await db_session.commit()
+    price_cache.clear()
+    stats_cache.clear()
@@ -0,0 +1,117 @@
+import math
+import time
+
+import numpy as np
+import pytest
+
+from src.config import settings
+from src.domain.enums import OhlcInterval
+from src.domain.schemas.price import PriceFull
+from src.prices import analytics
+from src.prices.analytics import StatsCache, compute_stats, resample_last
+from src.prices.crud import create_prices
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_compute_stats():
+    ts = np.array([0, 1000, 2000, 4000], dtype=np.int64)
+    price = np.array([100.0, 110.0, 99.0, 121.0])
+
+    stats = compute_stats(ts, price)
+
+    assert stats["count"] == stats["samples"] == 4
+    assert (stats["min"], stats["max"]) == (99.0, 121.0)
+    assert stats["return"] == pytest.approx(0.21)
+    assert stats["max_drawdown"] == pytest.approx(99 / 110 - 1)
+    assert stats["twap"] == pytest.approx((100 + 110 + 99 * 2) / 4)
+    returns = np.diff(np.log(price))
+    assert stats["mean_return"] == pytest.approx(returns.mean())
+    assert stats["volatility"] == pytest.approx(returns.std(ddof=1))
+    assert stats["annualized_volatility"] == pytest.approx(
+        returns.std(ddof=1) * math.sqrt(analytics.YEAR_MS / (4000 / 3))
+    )
+
+
+async def test_compute_stats_short_windows():
+    assert compute_stats(np.empty(0, np.int64), np.empty(0)) is None
+
+    stats = compute_stats(np.array([5], np.int64), np.array([10.0]))
+    assert stats["twap"] == 10.0
+    assert stats["volatility"] is None
+
+
+async def test_resample_last():
+    ts = np.array([0, 30_000, 60_000, 90_000, 180_000], dtype=np.int64)
+    price = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+
+    buckets, last = resample_last(ts, price, OhlcInterval.M1)
+
+    assert buckets.tolist() == [0, 60_000, 180_000]
+    assert last.tolist() == [2.0, 4.0, 5.0]
+
+
+async def test_stats_cache_evicts_least_recently_used():
+    cache = StatsCache(maxsize=2, ttl_s=60)
+    cache.put(("a", None, None, None), {"count": 1})
+    cache.put(("b", None, None, None), {"count": 2})
+    cache.get(("a", None, None, None))
+    cache.put(("c", None, None, None), {"count": 3})
+
+    assert cache.get(("b", None, None, None)) == (False, None)
+    assert cache.get(("a", None, None, None)) == (True, {"count": 1})
+    assert len(cache) == 2
+
+
+async def test_read_window_stats_is_cached(db_session):
+    await create_prices(
+        db_session,
+        [
+            PriceFull(ticker="btc_usd", price=100 + i, captured_ts_ms=i * 1000)
+            for i in range(10)
+        ],
+    )
+
+    stats = await analytics.read_window_stats(db_session, "btc_usd", 2000, 5000)
+    assert (stats["count"], stats["first"], stats["last"]) == (4, 102.0, 105.0)
+
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=1, captured_ts_ms=3500)],
+    )
+    cached = await analytics.read_window_stats(db_session, "btc_usd", 2000, 5000)
+    assert cached is stats
+
+
+async def test_read_window_stats_skips_empty_and_limits_open_windows(db_session):
+    assert await analytics.read_window_stats(db_session, "btc_usd", 0, 5000) is None
+
+    await create_prices(
+        db_session, [PriceFull(ticker="btc_usd", price=1, captured_ts_ms=1000)]
+    )
+    stats = await analytics.read_window_stats(db_session, "btc_usd", 0, 5000)
+    assert stats["count"] == 1
+
+    now_ms = int(time.time() * 1000)
+    await create_prices(
+        db_session, [PriceFull(ticker="btc_usd", price=2, captured_ts_ms=now_ms)]
+    )
+    latest = await analytics.read_window_stats(db_session, "btc_usd")
+    assert latest["count"] == 1
+    ((_, expires_at),) = [
+        entry
+        for key, entry in analytics.stats_cache._entries.items()
+        if key[1:3] == (None, None)
+    ]
+    assert expires_at <= time.monotonic() + settings.collect_interval_s
+
+
+async def test_resolve_window():
+    day_ms = analytics.DAY_MS
+    max_ms = int(settings.stats_max_window_days * day_ms)
+
+    assert analytics.resolve_window(None, None, now_ms=max_ms + 5) == (5, None)
+    assert analytics.resolve_window(None, max_ms + 7) == (7, max_ms + 7)
+    assert analytics.resolve_window(1, 2) == (1, 2)
+    with pytest.raises(analytics.WindowTooLarge):
+        analytics.resolve_window(0, max_ms + 1)
@@ -1,7 +1,12 @@
+import time
+
 import pytest
+from sqlalchemy import select
 
-from src.domain.enums import Ticker
+from src.config import settings
 from src.domain.schemas.price import PriceFull
+from src.models import PriceOhlc
+from src.prices.cache import price_cache
 from src.prices.crud import create_prices
 
 pytestmark = pytest.mark.anyio
@@ -10,17 +15,17 @@ pytestmark = pytest.mark.anyio
 async def _seed_prices(session):
     prices = [
         PriceFull(
-            ticker=Ticker.BTC_USD,
+            ticker="btc_usd",
             price=50000,
             captured_ts_ms=1000,
         ),
         PriceFull(
-            ticker=Ticker.BTC_USD,
+            ticker="btc_usd",
             price=51000,
             captured_ts_ms=2000,
         ),
         PriceFull(
-            ticker=Ticker.ETH_USD,
+            ticker="eth_usd",
             price=2000,
             captured_ts_ms=1500,
         ),
@@ -34,7 +39,7 @@ async def test_get_all_prices(client, db_session):
 
     resp = await client.get(
         "/api/v1/prices/all",
-        params={"ticker": Ticker.BTC_USD.value},
+        params={"ticker": "btc_usd"},
     )
 
     assert resp.status_code == 200
@@ -46,10 +51,26 @@ async def test_get_all_prices(client, db_session):
     assert data[0]["captured_ts_ms"] > data[1]["captured_ts_ms"]
 
 
+async def test_get_all_prices_columnar(client, db_session):
+    await _seed_prices(db_session)
+
+    rows = await client.get("/api/v1/prices/all", params={"ticker": "btc_usd"})
+    columns = await client.get(
+        "/api/v1/prices/all",
+        params={"ticker": "btc_usd", "layout": "columnar"},
+    )
+
+    assert rows.json() == [
+        {"price": 51000.0, "captured_ts_ms": 2000},
+        {"price": 50000.0, "captured_ts_ms": 1000},
+    ]
+    assert columns.json() == {"ts": [2000, 1000], "price": [51000.0, 50000.0]}
+
+
 async def test_get_all_prices_empty(client):
     resp = await client.get(
         "/api/v1/prices/all",
-        params={"ticker": Ticker.BTC_USD.value},
+        params={"ticker": "btc_usd"},
     )
 
     assert resp.status_code == 200
@@ -61,7 +82,7 @@ async def test_get_last_price(client, db_session):
 
     resp = await client.get(
         "/api/v1/prices/last",
-        params={"ticker": Ticker.BTC_USD.value},
+        params={"ticker": "btc_usd"},
     )
 
     assert resp.status_code == 200
@@ -75,7 +96,7 @@ async def test_get_last_price(client, db_session):
 async def test_get_last_price_not_found(client):
     resp = await client.get(
         "/api/v1/prices/last",
-        params={"ticker": Ticker.BTC_USD.value},
+        params={"ticker": "btc_usd"},
     )
 
     assert resp.status_code == 404
@@ -88,7 +109,7 @@ async def test_get_last_price_at_time(client, db_session):
     resp = await client.get(
         "/api/v1/prices/lastAtTime",
         params={
-            "ticker": Ticker.BTC_USD.value,
+            "ticker": "btc_usd",
             "ts": 1500,
         },
     )
@@ -104,9 +125,403 @@ async def test_get_last_price_at_time_not_found(client):
     resp = await client.get(
         "/api/v1/prices/lastAtTime",
         params={
-            "ticker": Ticker.BTC_USD.value,
+            "ticker": "btc_usd",
             "ts": 1000,
         },
     )
 
     assert resp.status_code == 404
+
+
+async def test_get_last_price_is_cached(client, db_session):
+    await _seed_prices(db_session)
+    hits, misses = price_cache.hits, price_cache.misses
+
+    first = await client.get(
+        "/api/v1/prices/last",
+        params={"ticker": "btc_usd"},
+    )
+    second = await client.get(
+        "/api/v1/prices/last",
+        params={"ticker": "btc_usd"},
+    )
+    at_time = await client.get(
+        "/api/v1/prices/lastAtTime",
+        params={
+            "ticker": "btc_usd",
+            "ts": 3000,
+        },
+    )
+
+    assert first.json() == second.json() == at_time.json()
+    assert price_cache.hits - hits == 2
+    assert price_cache.misses - misses == 1
+
+    resp = await client.get("/api/v1/prices/cache")
+
+    assert resp.status_code == 200
+    assert resp.json()["hits"] == price_cache.hits
+
+
+async def test_get_prices_page(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/page",
+        params={"ticker": "btc_usd", "limit": 1},
+    )
+
+    assert resp.status_code == 200
+
+    data = resp.json()
+
+    assert [p["captured_ts_ms"] for p in data["items"]] == [2000]
+    assert data["next_cursor"] == 2000
+
+    resp = await client.get(
+        "/api/v1/prices/page",
+        params={
+            "ticker": "btc_usd",
+            "limit": 1,
+            "cursor": data["next_cursor"],
+        },
+    )
+
+    data = resp.json()
+
+    assert [p["captured_ts_ms"] for p in data["items"]] == [1000]
+    assert data["next_cursor"] == 1000
+
+    resp = await client.get(
+        "/api/v1/prices/page",
+        params={
+            "ticker": "btc_usd",
+            "limit": 1,
+            "cursor": data["next_cursor"],
+        },
+    )
+
+    assert resp.json() == {"items": [], "next_cursor": None}
+
+
+async def test_stream_prices_ndjson(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/stream",
+        params={"ticker": "btc_usd", "from_ts": 1500},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.text == '{"price": 51000.0, "captured_ts_ms": 2000}\n'
+
+
+async def test_stream_prices_csv(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/stream",
+        params={"ticker": "btc_usd", "format": "csv"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.text.splitlines() == [
+        "captured_ts_ms,price",
+        "2000,51000.0",
+        "1000,50000.0",
+    ]
+
+
+async def test_get_ohlc(client, db_session):
+    await create_prices(
+        db_session,
+        [
+            PriceFull(ticker="btc_usd", price=100, captured_ts_ms=60_000),
+            PriceFull(ticker="btc_usd", price=120, captured_ts_ms=70_000),
+            PriceFull(ticker="btc_usd", price=90, captured_ts_ms=80_000),
+            PriceFull(ticker="btc_usd", price=110, captured_ts_ms=130_000),
+        ],
+    )
+    # Late arrival merges into the existing rollup.
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=95, captured_ts_ms=65_000)],
+    )
+
+    resp = await client.get(
+        "/api/v1/prices/ohlc",
+        params={"ticker": "btc_usd", "interval": "1m"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.json() == [
+        {
+            "bucket_ts_ms": 60_000,
+            "open": 100,
+            "high": 120,
+            "low": 90,
+            "close": 90,
+            "count": 4,
+        },
+        {
+            "bucket_ts_ms": 120_000,
+            "open": 110,
+            "high": 110,
+            "low": 110,
+            "close": 110,
+            "count": 1,
+        },
+    ]
+
+    resp = await client.get(
+        "/api/v1/prices/ohlc",
+        params={
+            "ticker": "btc_usd",
+            "interval": "5m",
+            "from": 100_000,
+            "to": 200_000,
+        },
+    )
+
+    data = resp.json()
+
+    assert len(data) == 1
+    assert data[0]["bucket_ts_ms"] == 0
+    assert data[0]["count"] == 5
+
+
+async def test_create_prices_without_returning(db_session):
+    prices = [
+        PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=ts)
+        for ts in (1000, 2000)
+    ]
+    assert await create_prices(db_session, prices[:1], returning=False) == 1
+    assert await create_prices(db_session, prices, returning=False) == 1
+    assert await create_prices(db_session, [], returning=False) == 0
+
+    counts = list(await db_session.scalars(select(PriceOhlc.count)))
+    assert counts and all(count == 2 for count in counts)
+
+
+async def test_unknown_ticker_is_rejected(client):
+    resp = await client.get(
+        "/api/v1/prices/last",
+        params={"ticker": "doge_usd"},
+    )
+
+    assert resp.status_code == 422
+
+
+async def test_metrics_endpoint(client, db_session):
+    await _seed_prices(db_session)
+    await client.get("/api/v1/prices/last", params={"ticker": "btc_usd"})
+
+    resp = await client.get("/metrics")
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/api/v1/prices/last",status="200"}'
+    ) in resp.text
+    assert 'prices_last_captured_timestamp_seconds{ticker="btc_usd"} 2.0' in resp.text
+
+
+async def test_export_prices_arrow(client, db_session):
+    pa = pytest.importorskip("pyarrow")
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/export",
+        params={"ticker": "btc_usd", "format": "arrow"},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/vnd.apache.arrow.file"
+    table = pa.ipc.open_file(pa.BufferReader(resp.content)).read_all()
+    assert table.column_names == ["captured_ts_ms", "price"]
+    assert table.to_pydict() == {
+        "captured_ts_ms": [1000, 2000],
+        "price": [50000.0, 51000.0],
+    }
+
+
+async def test_export_prices_parquet(client, db_session):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/export",
+        params={"ticker": "btc_usd", "format": "parquet", "to_ts": 1500},
+    )
+
+    assert resp.status_code == 200
+    table = pq.read_table(pa.BufferReader(resp.content))
+    assert table.to_pydict() == {"captured_ts_ms": [1000], "price": [50000.0]}
+
+
+async def test_get_stats(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/stats",
+        params={"ticker": "btc_usd", "from": 0, "to": 10_000, "interval": "1m"},
+    )
+
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 2
+    assert data["return"] == pytest.approx(0.02)
+    assert data["volatility"] is None
+
+
+async def test_get_stats_not_found(client):
+    resp = await client.get("/api/v1/prices/stats", params={"ticker": "btc_usd"})
+
+    assert resp.status_code == 404
+
+
+async def test_get_stats_rejects_unbounded_window(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/stats", params={"ticker": "btc_usd", "from": 0}
+    )
+
+    assert resp.status_code == 422
+
+
+async def test_get_last_prices_at_times(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.post(
+        "/api/v1/prices/lastAtTime/batch",
+        json={
+            "ticker": ["btc_usd", "eth_usd", "btc_usd", "eth_usd", "btc_usd"],
+            "ts": [2500, 1600, 500, 1400, 1500],
+        },
+    )
+
+    assert resp.status_code == 200
+    assert resp.json()["items"] == [
+        {"ticker": "btc_usd", "price": 51000.0, "captured_ts_ms": 2000},
+        {"ticker": "eth_usd", "price": 2000.0, "captured_ts_ms": 1500},
+        None,
+        None,
+        {"ticker": "btc_usd", "price": 50000.0, "captured_ts_ms": 1000},
+    ]
+
+
+async def test_get_last_prices_at_times_single_ticker(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.post(
+        "/api/v1/prices/lastAtTime/batch",
+        json={"ticker": "btc_usd", "ts": [1000, 3000, 1000]},
+    )
+
+    assert resp.status_code == 200
+    assert [item["captured_ts_ms"] for item in resp.json()["items"]] == [
+        1000,
+        2000,
+        1000,
+    ]
+
+
+async def test_get_last_prices_at_times_rejects_mismatched_lengths(client):
+    resp = await client.post(
+        "/api/v1/prices/lastAtTime/batch",
+        json={"ticker": ["btc_usd"], "ts": [1000, 2000]},
+    )
+
+    assert resp.status_code == 422
+
+
+async def test_prices_support_conditional_requests(client, db_session):
+    await _seed_prices(db_session)
+
+    first = await client.get("/api/v1/prices/all", params={"ticker": "btc_usd"})
+    etag = first.headers["etag"]
+    assert etag == '"btc_usd-v1"'
+    assert "last-modified" in first.headers
+    assert first.headers["cache-control"].startswith("public, max-age=")
+
+    cached = await client.get(
+        "/api/v1/prices/all",
+        params={"ticker": "btc_usd"},
+        headers={"If-None-Match": etag},
+    )
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    since = await client.get(
+        "/api/v1/prices/ohlc",
+        params={"ticker": "btc_usd", "interval": "1m"},
+        headers={"If-Modified-Since": first.headers["last-modified"]},
+    )
+    assert since.status_code == 304
+
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=52000, captured_ts_ms=3000)],
+    )
+    price_cache.clear()
+    changed = await client.get(
+        "/api/v1/prices/page",
+        params={"ticker": "btc_usd"},
+        headers={"If-None-Match": etag},
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] == '"btc_usd-v2"'
+
+
+async def test_backfilled_prices_change_the_etag(client, db_session):
+    await _seed_prices(db_session)
+    first = await client.get("/api/v1/prices/all", params={"ticker": "btc_usd"})
+
+    # Older than the newest price, so only the write generation notices.
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=49000, captured_ts_ms=500)],
+    )
+    price_cache.clear()
+    resp = await client.get(
+        "/api/v1/prices/all",
+        params={"ticker": "btc_usd"},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+
+    assert resp.status_code == 200
+    assert resp.headers["etag"] == '"btc_usd-v2"'
+    assert len(resp.json()) == 3
+
+
+async def test_last_at_time_is_versioned_by_the_price_returned(client, db_session):
+    await _seed_prices(db_session)
+
+    resp = await client.get(
+        "/api/v1/prices/lastAtTime", params={"ticker": "btc_usd", "ts": 1500}
+    )
+
+    assert resp.headers["etag"] == '"btc_usd-1000"'
+    assert resp.headers["cache-control"] == (
+        f"public, max-age={settings.settled_max_age_s}"
+    )
+
+
+async def test_last_at_time_near_now_is_revalidated(client, db_session):
+    now_ms = int(time.time() * 1000)
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=now_ms)],
+    )
+
+    resp = await client.get(
+        "/api/v1/prices/lastAtTime", params={"ticker": "btc_usd", "ts": now_ms}
+    )
+
+    max_age = int(resp.headers["cache-control"].removeprefix("public, max-age="))
+    assert max_age <= settings.collect_interval_s
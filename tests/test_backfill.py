@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import select
+
+from src.deribit.client import DeribitClient, DeribitClientConfig
+from src.models import Price, db_helper
+from src.config import settings
+from src.worker import backfill
+from src.worker.backfill import BackfillCheckpoint, _parse_args, backfill_prices
+
+pytestmark = pytest.mark.anyio
+
+MINUTE_MS = 60_000
+
+
+@pytest.fixture
+async def fake_deribit():
+    now_ms = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+    requests = []
+
+    async def get_index_chart_data(request):
+        requests.append(dict(request.query))
+        base = 1000 if request.query["index_name"] == "btc_usd" else 10
+        points = [[now_ms - i * MINUTE_MS, base + i] for i in range(10)]
+        return web.json_response({"jsonrpc": "2.0", "result": points})
+
+    app = web.Application()
+    app.router.add_get("/api/v2/public/get_index_chart_data", get_index_chart_data)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/")), now_ms, requests
+    await server.close()
+
+
+async def test_backfill_resumes_from_checkpoint(fake_deribit, db_session, tmp_path):
+    base_url, now_ms, requests = fake_deribit
+    from_ts = now_ms - 5 * MINUTE_MS
+    checkpoint = BackfillCheckpoint(tmp_path / "checkpoint.json")
+    checkpoint.set("eth_usd", now_ms - 2 * MINUTE_MS)
+
+    async with DeribitClient(DeribitClientConfig(base_url=base_url)) as client:
+        stats = await backfill_prices(
+            client,
+            db_helper.session_factory,
+            ("btc_usd", "eth_usd"),
+            from_ts,
+            now_ms,
+            checkpoint=checkpoint,
+            chunk_size=4,
+        )
+
+    assert {r["range"] for r in requests} == {"1h"}
+    assert stats.rows_written == 6 + 2
+
+    btc = list(
+        await db_session.scalars(
+            select(Price.captured_ts_ms)
+            .where(Price.ticker == "btc_usd")
+            .order_by(Price.captured_ts_ms)
+        )
+    )
+    eth = list(
+        await db_session.scalars(
+            select(Price.captured_ts_ms).where(Price.ticker == "eth_usd")
+        )
+    )
+    assert btc == [from_ts + i * MINUTE_MS for i in range(6)]
+    assert sorted(eth) == [now_ms - MINUTE_MS, now_ms]
+
+    resumed = BackfillCheckpoint(tmp_path / "checkpoint.json")
+    assert resumed.get("btc_usd") == now_ms
+    assert resumed.get("eth_usd") == now_ms
+
+
+async def test_backfill_counts_only_inserted_rows(fake_deribit, db_session):
+    base_url, now_ms, requests = fake_deribit
+    from_ts = now_ms - 5 * MINUTE_MS
+
+    async with DeribitClient(DeribitClientConfig(base_url=base_url)) as client:
+        first = await backfill_prices(
+            client, db_helper.session_factory, ("btc_usd",), from_ts, now_ms
+        )
+        again = await backfill_prices(
+            client, db_helper.session_factory, ("btc_usd",), from_ts, now_ms
+        )
+
+    assert (first.rows_fetched, first.rows_written) == (6, 6)
+    assert (again.rows_fetched, again.rows_written) == (6, 0)
+
+
+async def test_rerun_without_to_resumes_the_interrupted_run(
+    fake_deribit, db_session, tmp_path, monkeypatch
+):
+    base_url, now_ms, _ = fake_deribit
+    from_ts = now_ms - 5 * MINUTE_MS
+    monkeypatch.setattr(settings, "backfill_checkpoint_dir", str(tmp_path))
+    monkeypatch.setattr(
+        backfill,
+        "DeribitClient",
+        lambda: DeribitClient(DeribitClientConfig(base_url=base_url)),
+    )
+    create_prices = backfill.create_prices
+    calls = 0
+
+    async def _crash_on_second_chunk(**kwargs):
+        nonlocal calls
+        calls += 1
+        if calls == 2:
+            raise ConnectionError("database went away")
+        return await create_prices(**kwargs)
+
+    argv = ["--from", str(from_ts), "--ticker", "btc_usd", "--chunk-size", "4"]
+    monkeypatch.setattr(backfill, "create_prices", _crash_on_second_chunk)
+    with pytest.raises(ConnectionError):
+        await backfill._main(_parse_args(argv))
+    (path,) = tmp_path.iterdir()
+    stored = json.loads(path.read_text())
+
+    await asyncio.sleep(0.002)
+    monkeypatch.setattr(backfill, "create_prices", create_prices)
+    await backfill._main(_parse_args(argv))
+
+    assert list(tmp_path.iterdir()) == [path]
+    resumed = json.loads(path.read_text())
+    assert resumed["to_ts"] == stored["to_ts"]
+    assert resumed["positions"]["btc_usd"] == now_ms
+    rows = list(
+        await db_session.scalars(
+            select(Price.captured_ts_ms).where(Price.ticker == "btc_usd")
+        )
+    )
+    assert sorted(rows) == [from_ts + i * MINUTE_MS for i in range(6)]
@@ -0,0 +1,35 @@
+import json
+
+import pytest
+
+from benchmarks.common import Case, report, summarize
+from benchmarks.compare import compare
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_summarize_percentiles():
+    summary = summarize(i / 1000 for i in range(1, 101))
+
+    assert summary["count"] == 100
+    assert summary["min"] == 1
+    assert summary["max"] == 100
+    assert summary["p50"] == pytest.approx(50.5)
+    assert summary["p99"] == pytest.approx(99.01)
+
+
+async def test_compare_reports_relative_change(tmp_path):
+    def write(name, p50):
+        case = Case(
+            name="create_prices",
+            params={"batch_size": 100},
+            latency_ms={"p50": p50, "p95": p50, "p99": p50},
+        )
+        path = tmp_path / name
+        path.write_text(json.dumps(report("crud", [case])))
+        return path
+
+    rows = compare(write("before.json", 10.0), write("after.json", 12.0))
+
+    assert [row["case"] for row in rows] == ["crud:create_prices[batch_size=100]"]
+    assert rows[0]["p50"]["change"] == pytest.approx(0.2)
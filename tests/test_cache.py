@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.domain.schemas.price import PriceFull
+from src.prices.cache import LastPriceCache
+from src.prices.crud import create_prices
+from src.prices.notifications import PriceListener, decode_prices, encode_prices
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_listener_updates_cache_on_insert(db_session):
+    cache = LastPriceCache(ttl_s=60)
+    updated = asyncio.Event()
+
+    def _on_prices(prices):
+        cache.update(prices)
+        updated.set()
+
+    listener = PriceListener(settings.db_dsn)
+    listener.add_handler(_on_prices)
+    listener.add_reset_handler(cache.clear)
+    task = asyncio.create_task(listener.run())
+
+    try:
+        await asyncio.wait_for(listener.listening.wait(), timeout=5)
+        await create_prices(
+            db_session,
+            [
+                PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=1000),
+                PriceFull(ticker="btc_usd", price=51000, captured_ts_ms=2000),
+            ],
+        )
+        await asyncio.wait_for(updated.wait(), timeout=5)
+
+        cached = cache.get("btc_usd")
+        assert cached == PriceFull(ticker="btc_usd", price=51000, captured_ts_ms=2000)
+        assert cache.get_at("btc_usd", 1500) is None
+        assert cache.get_at("btc_usd", 2500) == cached
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert cache.get("btc_usd") is None
+
+
+async def test_cache_entries_expire():
+    cache = LastPriceCache(ttl_s=0)
+    cache.update([PriceFull(ticker="eth_usd", price=2000, captured_ts_ms=1)])
+
+    await asyncio.sleep(0.01)
+
+    assert cache.get("eth_usd") is None
+    assert cache.stats()["misses"] == 1
+
+
+async def test_large_batches_are_announced_in_several_notifications(db_session):
+    received: list[PriceFull] = []
+    payloads = 0
+    done = asyncio.Event()
+    # ~40 bytes per price, well past the 8000 byte NOTIFY limit.
+    prices = [
+        PriceFull(ticker=f"ticker_{i:04d}_usd", price=1000 + i, captured_ts_ms=1000)
+        for i in range(500)
+    ]
+    assert len(encode_prices(prices)) > 1
+
+    def _on_prices(batch):
+        nonlocal payloads
+        payloads += 1
+        received.extend(batch)
+        if len(received) == len(prices):
+            done.set()
+
+    listener = PriceListener(settings.db_dsn)
+    listener.add_handler(_on_prices)
+    task = asyncio.create_task(listener.run())
+    try:
+        await asyncio.wait_for(listener.listening.wait(), timeout=5)
+        assert await create_prices(db_session, prices, returning=False) == 500
+        await asyncio.wait_for(done.wait(), timeout=5)
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    assert payloads > 1
+    assert sorted(received, key=lambda p: p.ticker) == prices
+
+
+async def test_price_payloads_stay_under_the_limit():
+    prices = [PriceFull(ticker=f"t{i}", price=i, captured_ts_ms=i) for i in range(1000)]
+
+    payloads = encode_prices(prices, max_bytes=500)
+
+    assert all(len(p.encode()) <= 500 for p in payloads)
+    assert [p for payload in payloads for p in decode_prices(payload)] == prices
@@ -0,0 +1,43 @@
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+
+from src.config import settings
+from src.models.db_helper import DatabaseHelper, PoolConfig
+
+pytestmark = pytest.mark.anyio
+
+
+def _sample(name: str, engine: str) -> float:
+    return REGISTRY.get_sample_value(name, {"engine": engine}) or 0.0
+
+
+async def test_reads_use_a_separate_pool():
+    # The test database stands in for the replica.
+    helper = DatabaseHelper(
+        settings.db_url,
+        read_url=settings.db_url,
+        pool=PoolConfig(size=2, max_overflow=1, statement_cache_size=0),
+    )
+    try:
+        assert helper.read_engine is not helper.engine
+        assert len(helper.engines) == 2
+        capacity = _sample("db_pool_capacity", "reader")
+        assert capacity >= 3
+
+        async with helper.read_session_factory() as session:
+            assert await session.scalar(text("SELECT 1")) == 1
+            assert _sample("db_pool_checked_out", "reader") == 1
+        assert _sample("db_pool_checked_out", "reader") == 0
+        assert helper.engine.pool.checkedout() == 0
+    finally:
+        await helper.dispose()
+
+
+async def test_reads_share_the_writer_without_replica():
+    helper = DatabaseHelper(settings.db_url)
+    try:
+        assert helper.read_engine is helper.engine
+        assert helper.read_session_factory.kw["bind"] is helper.engine
+    finally:
+        await helper.dispose()
@@ -0,0 +1,275 @@
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from prometheus_client import REGISTRY
+
+from src.deribit.client import (
+    DeribitBadResponse,
+    DeribitCircuitOpen,
+    DeribitClient,
+    DeribitClientConfig,
+    DeribitUnavailable,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def fake_deribit():
+    responses = []
+    calls = []
+
+    async def get_index_price(request):
+        calls.append(time.monotonic())
+        if request.query["index_name"] == "eth_usd":
+            return web.Response(status=400, text="unknown index")
+        status, headers = responses.pop(0) if responses else (200, {})
+        if status != 200:
+            return web.Response(status=status, headers=headers)
+        return web.json_response({"jsonrpc": "2.0", "result": {"index_price": 50000.5}})
+
+    app = web.Application()
+    app.router.add_get("/api/v2/public/get_index_price", get_index_price)
+    server = TestServer(app)
+    await server.start_server()
+    yield str(server.make_url("/")), responses, calls
+    await server.close()
+
+
+async def test_retries_after_rate_limit_honouring_retry_after(fake_deribit):
+    base_url, responses, calls = fake_deribit
+    responses.append((429, {"Retry-After": "0.2"}))
+    config = DeribitClientConfig(base_url=base_url)
+
+    async with DeribitClient(config) as client:
+        price = await client.get_index_price("btc_usd")
+
+    assert price.price == 50000.5
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+async def test_requests_and_errors_are_measured(fake_deribit):
+    base_url, responses, calls = fake_deribit
+    responses.append((503, {}))
+    endpoint = "/api/v2/public/get_index_price"
+    errors = _sample(
+        "deribit_errors_total", endpoint=endpoint, error="DeribitUnavailable"
+    )
+    ok = _sample(
+        "deribit_request_duration_seconds_count", endpoint=endpoint, status="200"
+    )
+    config = DeribitClientConfig(base_url=base_url, retry_backoff_s=0.001)
+
+    async with DeribitClient(config) as client:
+        await client.get_index_price("btc_usd")
+
+    assert (
+        _sample("deribit_errors_total", endpoint=endpoint, error="DeribitUnavailable")
+        == errors + 1
+    )
+    assert (
+        _sample(
+            "deribit_request_duration_seconds_count", endpoint=endpoint, status="200"
+        )
+        == ok + 1
+    )
+
+
+async def test_retry_budget_limits_retries(fake_deribit):
+    base_url, responses, calls = fake_deribit
+    responses.extend([(503, {})] * 10)
+    config = DeribitClientConfig(
+        base_url=base_url,
+        max_retries=5,
+        retry_backoff_s=0.001,
+        retry_budget_min=2,
+        retry_budget_ratio=0,
+    )
+
+    async with DeribitClient(config) as client:
+        with pytest.raises(DeribitUnavailable):
+            await client.get_index_price("btc_usd")
+
+    assert len(calls) == 3
+
+
+async def test_circuit_breaker_fails_fast(fake_deribit):
+    base_url, responses, calls = fake_deribit
+    responses.extend([(503, {})] * 2)
+    config = DeribitClientConfig(
+        base_url=base_url,
+        max_retries=0,
+        breaker_failure_threshold=2,
+        breaker_reset_timeout_s=0.1,
+    )
+
+    async with DeribitClient(config) as client:
+        for _ in range(2):
+            with pytest.raises(DeribitUnavailable):
+                await client.get_index_price("btc_usd")
+        with pytest.raises(DeribitCircuitOpen):
+            await client.get_index_price("btc_usd")
+
+        assert len(calls) == 2
+
+        await asyncio.sleep(0.1)
+        price = await client.get_index_price("btc_usd")
+
+    assert price.price == 50000.5
+    assert len(calls) == 3
+
+
+async def test_cancelled_probe_does_not_keep_breaker_open():
+    statuses = [503, "slow"]
+
+    async def get_index_price(request):
+        status = statuses.pop(0) if statuses else 200
+        if status == "slow":
+            await asyncio.sleep(5)
+        elif status != 200:
+            return web.Response(status=status)
+        return web.json_response({"jsonrpc": "2.0", "result": {"index_price": 1.0}})
+
+    app = web.Application()
+    app.router.add_get("/api/v2/public/get_index_price", get_index_price)
+    server = TestServer(app)
+    await server.start_server()
+    config = DeribitClientConfig(
+        base_url=str(server.make_url("/")),
+        max_retries=0,
+        breaker_failure_threshold=1,
+        breaker_reset_timeout_s=0.05,
+    )
+
+    try:
+        async with DeribitClient(config) as client:
+            with pytest.raises(DeribitUnavailable):
+                await client.get_index_price("btc_usd")
+            await asyncio.sleep(0.05)
+
+            # The half-open probe is cancelled by the batch deadline.
+            batch = await client.get_index_prices_batch(["btc_usd"], deadline_s=0.1)
+            assert isinstance(batch.failures["btc_usd"], DeribitUnavailable)
+
+            price = await client.get_index_price("btc_usd")
+    finally:
+        await server.close()
+
+    assert price.price == 1.0
+
+
+async def test_cancelled_request_does_not_release_anothers_probe():
+    async def get_index_price(request):
+        index_name = request.query["index_name"]
+        if index_name == "down":
+            return web.Response(status=503)
+        if index_name == "slow":
+            await asyncio.sleep(5)
+        return web.json_response({"jsonrpc": "2.0", "result": {"index_price": 1.0}})
+
+    app = web.Application()
+    app.router.add_get("/api/v2/public/get_index_price", get_index_price)
+    server = TestServer(app)
+    await server.start_server()
+    config = DeribitClientConfig(
+        base_url=str(server.make_url("/")),
+        max_retries=0,
+        breaker_failure_threshold=1,
+        breaker_reset_timeout_s=0.05,
+    )
+
+    try:
+        async with DeribitClient(config) as client:
+            # Admitted while the circuit was still closed.
+            straggler = asyncio.ensure_future(client.get_index_price("slow"))
+            await asyncio.sleep(0.02)
+            with pytest.raises(DeribitUnavailable):
+                await client.get_index_price("down")
+            await asyncio.sleep(0.05)
+
+            probe = asyncio.ensure_future(client.get_index_price("slow"))
+            await asyncio.sleep(0.02)
+            straggler.cancel()
+            await asyncio.gather(straggler, return_exceptions=True)
+
+            # The probe is still in flight, so nobody else may probe.
+            with pytest.raises(DeribitCircuitOpen):
+                await client.get_index_price("btc_usd")
+
+            probe.cancel()
+            await asyncio.gather(probe, return_exceptions=True)
+    finally:
+        await server.close()
+
+
+async def test_batch_keeps_successes_and_reports_failures(fake_deribit):
+    base_url, responses, calls = fake_deribit
+    config = DeribitClientConfig(base_url=base_url)
+
+    async with DeribitClient(config) as client:
+        batch = await client.get_index_prices_batch(
+            ["btc_usd", "eth_usd"], deadline_s=5
+        )
+
+    assert [p.ticker for p in batch.prices] == ["btc_usd"]
+    assert list(batch.failures) == ["eth_usd"]
+    assert isinstance(batch.failures["eth_usd"], DeribitBadResponse)
+
+
+async def test_batch_deadline_reports_pending_tickers(fake_deribit):
+    base_url, responses, calls = fake_deribit
+    responses.append((429, {"Retry-After": "5"}))
+    config = DeribitClientConfig(base_url=base_url)
+
+    async with DeribitClient(config) as client:
+        batch = await client.get_index_prices_batch(["btc_usd"], deadline_s=0.2)
+
+    assert batch.prices == []
+    assert isinstance(batch.failures["btc_usd"], DeribitUnavailable)
+
+
+async def test_capture_ts_uses_exchange_time_and_bucket():
+    async def get_index_price(request):
+        return web.json_response(
+            {
+                "jsonrpc": "2.0",
+                "result": {"index_price": 1.0},
+                "usIn": 1_700_000_061_234_000,
+                "usOut": 1_700_000_061_236_000,
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/api/v2/public/get_index_price", get_index_price)
+    server = TestServer(app)
+    await server.start_server()
+    base_url = str(server.make_url("/"))
+    try:
+        async with DeribitClient(DeribitClientConfig(base_url=base_url)) as client:
+            exact = await client.get_index_price("btc_usd")
+        config = DeribitClientConfig(base_url=base_url, capture_bucket_ms=60_000)
+        async with DeribitClient(config) as client:
+            prices = await client.get_index_prices(["btc_usd", "sol_usd"])
+    finally:
+        await server.close()
+
+    assert exact.captured_ts_ms == 1_700_000_061_235
+    assert {p.captured_ts_ms for p in prices} == {1_700_000_040_000}
+
+
+async def test_capture_ts_falls_back_to_local_clock(fake_deribit):
+    base_url, responses, calls = fake_deribit
+
+    before = int(time.time() * 1000)
+    async with DeribitClient(DeribitClientConfig(base_url=base_url)) as client:
+        price = await client.get_index_price("btc_usd")
+
+    assert before - 50 <= price.captured_ts_ms <= int(time.time() * 1000) + 50
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from src.api_v1.prices.live import _encode_events
+from src.config import settings
+from src.domain.schemas.price import PriceFull
+from src.main import app
+from src.prices.feed import FeedFull, PriceFeed, price_feed
+
+pytestmark = pytest.mark.anyio
+
+
+def _price(ticker: str, ts: int) -> PriceFull:
+    return PriceFull(ticker=ticker, price=1.5, captured_ts_ms=ts)
+
+
+async def test_feed_fans_out_and_filters_tickers():
+    feed = PriceFeed(buffer_size=10, max_subscribers=2)
+    everything = feed.subscribe()
+    eth_only = feed.subscribe(["eth_usd"])
+
+    feed.publish([_price("btc_usd", 1), _price("eth_usd", 2)])
+
+    assert len(await everything.get(timeout=1)) == 2
+    assert await eth_only.get(timeout=1) == [_price("eth_usd", 2).model_dump_json()]
+    with pytest.raises(FeedFull):
+        feed.subscribe()
+
+    with everything:
+        pass
+    assert len(feed) == 1
+
+
+async def test_slow_subscriber_drops_oldest():
+    feed = PriceFeed(buffer_size=2, max_subscribers=10)
+    subscription = feed.subscribe()
+
+    feed.publish([_price("btc_usd", ts) for ts in (1, 2, 3)])
+
+    messages = await subscription.get(timeout=1)
+    assert [PriceFull.model_validate_json(m).captured_ts_ms for m in messages] == [
+        2,
+        3,
+    ]
+    assert subscription.dropped == 1
+    assert await subscription.get(timeout=0.01) == []
+
+
+async def test_sse_events_and_keepalive(monkeypatch):
+    monkeypatch.setattr(settings, "price_feed_heartbeat_s", 0.01)
+    feed = PriceFeed(buffer_size=10, max_subscribers=10)
+    events = _encode_events(feed.subscribe())
+
+    assert await anext(events) == ": keepalive\n\n"
+    feed.publish([_price("btc_usd", 1)])
+    assert await anext(events) == (
+        f"event: price\ndata: {_price('btc_usd', 1).model_dump_json()}\n\n"
+    )
+
+    await events.aclose()
+    assert len(feed) == 0
+
+
+async def test_sse_releases_subscription_when_client_is_gone():
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v1/prices/live",
+        "raw_path": b"/api/v1/prices/live",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+    }
+
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        # The connection drops before the first chunk is written.
+        raise OSError("connection reset")
+
+    with pytest.raises(OSError):
+        await app(scope, receive, send)
+    assert len(price_feed) == 0
+
+
+async def test_websocket_receives_published_prices():
+    incoming: asyncio.Queue[dict] = asyncio.Queue()
+    outgoing: asyncio.Queue[dict] = asyncio.Queue()
+    scope = {
+        "type": "websocket",
+        "asgi": {"version": "3.0"},
+        "scheme": "ws",
+        "path": "/api/v1/prices/ws",
+        "raw_path": b"/api/v1/prices/ws",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "server": ("test", 80),
+        "client": ("test", 1234),
+        "subprotocols": [],
+    }
+    incoming.put_nowait({"type": "websocket.connect"})
+    task = asyncio.create_task(app(scope, incoming.get, outgoing.put))
+
+    assert (await asyncio.wait_for(outgoing.get(), 5))["type"] == "websocket.accept"
+    assert len(price_feed) == 1
+    price_feed.publish([_price("btc_usd", 1)])
+    message = await asyncio.wait_for(outgoing.get(), 5)
+    assert PriceFull.model_validate_json(message["text"]) == _price("btc_usd", 1)
+
+    incoming.put_nowait({"type": "websocket.disconnect", "code": 1000})
+    await asyncio.wait_for(task, 5)
+    assert len(price_feed) == 0
@@ -0,0 +1,63 @@
+import json
+import logging
+import sys
+
+import pytest
+
+from src.middlewares.request_logging import RequestLogSampler
+from src.utils.logger import JsonFormatter, _listeners, setup_logger
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_json_formatter_keeps_extra_fields_and_traceback():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("test").makeRecord(
+            "test",
+            logging.ERROR,
+            "views.py",
+            10,
+            "GET %s failed",
+            ("/prices",),
+            exc_info=sys.exc_info(),
+            extra={"status": 500, "duration_ms": 1.5},
+        )
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "GET /prices failed"
+    assert payload["level"] == "ERROR"
+    assert payload["status"] == 500
+    assert payload["duration_ms"] == 1.5
+    assert "ValueError: boom" in payload["exc_info"]
+
+
+async def test_queue_logger_writes_from_background_thread(capsys):
+    log = setup_logger(
+        "test-queue", log_to_file=False, log_format="json", use_queue=True
+    )
+    listener = _listeners.pop()
+
+    log.info("price %s stored", "btc_usd", extra={"ticker": "btc_usd"})
+    listener.stop()
+
+    payload = json.loads(capsys.readouterr().out)
+    assert payload["message"] == "price btc_usd stored"
+    assert payload["ticker"] == "btc_usd"
+
+
+async def test_sampler_keeps_errors_and_slow_requests():
+    now = [10.0]
+    sampler = RequestLogSampler(
+        per_s=2, sample_rate=0, slow_ms=100, clock=lambda: now[0]
+    )
+
+    assert [sampler.should_log(200, 1) for _ in range(3)] == [True, True, False]
+    assert sampler.should_log(500, 1)
+    assert sampler.should_log(200, 150)
+    assert sampler.skipped == 1
+
+    now[0] = 11.0
+    assert sampler.should_log(200, 1)
@@ -0,0 +1,57 @@
+import pytest
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api_v1.routing import TimedRoute
+from src.middlewares import RequestLoggingMiddleware
+from src.models import db_helper
+
+pytestmark = pytest.mark.anyio
+
+
+def _app(server_timing: bool) -> FastAPI:
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item(
+        item_id: int,
+        session: AsyncSession = Depends(db_helper.session_dependency),
+    ):
+        value = await session.scalar(text("SELECT CAST(:v AS integer)"), {"v": item_id})
+        return {"item_id": value}
+
+    @router.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.add_middleware(RequestLoggingMiddleware, server_timing=server_timing)
+    return app
+
+
+async def test_server_timing_breakdown():
+    transport = ASGITransport(app=_app(server_timing=True))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/items/7")
+
+    assert resp.json() == {"item_id": 7}
+    phases = [m.split(";")[0] for m in resp.headers["server-timing"].split(", ")]
+    assert phases == ["deps", "endpoint", "serialize", "db", "pool", "total"]
+    assert 'desc="1 queries"' in resp.headers["server-timing"]
+
+
+async def test_streaming_passes_through_without_server_timing():
+    transport = ASGITransport(app=_app(server_timing=False))
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        resp = await client.get("/api/stream")
+
+    assert resp.text == "0\n1\n2\n"
+    assert "server-timing" not in resp.headers
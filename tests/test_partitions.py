@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import select, text
+
+from src.domain.schemas.price import PriceFull
+from src.models import Price
+from src.prices.crud import create_prices
+from src.prices.partitions import (
+    apply_retention,
+    ensure_partitions,
+    list_partitions,
+    partition_bounds,
+)
+from src.prices.versions import read_version
+
+pytestmark = pytest.mark.anyio
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+async def test_ensure_partitions_and_retention(db_session):
+    jan_start, _ = partition_bounds(2001, 1)
+    _, feb_end = partition_bounds(2001, 2)
+
+    created = await ensure_partitions(db_session, months_ahead=1, now_ms=jan_start)
+
+    assert created == ["prices_y2001m01", "prices_y2001m02"]
+    assert await ensure_partitions(db_session, months_ahead=1, now_ms=jan_start) == []
+
+    await create_prices(
+        db_session,
+        [
+            PriceFull(ticker="btc_usd", price=1, captured_ts_ms=jan_start),
+            PriceFull(ticker="btc_usd", price=2, captured_ts_ms=feb_end - 1),
+            PriceFull(ticker="btc_usd", price=3, captured_ts_ms=1000),
+        ],
+    )
+
+    removed = await apply_retention(
+        db_session, retention_days=1, drop=True, now_ms=feb_end
+    )
+
+    assert removed == ["prices_y2001m01"]
+    assert "prices_y2001m01" not in await list_partitions(db_session)
+
+    rows = list(await db_session.scalars(select(Price.captured_ts_ms)))
+    assert sorted(rows) == [1000, feb_end - 1]
+    version = await read_version(db_session, "btc_usd")
+    await db_session.refresh(version)
+    assert version.version == 2
+
+    await apply_retention(db_session, retention_days=0, drop=True, now_ms=feb_end)
+
+
+async def test_ensure_partitions_moves_rows_out_of_default(db_session):
+    # Backfilled rows before any partition land in the default partition.
+    await create_prices(
+        db_session,
+        [
+            PriceFull(ticker="btc_usd", price=1, captured_ts_ms=1000),
+            PriceFull(ticker="btc_usd", price=2, captured_ts_ms=2000),
+        ],
+    )
+    jan_start, _ = partition_bounds(1970, 1)
+
+    created = await ensure_partitions(db_session, months_ahead=0, now_ms=jan_start)
+
+    assert created == ["prices_y1970m01"]
+    default_rows = await db_session.scalar(text("SELECT count(*) FROM prices_default"))
+    assert default_rows == 0
+    rows = await db_session.scalars(
+        text("SELECT captured_ts_ms FROM prices_y1970m01 ORDER BY 1")
+    )
+    assert list(rows) == [1000, 2000]
+    # The moved partition has the parent's unique key attached.
+    await create_prices(
+        db_session, [PriceFull(ticker="btc_usd", price=3, captured_ts_ms=1000)]
+    )
+    assert len(list(await db_session.scalars(select(Price.price)))) == 2
+
+    removed = await apply_retention(
+        db_session, retention_days=0, drop=True, now_ms=jan_start + 32 * DAY_MS
+    )
+    assert "prices_y1970m01" in removed
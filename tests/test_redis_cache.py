@@ -0,0 +1,203 @@
+import asyncio
+
+import pytest
+from fakeredis import FakeAsyncRedis, FakeServer
+from sqlalchemy import event
+
+from src.config import settings
+from src.domain.schemas.price import PriceFull, PriceRead
+from src.models import db_helper
+from src.prices import redis_cache
+from src.prices.crud import create_prices, read_last_price
+from src.prices.redis_cache import RedisPriceCache, decode_points, encode_points
+
+pytestmark = pytest.mark.anyio
+
+
+def _points(*ts: int) -> list[PriceRead]:
+    return [PriceRead(price=t / 10, captured_ts_ms=t) for t in ts]
+
+
+class _Loader:
+    def __init__(self, value, delay_s: float = 0.0) -> None:
+        self.value = value
+        self.delay_s = delay_s
+        self.calls = 0
+        self.sessions = []
+
+    async def __call__(self, session):
+        self.sessions.append(session)
+        self.calls += 1
+        await asyncio.sleep(self.delay_s)
+        return self.value
+
+
+async def _get(cache: RedisPriceCache, loader, name: str = "last"):
+    return await cache.get_or_load(
+        "btc_usd", name, loader, encode_points, decode_points
+    )
+
+
+async def test_points_encoding():
+    assert decode_points(encode_points(_points(1, 2))) == _points(1, 2)
+    assert len(encode_points(_points(1, 2))) == 32
+    assert decode_points(encode_points(None)) is None
+    assert decode_points(encode_points([])) == []
+
+
+async def test_read_through_and_invalidate():
+    cache = RedisPriceCache(FakeAsyncRedis(), ttl_s=60)
+    loader = _Loader(_points(1000))
+
+    assert await _get(cache, loader) == _points(1000)
+    assert await _get(cache, loader) == _points(1000)
+    assert loader.calls == 1
+
+    await cache.invalidate(["btc_usd"])
+    loader.value = _points(2000)
+    assert await _get(cache, loader) == _points(2000)
+    assert loader.calls == 2
+    assert cache.stats()["hits"] == 1
+
+
+async def test_concurrent_misses_load_once():
+    cache = RedisPriceCache(FakeAsyncRedis(), ttl_s=60)
+    loader = _Loader(_points(1000), delay_s=0.05)
+
+    results = await asyncio.gather(*(_get(cache, loader) for _ in range(20)))
+
+    assert loader.calls == 1
+    assert all(result == _points(1000) for result in results)
+
+
+async def test_shared_load_outlives_the_first_caller(db_session):
+    cache = RedisPriceCache(FakeAsyncRedis(), ttl_s=60)
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=1000)],
+    )
+    started = asyncio.Event()
+
+    async def _loader(session):
+        started.set()
+        await asyncio.sleep(0.05)
+        return [await read_last_price(session, "btc_usd")]
+
+    first = asyncio.create_task(_get(cache, _loader))
+    await started.wait()
+    second = asyncio.create_task(_get(cache, _loader))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert [p.captured_ts_ms for p in await second] == [1000]
+
+
+async def test_waits_for_replica_holding_the_lock():
+    server = FakeServer()
+    cache = RedisPriceCache(FakeAsyncRedis(server=server), ttl_s=60)
+    other = FakeAsyncRedis(server=server)
+    await other.set("prices:btc_usd:0:last:lock", b"other", px=5000)
+    loader = _Loader(_points(1))
+
+    async def _other_replica_loads():
+        await asyncio.sleep(0.05)
+        await other.set("prices:btc_usd:0:last", encode_points(_points(1000)))
+
+    result, _ = await asyncio.gather(_get(cache, loader), _other_replica_loads())
+
+    assert result == _points(1000)
+    assert loader.calls == 0
+
+
+async def test_falls_back_to_loader_when_redis_is_down():
+    server = FakeServer()
+    server.connected = False
+    cache = RedisPriceCache(FakeAsyncRedis(server=server), ttl_s=60)
+    loader = _Loader(None)
+
+    assert await _get(cache, loader) is None
+    assert await _get(cache, loader) is None
+    assert loader.calls == 2
+    await cache.invalidate(["btc_usd"])
+
+
+async def test_listener_tracks_generations():
+    server = FakeServer()
+    cache = RedisPriceCache(FakeAsyncRedis(server=server), ttl_s=60)
+    writer = RedisPriceCache(FakeAsyncRedis(server=server), ttl_s=60)
+    task = asyncio.create_task(cache.listen())
+    try:
+        await asyncio.wait_for(cache.listening.wait(), timeout=5)
+        await writer.invalidate(["btc_usd", "eth_usd"])
+        for _ in range(100):
+            if cache._generations:
+                break
+            await asyncio.sleep(0.01)
+        assert cache._generations == {"btc_usd": 1, "eth_usd": 1}
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+async def test_prices_page_goes_through_redis(client, db_session, monkeypatch):
+    shared = RedisPriceCache(FakeAsyncRedis(), ttl_s=60)
+    monkeypatch.setattr(redis_cache, "redis_price_cache", shared)
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=1000)],
+    )
+    params = {"ticker": "btc_usd", "limit": 10}
+
+    first = await client.get("/api/v1/prices/page", params=params)
+    second = await client.get("/api/v1/prices/page", params=params)
+    assert first.json() == second.json()
+    assert shared.stats()["hits"] >= 1
+
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=51000, captured_ts_ms=2000)],
+    )
+    third = await client.get("/api/v1/prices/page", params=params)
+    assert [item["captured_ts_ms"] for item in third.json()["items"]] == [2000, 1000]
+
+    # Older than the newest price, yet still a new generation.
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=49000, captured_ts_ms=500)],
+    )
+    fourth = await client.get("/api/v1/prices/page", params=params)
+    assert [item["captured_ts_ms"] for item in fourth.json()["items"]] == [
+        2000,
+        1000,
+        500,
+    ]
+
+
+async def test_redis_hit_skips_the_database(client, db_session, monkeypatch):
+    shared = RedisPriceCache(FakeAsyncRedis(), ttl_s=60)
+    monkeypatch.setattr(redis_cache, "redis_price_cache", shared)
+    monkeypatch.setattr(settings, "price_cache_enabled", False)
+    await create_prices(
+        db_session,
+        [PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=1000)],
+    )
+    params = {"ticker": "btc_usd"}
+    await client.get("/api/v1/prices/last", params=params)
+
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engines = [engine.sync_engine for engine in db_helper.engines]
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _count)
+    try:
+        resp = await client.get("/api/v1/prices/last", params=params)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", _count)
+
+    assert resp.json()["captured_ts_ms"] == 1000
+    assert shared.stats()["hits"] == 1
+    assert statements == []
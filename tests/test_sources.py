@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from src.config import Settings
+from src.deribit.client import DeribitClient
+from src.domain.schemas.price import PriceFull
+from src.models import Price
+from src.prices import crud
+from src.sources import (
+    COMPOSITE_SOURCE,
+    IndexPricesBatch,
+    PriceCollector,
+    PriceSource,
+    SourceTimeout,
+    composite_prices,
+)
+from src.sources.registry import create_source
+from src.worker import lifecycle, tasks
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeSource:
+    def __init__(self, name: str, price: float, delay_s: float = 0.0, fail=None):
+        self.name = name
+        self._price = price
+        self._delay_s = delay_s
+        self._fail = fail
+
+    async def get_index_prices_batch(self, tickers, deadline_s=None):
+        await asyncio.sleep(self._delay_s)
+        if self._fail is not None:
+            raise self._fail
+        return IndexPricesBatch(
+            prices=[
+                PriceFull(ticker=t, price=self._price, captured_ts_ms=60_000)
+                for t in tickers
+            ]
+        )
+
+
+async def test_deribit_client_is_a_price_source():
+    assert isinstance(DeribitClient(), PriceSource)
+    assert DeribitClient().name == "deribit"
+    async with aiohttp.ClientSession() as session:
+        assert create_source("deribit_testnet", session).name == "deribit_testnet"
+        with pytest.raises(ValueError):
+            create_source("nope", session)
+
+
+async def test_slow_source_does_not_delay_fast_ones():
+    collector = PriceCollector(
+        [FakeSource("slow", 1.0, delay_s=5), FakeSource("fast", 2.0)],
+        default_timeout_s=0.2,
+        grace_s=0.1,
+    )
+    started = time.perf_counter()
+    results = []
+    async for source, batch in collector.collect(["btc_usd"]):
+        results.append((source, batch, time.perf_counter() - started))
+
+    (first, fast, fast_s), (second, slow, slow_s) = results
+    assert (first, second) == ("fast", "slow")
+    assert [p.price for p in fast.prices] == [2.0]
+    assert fast_s < 0.1
+    assert slow.prices == []
+    assert isinstance(slow.failures["btc_usd"], SourceTimeout)
+    assert slow_s < 1
+
+
+async def test_failing_source_is_reported_per_ticker():
+    collector = PriceCollector(
+        [FakeSource("broken", 1.0, fail=RuntimeError("boom")), FakeSource("ok", 2.0)],
+        default_timeout_s=1,
+    )
+    batches = {source: batch async for source, batch in collector.collect(["a", "b"])}
+
+    assert len(batches["ok"].prices) == 2
+    assert set(batches["broken"].failures) == {"a", "b"}
+
+
+async def test_composite_is_the_median_per_ticker_and_time():
+    batches = [
+        IndexPricesBatch(prices=[PriceFull(ticker="a", price=p, captured_ts_ms=1)])
+        for p in (1.0, 5.0, 2.0)
+    ]
+    batches.append(
+        IndexPricesBatch(prices=[PriceFull(ticker="a", price=9.0, captured_ts_ms=2)])
+    )
+
+    assert composite_prices(batches) == [
+        PriceFull(ticker="a", price=2.0, captured_ts_ms=1),
+        PriceFull(ticker="a", price=9.0, captured_ts_ms=2),
+    ]
+
+
+async def test_collection_stores_every_source_and_serves_the_primary(
+    db_session, monkeypatch
+):
+    sources = [FakeSource("deribit", 100.0), FakeSource("deribit_testnet", 110.0)]
+    monkeypatch.setattr(lifecycle, "get_price_sources", lambda names=None: sources)
+
+    batches = await tasks._collect_and_save_prices_async(["btc_usd"], shard=0)
+
+    assert set(batches) == {"deribit", "deribit_testnet"}
+    rows = (await db_session.execute(select(Price.source, Price.price))).all()
+    assert {(source, float(price)) for source, price in rows} == {
+        ("deribit", 100.0),
+        ("deribit_testnet", 110.0),
+        (COMPOSITE_SOURCE, 105.0),
+    }
+    last = await crud.read_last_price(db_session, "btc_usd")
+    assert last.source == "deribit"
+    assert float(last.price) == 100.0
+
+
+@pytest.mark.parametrize(
+    ("price_sources", "primary"),
+    [(["deribit"], COMPOSITE_SOURCE), (["deribit"], "deribit_testnet")],
+)
+async def test_settings_reject_an_unserved_primary_source(price_sources, primary):
+    with pytest.raises(ValidationError):
+        Settings(price_sources=price_sources, primary_price_source=primary)
+
+    Settings(
+        price_sources=["deribit", "deribit_testnet"],
+        primary_price_source=primary,
+    )
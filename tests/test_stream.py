@@ -0,0 +1,187 @@
+import asyncio
+import json
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from sqlalchemy import select
+
+from src.config import settings
+from src.deribit.stream import DeribitStreamCollector, DeribitStreamConfig
+from src.domain.schemas.price import PriceFull
+from src.models import Price, db_helper
+from src.prices.crud import read_last_price
+from src.prices import writer as writer_module
+from src.prices.writer import PriceBatchWriter
+from src.sources import COMPOSITE_SOURCE, DEFAULT_SOURCE
+
+pytestmark = pytest.mark.anyio
+
+
+class FakeDeribitWs:
+    def __init__(self):
+        self.connections = 0
+        self.subscriptions: list[list[str]] = []
+        self.test_replies = 0
+
+    async def handler(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        connection = self.connections
+
+        async for msg in ws:
+            data = json.loads(msg.data)
+            method = data["method"]
+
+            if method == "public/set_heartbeat":
+                await ws.send_json({"jsonrpc": "2.0", "id": data["id"], "result": "ok"})
+            elif method == "public/test":
+                self.test_replies += 1
+            elif method == "public/subscribe":
+                channels = data["params"]["channels"]
+                self.subscriptions.append(channels)
+                await ws.send_json(
+                    {"jsonrpc": "2.0", "id": data["id"], "result": channels}
+                )
+                await ws.send_json(
+                    {
+                        "jsonrpc": "2.0",
+                        "method": "heartbeat",
+                        "params": {"type": "test_request"},
+                    }
+                )
+                for i, channel in enumerate(channels):
+                    index_name = channel.split(".", 1)[1]
+                    await ws.send_json(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "subscription",
+                            "params": {
+                                "channel": channel,
+                                "data": {
+                                    "index_name": index_name,
+                                    "price": 100.5 + i,
+                                    "timestamp": connection * 1000 + i,
+                                },
+                            },
+                        }
+                    )
+                if connection == 1:
+                    await ws.close()
+
+        return ws
+
+
+@pytest.fixture
+async def fake_ws():
+    fake = FakeDeribitWs()
+    app = web.Application()
+    app.router.add_get("/ws/api/v2", fake.handler)
+    server = TestServer(app)
+    await server.start_server()
+    yield fake, str(server.make_url("/ws/api/v2"))
+    await server.close()
+
+
+async def test_stream_resubscribes_after_disconnect(fake_ws):
+    fake, url = fake_ws
+    queue: asyncio.Queue[PriceFull] = asyncio.Queue(maxsize=10)
+    config = DeribitStreamConfig(ws_url=url, reconnect_delay_s=0.01)
+    tickers = ("btc_usd", "eth_usd")
+
+    async with aiohttp.ClientSession() as session:
+        collector = DeribitStreamCollector(tickers, queue, config, session)
+        task = asyncio.create_task(collector.run())
+
+        received = [await asyncio.wait_for(queue.get(), timeout=5) for _ in range(4)]
+
+        collector.stop()
+        await asyncio.wait_for(task, timeout=5)
+
+    assert fake.connections == 2
+    assert (
+        fake.subscriptions
+        == [["deribit_price_index.btc_usd", "deribit_price_index.eth_usd"]] * 2
+    )
+    assert fake.test_replies >= 1
+    assert collector.reconnects == 1
+    assert [p.captured_ts_ms for p in received] == [1000, 1001, 2000, 2001]
+    assert received[0] == PriceFull(ticker="btc_usd", price=100.5, captured_ts_ms=1000)
+
+
+async def test_stream_drops_oldest_when_queue_is_full():
+    queue: asyncio.Queue[PriceFull] = asyncio.Queue(maxsize=2)
+    collector = DeribitStreamCollector(("btc_usd",), queue)
+
+    for ts in (1, 2, 3):
+        collector._put(PriceFull(ticker="btc_usd", price=1, captured_ts_ms=ts))
+
+    assert collector.dropped == 1
+    assert [queue.get_nowait().captured_ts_ms for _ in range(2)] == [2, 3]
+
+
+async def test_batch_writer_flushes_queue(db_session):
+    queue: asyncio.Queue[PriceFull] = asyncio.Queue()
+    for ts in (1000, 2000, 3000):
+        queue.put_nowait(PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=ts))
+
+    writer = PriceBatchWriter(
+        queue, db_helper.session_factory, batch_size=2, flush_interval_s=0.01
+    )
+    task = asyncio.create_task(writer.run())
+    await asyncio.wait_for(queue.join(), timeout=5)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    rows = list(await db_session.scalars(select(Price.captured_ts_ms)))
+    assert sorted(rows) == [1000, 2000, 3000]
+    assert writer.written == 3
+
+
+async def test_batch_writer_cancelled_mid_flush_writes_once(monkeypatch):
+    written: list[int] = []
+    started = asyncio.Event()
+
+    async def _slow_create_prices(session, prices_in, returning, source):
+        started.set()
+        await asyncio.sleep(0.05)
+        written.extend(p.captured_ts_ms for p in prices_in)
+        return len(prices_in)
+
+    monkeypatch.setattr(writer_module, "create_prices", _slow_create_prices)
+    queue: asyncio.Queue[PriceFull] = asyncio.Queue()
+    for ts in (1000, 2000):
+        queue.put_nowait(PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=ts))
+
+    writer = PriceBatchWriter(
+        queue, db_helper.session_factory, batch_size=2, flush_interval_s=0.01
+    )
+    task = asyncio.create_task(writer.run())
+    await started.wait()
+    task.cancel()
+    (result,) = await asyncio.gather(task, return_exceptions=True)
+
+    assert isinstance(result, asyncio.CancelledError)
+    assert written == [1000, 2000]
+    assert writer.written == 2
+    await asyncio.wait_for(queue.join(), timeout=1)
+
+
+async def test_batch_writer_feeds_a_composite_primary(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "primary_price_source", COMPOSITE_SOURCE)
+    queue: asyncio.Queue[PriceFull] = asyncio.Queue()
+    queue.put_nowait(PriceFull(ticker="btc_usd", price=50000, captured_ts_ms=1000))
+
+    writer = PriceBatchWriter(queue, db_helper.session_factory, flush_interval_s=0.01)
+    task = asyncio.create_task(writer.run())
+    await asyncio.wait_for(queue.join(), timeout=5)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    rows = (await db_session.execute(select(Price.source))).scalars().all()
+    assert sorted(rows) == [COMPOSITE_SOURCE, DEFAULT_SOURCE]
+    assert writer.written == 1
+    last = await read_last_price(db_session, "btc_usd")
+    assert last.source == COMPOSITE_SOURCE
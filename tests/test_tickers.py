@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+from sqlalchemy import delete, update
+
+from src.models import TrackedTicker, db_helper
+from src.tickers.crud import add_tickers, read_enabled_tickers
+from src.tickers.registry import TickerRegistry, select_shard, shard_of
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_registry_reads_enabled_tickers(db_session):
+    registry = TickerRegistry(
+        db_helper.session_factory, defaults=("btc_usd",), refresh_interval_s=60
+    )
+
+    assert await add_tickers(db_session, ["sol_usdc", "btc_usd"]) == 1
+    assert await add_tickers(db_session, ["sol_usdc"]) == 0
+    try:
+        assert await registry.get() == ("btc_usd", "eth_usd", "sol_usdc")
+        assert await registry.contains("sol_usdc")
+
+        await db_session.execute(
+            update(TrackedTicker)
+            .where(TrackedTicker.name == "sol_usdc")
+            .values(enabled=False)
+        )
+        await db_session.commit()
+
+        # Cached until the refresh interval passes or it is invalidated.
+        assert await registry.contains("sol_usdc")
+        registry.invalidate()
+        assert not await registry.contains("sol_usdc")
+        assert await read_enabled_tickers(db_session) == ["btc_usd", "eth_usd"]
+    finally:
+        await db_session.execute(
+            delete(TrackedTicker).where(TrackedTicker.name == "sol_usdc")
+        )
+        await db_session.commit()
+
+
+async def test_concurrent_gets_share_one_refresh():
+    queries = 0
+
+    def session_factory():
+        nonlocal queries
+        queries += 1
+        return db_helper.session_factory()
+
+    registry = TickerRegistry(
+        session_factory, defaults=("btc_usd",), refresh_interval_s=60
+    )
+
+    results = await asyncio.gather(*(registry.get() for _ in range(10)))
+
+    assert queries == 1
+    assert set(results) == {("btc_usd", "eth_usd")}
+    await registry.get()
+    assert queries == 1
+
+
+async def test_shards_partition_tickers():
+    tickers = [f"idx_{i}" for i in range(100)]
+
+    shards = [select_shard(tickers, shard, 4) for shard in range(4)]
+
+    assert sorted(t for shard in shards for t in shard) == sorted(tickers)
+    assert all(shards)
+    assert shard_of("btc_usd", 4) == shard_of("btc_usd", 4)